@@ -0,0 +1,41 @@
+"""Compile time of the kernels, kept apart from the steady-state timings."""
+
+import subprocess
+import sys
+import tempfile
+import time
+
+WARMUP = "import hmm_analysis; hmm_analysis.warmup({cache_dir!r}, dtypes=({dtype!r},))"
+
+
+def run_warmup(cache_dir: str, dtype: str) -> float:
+    """Wall time of ``warmup`` in a fresh process, including the import."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", WARMUP.format(cache_dir=cache_dir, dtype=dtype)],
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+class Compile:
+    params = [["float64", "float32"]]
+    param_names = ["dtype"]
+    timeout = 1800
+    repeat = 1
+    number = 1
+
+    def track_cold(self, dtype):
+        # an empty cache directory compiles every kernel from scratch
+        with tempfile.TemporaryDirectory() as cache_dir:
+            return run_warmup(cache_dir, dtype)
+
+    track_cold.unit = "seconds"
+
+    def track_cached(self, dtype):
+        # a fresh process loading the kernels written by an earlier warmup
+        with tempfile.TemporaryDirectory() as cache_dir:
+            run_warmup(cache_dir, dtype)
+            return run_warmup(cache_dir, dtype)
+
+    track_cached.unit = "seconds"
@@ -0,0 +1,82 @@
+"""Forward and backward recursions and forward-only scoring over sequence length, states and symbols."""
+
+import numpy as np
+from hmm_analysis.forward_backward import (
+    calc_backward_log,
+    calc_forward_log,
+    calc_likelihood_log_rolling,
+)
+from hmm_analysis.scoring import ModelBank, score_models
+from hmm_analysis.scoring.score import prepare_parameters, score_batch
+from .generators import SHAPES, random_model, sample_sequence
+from .timing import THROUGHPUT_UNIT, throughput
+
+
+class ForwardBackward:
+    params = [SHAPES]
+    param_names = ["(T, N, M)"]
+    timeout = 600
+
+    def setup(self, shape):
+        length, n_states, n_symbols = shape
+        model = random_model(n_states, n_symbols)
+        self.data = sample_sequence(model, length)
+        self.parameters_log = [np.log(p) for p in model]
+        self.forward_args = (self.data, *self.parameters_log)
+        self.backward_args = (self.data, *self.parameters_log[:2])
+        self.score_args = (self.data, *prepare_parameters(*model))
+
+        # compiling on a short prefix keeps the compile time out of the timings
+        calc_forward_log(self.data[:2], *self.parameters_log)
+        calc_backward_log(self.data[:2], *self.parameters_log[:2])
+        calc_likelihood_log_rolling(self.data[:2], *self.score_args[1:])
+
+    def time_forward(self, shape):
+        calc_forward_log(*self.forward_args)
+
+    def time_backward(self, shape):
+        calc_backward_log(*self.backward_args)
+
+    def time_score(self, shape):
+        calc_likelihood_log_rolling(*self.score_args)
+
+    def peakmem_forward(self, shape):
+        calc_forward_log(*self.forward_args)
+
+    def peakmem_score(self, shape):
+        calc_likelihood_log_rolling(*self.score_args)
+
+    def track_forward_throughput(self, shape):
+        return throughput(calc_forward_log, self.forward_args, shape[0], shape[1])
+
+    track_forward_throughput.unit = THROUGHPUT_UNIT
+
+    def track_backward_throughput(self, shape):
+        return throughput(calc_backward_log, self.backward_args, shape[0], shape[1])
+
+    track_backward_throughput.unit = THROUGHPUT_UNIT
+
+
+class ScoreModels:
+    """A bank of K models against scoring the sequences under each model in turn."""
+
+    params = [[1, 10, 100]]
+    param_names = ["K"]
+    timeout = 600
+
+    def setup(self, n_models):
+        models = [random_model(8, 16, seed=seed) for seed in range(n_models)]
+        self.models = models
+        self.bank = ModelBank.from_models(models)
+        self.sequences = [
+            sample_sequence(models[0], 10**3, seed=seed) for seed in range(100)
+        ]
+        score_models(self.sequences[:1], self.bank)
+        score_batch(self.sequences[:1], *models[0])
+
+    def time_score_models(self, n_models):
+        score_models(self.sequences, self.bank)
+
+    def time_score_batch_per_model(self, n_models):
+        for model in self.models:
+            score_batch(self.sequences, *model)
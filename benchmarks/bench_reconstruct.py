@@ -0,0 +1,31 @@
+"""Hidden state reconstruction over sequence length, states and symbols."""
+
+from hmm_analysis import reconstruct
+from .generators import SHAPES, random_model, sample_sequence
+from .timing import THROUGHPUT_UNIT, throughput
+
+
+class Reconstruct:
+    params = [SHAPES, ["log", "scaled"]]
+    param_names = ["(T, N, M)", "backend"]
+    timeout = 600
+
+    def setup(self, shape, backend):
+        length, n_states, n_symbols = shape
+        self.model = random_model(n_states, n_symbols)
+        self.data = sample_sequence(self.model, length)
+        reconstruct(self.data[:2], *self.model, backend=backend)
+
+    def run(self, backend):
+        reconstruct(self.data, *self.model, backend=backend)
+
+    def time_reconstruct(self, shape, backend):
+        self.run(backend)
+
+    def peakmem_reconstruct(self, shape, backend):
+        self.run(backend)
+
+    def track_throughput(self, shape, backend):
+        return throughput(self.run, (backend,), shape[0], shape[1])
+
+    track_throughput.unit = THROUGHPUT_UNIT
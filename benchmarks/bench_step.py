@@ -0,0 +1,169 @@
+"""Baum-Welch steps and M-step kernels."""
+
+import numpy as np
+from hmm_analysis.baum_welch.core import Workspace
+from hmm_analysis.baum_welch.core.step import (
+    baum_welch_iter,
+    step_into,
+    step_multi_sequences_into,
+    step_multi_sequences_scaled_into,
+    step_scaled_into,
+)
+from hmm_analysis.baum_welch.estimations import (
+    allocate_statistics,
+    estimate_hidden_transition_log,
+)
+from hmm_analysis.baum_welch.variable_updates import (
+    update_variables_log,
+    update_variables_log_from_statistics,
+)
+from hmm_analysis.forward_backward import get_forward_backward_likelihood_log
+from hmm_analysis.sequences import pack_sequences
+from .generators import (
+    CORPUS_LAYOUTS,
+    CORPUS_OBSERVATIONS,
+    CORPUS_SEQUENCES,
+    LENGTH_SWEEP,
+    SHAPES,
+    random_model,
+    sample_corpus,
+    sample_sequence,
+)
+from .timing import THROUGHPUT_UNIT, throughput
+
+# the Workspace kernels baum_welch_iter runs for serial iterations
+STEPS = {"log": step_into, "scaled": step_scaled_into}
+MULTI_SEQUENCE_STEPS = {
+    "log": step_multi_sequences_into,
+    "scaled": step_multi_sequences_scaled_into,
+}
+
+
+class Step:
+    """One single sequence Baum-Welch iteration, E-step and M-step.
+
+    ``time_step`` times the kernel in its Workspace, ``time_iteration`` one
+    iteration of ``baum_welch_iter`` including the result it yields.
+    """
+
+    params = [SHAPES, list(STEPS)]
+    param_names = ["(T, N, M)", "backend"]
+    timeout = 600
+
+    def setup(self, shape, backend):
+        length, n_states, n_symbols = shape
+        model = random_model(n_states, n_symbols)
+        data = sample_sequence(model, length)
+        workspace = Workspace(length, n_states, n_symbols, backend)
+        self.step = STEPS[backend]
+        self.args = (data, *(np.log(p) for p in model), *workspace.step_args())
+        self.step(data[:2], *self.args[1:])
+
+        # the first iteration compiles and allocates the workspace
+        self.iterations = baum_welch_iter(data, *model, backend=backend)
+        next(self.iterations)
+
+    def time_step(self, shape, backend):
+        self.step(*self.args)
+
+    def time_iteration(self, shape, backend):
+        next(self.iterations)
+
+    def peakmem_step(self, shape, backend):
+        self.step(*self.args)
+
+    def track_throughput(self, shape, backend):
+        return throughput(self.step, self.args, shape[0], shape[1])
+
+    track_throughput.unit = THROUGHPUT_UNIT
+
+
+class StepMultiSequences:
+    """One multi-sequence iteration over corpora of 1e6 observations, N = 8, M = 16.
+
+    As ``Step``, the kernel in its Workspace and an iteration of ``baum_welch_iter``.
+    """
+
+    params = [CORPUS_SEQUENCES, CORPUS_LAYOUTS, list(MULTI_SEQUENCE_STEPS)]
+    param_names = ["sequences", "layout", "backend"]
+    timeout = 600
+    n_states = 8
+
+    def setup(self, n_sequences, layout, backend):
+        model = random_model(self.n_states, 16)
+        packed = pack_sequences(
+            sample_corpus(model, n_sequences, CORPUS_OBSERVATIONS, layout)
+        )
+        workspace = Workspace.for_sequences(packed.offsets, self.n_states, 16, backend)
+        self.step = MULTI_SEQUENCE_STEPS[backend]
+        self.args = (
+            packed.data,
+            packed.offsets,
+            *(np.log(p) for p in model),
+            *workspace.step_args(),
+        )
+        self.n_observations = len(packed.data)
+        self.step(*self.args)
+
+        self.iterations = baum_welch_iter(packed, *model, backend=backend)
+        next(self.iterations)
+
+    def time_step(self, n_sequences, layout, backend):
+        self.step(*self.args)
+
+    def time_iteration(self, n_sequences, layout, backend):
+        next(self.iterations)
+
+    def peakmem_step(self, n_sequences, layout, backend):
+        self.step(*self.args)
+
+    def track_throughput(self, n_sequences, layout, backend):
+        return throughput(self.step, self.args, self.n_observations, self.n_states)
+
+    track_throughput.unit = THROUGHPUT_UNIT
+
+
+class MStepStatistics:
+    """The M-step of ``step``, normalising the expected counts."""
+
+    params = [[2, 8, 32, 128, 256], [2, 16, 128, 1024]]
+    param_names = ["N", "M"]
+
+    def setup(self, n_states, n_symbols):
+        self.statistics = allocate_statistics(n_states, n_symbols)
+        rng = np.random.default_rng(0)
+        for acc in self.statistics:
+            acc += rng.random(acc.shape)
+        update_variables_log_from_statistics(*self.statistics)
+
+    def time_update(self, n_states, n_symbols):
+        update_variables_log_from_statistics(*self.statistics)
+
+
+class MStepPosteriors:
+    """The M-step from stored (T, N) posteriors and (T - 1, N, N) transitions."""
+
+    # the transition probabilities of T = 1e7 alone would take 1.3 GB
+    params = [LENGTH_SWEEP[:-1]]
+    param_names = ["(T, N, M)"]
+    timeout = 600
+
+    def setup(self, shape):
+        length, n_states, n_symbols = shape
+        model = random_model(n_states, n_symbols)
+        data = sample_sequence(model, length)
+        transition_log, emission_log, initial_log = (np.log(p) for p in model)
+        forward_log, backward_log, norm = get_forward_backward_likelihood_log(
+            data, initial_log, transition_log, emission_log
+        )
+        hidden_state_prob_log, transition_prob_log = estimate_hidden_transition_log(
+            data, forward_log, backward_log, transition_log, emission_log, norm
+        )
+        self.args = (data, hidden_state_prob_log, transition_prob_log, emission_log)
+        update_variables_log(*self.args)
+
+    def time_update(self, shape):
+        update_variables_log(*self.args)
+
+    def peakmem_update(self, shape):
+        update_variables_log(*self.args)
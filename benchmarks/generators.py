@@ -0,0 +1,93 @@
+"""Synthetic models and observations of the benchmarks."""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import jit
+from numpy.typing import NDArray
+
+# (T, N, M) of the kernel sweeps, one axis at a time around T = 1e4, N = 8, M = 16.
+# The sequence length sweep runs at N = 4 to keep a 1e7 forward buffer at 320 MB
+LENGTH_SWEEP = [(10**k, 4, 16) for k in range(2, 8)]
+STATE_SWEEP = [(10**4, n, 16) for n in (2, 8, 32, 128, 256)]
+SYMBOL_SWEEP = [(10**4, 8, m) for m in (2, 128, 1024)]
+SHAPES = LENGTH_SWEEP + STATE_SWEEP + SYMBOL_SWEEP
+
+# multi-sequence corpora of 1e6 observations in total
+CORPUS_OBSERVATIONS = 10**6
+CORPUS_SEQUENCES = [1, 10, 100, 1000, 10000]
+CORPUS_LAYOUTS = ["equal", "skewed"]
+
+
+def random_model(
+    n_states: int, n_symbols: int, seed: int = 0, stay: float = 0.9
+) -> tuple[NDArray, NDArray, NDArray]:
+    """A sticky random HMM, the states stay with probability about ``stay``.
+
+    Returns:
+        (transition, emission, initial) in probability space
+    """
+    rng = np.random.default_rng(seed)
+    transition = (1 - stay) * rng.dirichlet(np.ones(n_states), size=n_states)
+    transition[np.diag_indices(n_states)] += stay
+    emission = rng.dirichlet(np.full(n_symbols, 0.5), size=n_states)
+    initial = rng.dirichlet(np.ones(n_states))
+    return transition, emission, initial
+
+
+@jit(nopython=True, cache=True)
+def _sample(transition_cdf, emission_cdf, initial_cdf, length, seed):
+    np.random.seed(seed)
+    observations = np.empty(length, dtype=np.int64)
+    state = np.searchsorted(initial_cdf, np.random.random_sample(), side="right")
+    for t in range(length):
+        if t > 0:
+            state = np.searchsorted(
+                transition_cdf[state], np.random.random_sample(), side="right"
+            )
+        observations[t] = np.searchsorted(
+            emission_cdf[state], np.random.random_sample(), side="right"
+        )
+    return observations
+
+
+def sample_sequence(model: tuple, length: int, seed: int = 0) -> NDArray:
+    """Sample ``length`` int64 observations of ``model``."""
+    transition, emission, initial = model
+    cdfs = [np.cumsum(p, axis=-1) for p in (transition, emission, initial)]
+    for cdf in cdfs:
+        # rounding of the cumulative sums must not sample past the last entry
+        cdf[..., -1] = np.inf
+    return _sample(*cdfs, length, seed)
+
+
+def sequence_lengths(
+    n_sequences: int, n_observations: int, layout: str = "equal", seed: int = 0
+) -> NDArray:
+    """Lengths of a corpus of ``n_sequences`` summing to about ``n_observations``.
+
+    ``"equal"`` gives equal lengths, ``"skewed"`` log-normal lengths where a few
+    sequences hold most of the observations.
+    """
+    if layout == "equal":
+        weights = np.ones(n_sequences)
+    elif layout == "skewed":
+        weights = np.random.default_rng(seed).lognormal(sigma=1.5, size=n_sequences)
+    else:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {CORPUS_LAYOUTS}")
+    return np.maximum(np.round(weights / weights.sum() * n_observations), 2).astype(
+        np.int64
+    )
+
+
+def sample_corpus(
+    model: tuple,
+    n_sequences: int,
+    n_observations: int,
+    layout: str = "equal",
+    seed: int = 0,
+) -> list[NDArray]:
+    """Sample a multi-sequence corpus, see ``sequence_lengths``."""
+    lengths = sequence_lengths(n_sequences, n_observations, layout, seed)
+    data = sample_sequence(model, int(lengths.sum()), seed)
+    return np.split(data, np.cumsum(lengths)[:-1])
@@ -0,0 +1,26 @@
+"""Throughput measurements shared by the benchmarks."""
+
+from __future__ import annotations
+
+import time
+
+THROUGHPUT_UNIT = "obs*states^2/s"
+
+
+def best_time(func, *args, repeat: int = 3) -> float:
+    """Best wall time of ``repeat`` calls of ``func(*args)`` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def throughput(func, args: tuple, n_observations: int, n_states: int) -> float:
+    """Observations times states squared processed per second by ``func(*args)``.
+
+    The forward-backward recursions do O(N^2) work per observation, so this stays
+    comparable across the sweeps of T and N.
+    """
+    return n_observations * n_states**2 / best_time(func, *args)
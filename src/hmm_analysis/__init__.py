@@ -1,4 +1,89 @@
-from .baum_welch import baum_welch, baum_welch_iter
-from .reconstruction import reconstruct
+import importlib
+import sys
+import types
 
-__all__ = ["baum_welch", "baum_welch_iter", "reconstruct"]
+# the public names and the subpackage defining each of them. They are imported on
+# first access, so ``import hmm_analysis`` does not load numba or the kernels
+_LAZY_ATTRIBUTES = {
+    "baum_welch": ".baum_welch",
+    "baum_welch_iter": ".baum_welch",
+    "baum_welch_multistart": ".baum_welch",
+    "ConvergenceMonitor": ".baum_welch",
+    "OnlineBaumWelch": ".baum_welch",
+    "reconstruct": ".reconstruction",
+    "reconstruct_batch": ".reconstruction",
+    "viterbi": ".reconstruction",
+    "viterbi_batch": ".reconstruction",
+    "FixedLagSmoother": ".reconstruction",
+    "score": ".scoring",
+    "score_batch": ".scoring",
+    "ModelBank": ".scoring",
+    "score_models": ".scoring",
+    "PackedSequences": ".sequences",
+    "pack_sequences": ".sequences",
+    "SequenceStore": ".sequences",
+    "SparseTransition": ".sparse",
+    "set_cache_dir": ".compilation",
+    "warmup": ".compilation",
+}
+
+_SUBPACKAGES = (
+    "compilation",
+    "forward_backward",
+    "reconstruction",
+    "scoring",
+    "sequences",
+    "sparse",
+    "utils",
+)
+
+__all__ = [
+    "ConvergenceMonitor",
+    "FixedLagSmoother",
+    "ModelBank",
+    "OnlineBaumWelch",
+    "PackedSequences",
+    "SequenceStore",
+    "SparseTransition",
+    "baum_welch",
+    "baum_welch_iter",
+    "baum_welch_multistart",
+    "pack_sequences",
+    "reconstruct",
+    "reconstruct_batch",
+    "score",
+    "score_batch",
+    "score_models",
+    "set_cache_dir",
+    "viterbi",
+    "viterbi_batch",
+    "warmup",
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    elif name in _SUBPACKAGES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # importing the baum_welch subpackage would bind it over the function of
+        # the same name, the function keeps the name as with an eager import
+        if name in _LAZY_ATTRIBUTES and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
@@ -1,3 +1,29 @@
-from .core import baum_welch, baum_welch_iter, BaumWelchResult
+from .core import (
+    baum_welch,
+    baum_welch_iter,
+    baum_welch_multistart,
+    BaumWelchResult,
+    ConvergenceMonitor,
+    Instrumentation,
+    MultistartResult,
+    OnlineBaumWelch,
+    PhaseRecord,
+    power_step_size,
+    random_guesses,
+    Workspace,
+)
 
-__all__ = ["baum_welch", "baum_welch_iter", "BaumWelchResult"]
+__all__ = [
+    "BaumWelchResult",
+    "ConvergenceMonitor",
+    "Instrumentation",
+    "MultistartResult",
+    "OnlineBaumWelch",
+    "PhaseRecord",
+    "Workspace",
+    "baum_welch",
+    "baum_welch_iter",
+    "baum_welch_multistart",
+    "power_step_size",
+    "random_guesses",
+]
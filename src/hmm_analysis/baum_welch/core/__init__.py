@@ -1,3 +1,22 @@
 from .baum_welch import baum_welch, baum_welch_iter, BaumWelchResult
+from .result import MultistartResult
+from .convergence import ConvergenceMonitor
+from .instrumentation import Instrumentation, PhaseRecord
+from .workspace import Workspace
+from .multistart import baum_welch_multistart, random_guesses
+from .online import OnlineBaumWelch, power_step_size
 
-__all__ = ["baum_welch", "baum_welch_iter", "BaumWelchResult"]
+__all__ = [
+    "BaumWelchResult",
+    "ConvergenceMonitor",
+    "Instrumentation",
+    "MultistartResult",
+    "OnlineBaumWelch",
+    "PhaseRecord",
+    "Workspace",
+    "baum_welch",
+    "baum_welch_iter",
+    "baum_welch_multistart",
+    "power_step_size",
+    "random_guesses",
+]
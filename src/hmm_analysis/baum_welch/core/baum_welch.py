@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 import itertools
-from tqdm import tqdm
+import numpy as np
 from numpy.typing import NDArray
 from .step import baum_welch_iter as _baum_welch_iter
-from .result import list_of_log_estimations_to_bw_results, BaumWelchResult
+from .result import log_estimation_to_bw_result, BaumWelchResult
+from .convergence import ConvergenceMonitor
+from .instrumentation import Instrumentation
+from hmm_analysis.sequences import PackedSequences, SequenceStore
 
 
 def baum_welch_iter(
-    data: NDArray | list[NDArray],
+    data: NDArray | list[NDArray] | PackedSequences | SequenceStore,
     transition: NDArray,
     emission: NDArray,
     initial: NDArray,
     multi_sequence: bool = False,
+    backend: str = "log",
+    parallel: bool = False,
+    checkpoint_interval: int | str | None = None,
+    run_length: bool = False,
+    accelerate: bool = False,
+    dtype=np.float64,
+    instrument: bool = False,
 ):
     """Infinite iterator for Baum-Welch algorithm that yields results per iteration.
 
@@ -21,32 +31,91 @@ def baum_welch_iter(
     User explicitly controls single vs multi-sequence processing.
 
     Args:
-        data: Observation sequences (single array or list of arrays for multi-sequence)
+        data: Observation sequences (single array, or a list of arrays, a 2-D array
+            or PackedSequences for multi-sequence, or a SequenceStore streamed
+            from disk chunk by chunk)
         transition: Initial transition matrix guess
         emission: Initial emission matrix guess
         initial: Initial probability vector guess
-        multi_sequence: Whether to use multi-sequence processing (default False)
+        multi_sequence: Whether to use multi-sequence processing (default False),
+            always on for PackedSequences and a SequenceStore
+        backend: Forward-backward engine, "log" (default) or "scaled". The scaled
+            engine works in probability space with per-step normalisation and
+            avoids the exp/log work of the log-space kernels
+        parallel: Spread the E-step across threads (default False). For
+            multi-sequence, sequences are scheduled longest first, every thread
+            accumulates its own expected counts and these are summed at the end
+            of the step. A single sequence is split into one chunk per thread:
+            the chunk transfer matrices are computed concurrently, combined into
+            the boundary messages and the chunks then accumulate concurrently.
+            This uses the scaled engine and O(N^3) work per step, so it pays off
+            for long sequences with few states
+        checkpoint_interval: For a single long sequence, store only every k-th
+            forward message and recompute the segments in between while the
+            backward pass runs. An int k, or "sqrt" for k = ceil(sqrt(T)), which
+            needs O(sqrt(T) * N) memory for one extra forward pass. None (default)
+            stores all T messages. Log backend only
+        run_length: For a single sequence with long runs of repeated symbols,
+            run-length encode it once and jump over long runs with scaled
+            repeated squaring of the symbol-conditioned transition matrix. The
+            expected counts of a run come in closed form from a block matrix
+            power, so the cost shrinks with the compression ratio (default False)
+        accelerate: SQUAREM acceleration (default False). Every yielded result
+            is one cycle of two EM steps, an extrapolation along them projected
+            back onto the simplex, and a stabilising EM step from the
+            extrapolated point. A cycle whose extrapolation lowers the likelihood
+            falls back to plain EM. Each cycle costs three E-steps (four on
+            fallback), but the fixed point is usually reached in far fewer of
+            them when EM converges slowly
+        dtype: Floating point type of the parameters and of the forward,
+            backward and posterior buffers, np.float64 (default) or
+            np.float32. float32 halves the memory and bandwidth of the message
+            buffers, the expected counts and likelihood sums stay float64
+        instrument: Record the wall time, compile time and allocated bytes of
+            every phase of each iteration in result.instrumentation (default
+            False). The phases then run as separate kernels called from Python,
+            with the serial log or scaled backend only. Disabled, the fused
+            step runs unchanged
 
     Yields:
         BaumWelchResult: Result object for each iteration with updated parameters
     """
-    for transition_log, emission_log, initial_log, likelihood_log in _baum_welch_iter(
-        data, transition, emission, initial, multi_sequence
+    for estimation_log in _baum_welch_iter(
+        data,
+        transition,
+        emission,
+        initial,
+        multi_sequence,
+        backend,
+        parallel,
+        checkpoint_interval,
+        run_length,
+        accelerate,
+        dtype,
+        instrument,
     ):
-        # Convert back to regular space for result
-        result_data = [(transition_log, emission_log, initial_log, likelihood_log)]
-        result = list_of_log_estimations_to_bw_results(result_data)[0]
-        yield result
+        # the regular space parameters are only computed when accessed
+        yield log_estimation_to_bw_result(estimation_log)
 
 
 def baum_welch(
-    data: NDArray | list[NDArray],
+    data: NDArray | list[NDArray] | PackedSequences | SequenceStore,
     transition: NDArray,
     emission: NDArray,
     initial: NDArray,
     niters: int,
     tqdm_on: bool = True,
     multi_sequence: bool = False,
+    backend: str = "log",
+    parallel: bool = False,
+    checkpoint_interval: int | str | None = None,
+    run_length: bool = False,
+    accelerate: bool = False,
+    dtype=np.float64,
+    instrument: bool = False,
+    tol: float | None = None,
+    rtol: float | None = None,
+    patience: int = 1,
 ) -> BaumWelchResult:
     """Baum-Welch algorithm for Hidden Markov Model parameter estimation.
 
@@ -55,29 +124,91 @@ def baum_welch(
     User explicitly controls single vs multi-sequence processing.
 
     Args:
-        data: Observation sequences (single array or list of arrays for multi-sequence)
+        data: Observation sequences (single array, or a list of arrays, a 2-D array
+            or PackedSequences for multi-sequence, or a SequenceStore streamed
+            from disk chunk by chunk)
         transition: Initial transition matrix guess (left multiplication: P(X_i) * T)
         emission: Initial emission matrix guess
         initial: Initial probability vector guess
-        niters: Number of iterations to run
+        niters: Maximum number of iterations to run
         tqdm_on: Whether to show progress bar (default True)
-        multi_sequence: Whether to use multi-sequence processing (default False)
+        multi_sequence: Whether to use multi-sequence processing (default False),
+            always on for PackedSequences and a SequenceStore
+        backend: Forward-backward engine, "log" (default) or "scaled"
+        parallel: Spread the E-step across threads (default False), sequences
+            for multi-sequence and chunks of time for a single sequence
+        checkpoint_interval: Keep every k-th forward message of a single sequence
+            (int k or "sqrt") to bound memory, None (default) keeps all of them
+        run_length: Jump over runs of repeated observations in a single
+            sequence with matrix powers (default False)
+        accelerate: SQUAREM-accelerated EM, every iteration is then one
+            extrapolation cycle of three to four E-steps (default False)
+        dtype: np.float64 (default) or np.float32 for the parameters and the
+            message buffers, expected counts are accumulated in float64
+        instrument: Record per-phase timings of every iteration in
+            result.instrumentation, see ``baum_welch_iter`` (default False)
+        tol: Stop once the log-likelihood changes by at most tol, None (default)
+            disables the absolute tolerance
+        rtol: Stop once the log-likelihood changes by at most rtol times its
+            magnitude, None (default) disables the relative tolerance
+        patience: Number of consecutive iterations within tolerance before
+            stopping (default 1)
 
     Returns:
-        BaumWelchResult: Final parameter estimates after niters iterations
+        BaumWelchResult: Final parameter estimates, with the number of iterations
+        run, whether and why iterating stopped and the log-likelihood history.
+        For multi-sequence, likelihood_log is the total over all sequences and
+        sequence_likelihoods_log the one of every sequence
     """
+    monitor = ConvergenceMonitor(tol, rtol, patience)
+
     # Create infinite iterator and limit to niters
     infinite_iterator = baum_welch_iter(
-        data, transition, emission, initial, multi_sequence
+        data,
+        transition,
+        emission,
+        initial,
+        multi_sequence,
+        backend,
+        parallel,
+        checkpoint_interval,
+        run_length,
+        accelerate,
+        dtype,
+        instrument,
     )
     limited_iterator = itertools.islice(infinite_iterator, niters)
 
+    progress_bar = None
     if tqdm_on:
-        limited_iterator = tqdm(limited_iterator, total=niters, desc="Baum-Welch")
+        # the progress bar is only imported when it is shown
+        from tqdm import tqdm
+
+        limited_iterator = progress_bar = tqdm(
+            limited_iterator, total=niters, desc="Baum-Welch"
+        )
 
-    # Run iterations and return final result
+    # Run iterations until converged or out of iterations
     final_result = None
-    for result in limited_iterator:
-        final_result = result
+    instrumentations = []
+    try:
+        for result in limited_iterator:
+            final_result = result
+            if instrument:
+                instrumentations.append(result.instrumentation)
+            if monitor.update(result.likelihood_log):
+                break
+    finally:
+        # stopping early leaves the bar open otherwise
+        if progress_bar is not None:
+            progress_bar.close()
+    monitor.exhausted()
 
+    if final_result is not None:
+        final_result.n_iter = monitor.n_iter
+        final_result.converged = monitor.converged
+        final_result.stop_reason = monitor.stop_reason
+        final_result.likelihood_history = monitor.history
+        if instrument:
+            final_result.instrumentation = Instrumentation.concatenate(instrumentations)
     return final_result
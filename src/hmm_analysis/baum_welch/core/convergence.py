@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+
+STOP_TOL = "tol"
+STOP_RTOL = "rtol"
+STOP_NITERS = "niters"
+
+
+class ConvergenceMonitor:
+    """Tolerance based stopping rule on the log-likelihood of Baum-Welch.
+
+    An iteration counts as stalled when the change of the log-likelihood is at
+    most ``tol`` (absolute) or at most ``rtol`` times the magnitude of the previous
+    log-likelihood (relative). The fit is converged after ``patience`` stalled
+    iterations in a row. With neither tolerance set the monitor only records the
+    history and never stops.
+
+    Args:
+        tol: Absolute tolerance on the log-likelihood change, None to disable
+        rtol: Relative tolerance on the log-likelihood change, None to disable
+        patience: Number of consecutive stalled iterations before stopping
+
+    Example:
+        monitor = ConvergenceMonitor(tol=1e-4)
+        for result in baum_welch_iter(data, transition, emission, initial):
+            if monitor.update(result.likelihood_log):
+                break
+    """
+
+    def __init__(
+        self,
+        tol: float | None = None,
+        rtol: float | None = None,
+        patience: int = 1,
+    ):
+        if (tol is not None and tol < 0) or (rtol is not None and rtol < 0):
+            raise ValueError("tol and rtol must be non-negative")
+        if patience < 1:
+            raise ValueError("patience must be a positive integer")
+        self.tol = tol
+        self.rtol = rtol
+        self.patience = patience
+        self.converged = False
+        self.stop_reason: str | None = None
+        self._history = np.empty(16)
+        self._n_iter = 0
+        self._n_stalled = 0
+
+    def update(self, likelihood_log: float) -> bool:
+        """Record the log-likelihood of an iteration.
+
+        Returns:
+            Whether the fit has converged and iterating should stop
+        """
+        if self._n_iter == len(self._history):
+            grown = np.empty(2 * len(self._history))
+            grown[: self._n_iter] = self._history
+            self._history = grown
+        self._history[self._n_iter] = likelihood_log
+        self._n_iter += 1
+        if self._n_iter < 2 or self.converged:
+            return self.converged
+
+        previous = self._history[self._n_iter - 2]
+        change = abs(likelihood_log - previous)
+        reason = None
+        if self.tol is not None and change <= self.tol:
+            reason = STOP_TOL
+        elif self.rtol is not None and change <= self.rtol * abs(previous):
+            reason = STOP_RTOL
+
+        self._n_stalled = self._n_stalled + 1 if reason is not None else 0
+        if self._n_stalled >= self.patience:
+            self.converged = True
+            self.stop_reason = reason
+        return self.converged
+
+    def exhausted(self):
+        """Mark the fit as stopped by the iteration budget if it has not converged."""
+        if not self.converged:
+            self.stop_reason = STOP_NITERS
+
+    @property
+    def n_iter(self) -> int:
+        """Number of recorded iterations."""
+        return self._n_iter
+
+    @property
+    def history(self) -> NDArray:
+        """Log-likelihood of every recorded iteration."""
+        return self._history[: self._n_iter].copy()
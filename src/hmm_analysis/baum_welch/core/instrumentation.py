@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+from numba.core import event
+from numpy.typing import NDArray
+from hmm_analysis.baum_welch.estimations import (
+    accumulate_statistics_log_from_forward,
+    accumulate_statistics_log_table_from_forward,
+    accumulate_statistics_scaled_from_forward,
+    allocate_statistics,
+)
+from hmm_analysis.baum_welch.variable_updates import (
+    update_variables_log_from_statistics,
+)
+from hmm_analysis.forward_backward import (
+    calc_forward_log_normalised,
+    calc_forward_log_table_normalised,
+    calc_forward_scaled,
+    calc_symbol_table_log,
+    likelihood_scaled,
+    use_symbol_table,
+)
+
+PHASE_SYMBOL_TABLE = "symbol_table"
+PHASE_FORWARD = "forward"
+PHASE_BACKWARD = "backward"
+PHASE_UPDATE = "update"
+
+
+@dataclass
+class PhaseRecord:
+    """Cost of one phase of a Baum-Welch iteration.
+
+    Attributes:
+        iteration: Index of the iteration, from 0
+        phase: "symbol_table", "forward", "backward" (the backward pass folding
+            the posteriors into expected counts) or "update" (the M-step)
+        calls: Number of kernel calls, one per sequence for forward and backward
+        wall_time: Seconds spent in the phase, compilation included
+        compile_time: Seconds of the wall time spent compiling kernels
+        bytes_allocated: Bytes of the buffers the phase allocates and keeps,
+            temporaries freed inside the kernels are not counted
+    """
+
+    iteration: int
+    phase: str
+    calls: int = 0
+    wall_time: float = 0.0
+    compile_time: float = 0.0
+    bytes_allocated: int = 0
+
+    @property
+    def run_time(self) -> float:
+        """Seconds spent running compiled code."""
+        return self.wall_time - self.compile_time
+
+
+@dataclass
+class Instrumentation:
+    """Per-phase timing and memory of Baum-Welch iterations, see ``PhaseRecord``."""
+
+    records: list[PhaseRecord] = field(default_factory=list)
+
+    def to_records(self) -> list[dict]:
+        """The records as dicts, e.g. for ``pandas.DataFrame`` or JSON lines."""
+        return [
+            asdict(record) | {"run_time": record.run_time} for record in self.records
+        ]
+
+    def totals(self) -> dict[str, float]:
+        """Wall time of every phase summed over the iterations."""
+        totals = {}
+        for record in self.records:
+            totals[record.phase] = totals.get(record.phase, 0.0) + record.wall_time
+        return totals
+
+    @classmethod
+    def concatenate(cls, instrumentations) -> Instrumentation:
+        """The records of several iterations in one ``Instrumentation``."""
+        return cls([record for item in instrumentations for record in item.records])
+
+
+class PhaseTimer:
+    """Collects the ``PhaseRecord`` of every phase of one iteration."""
+
+    def __init__(self, iteration: int):
+        self._iteration = iteration
+        self._records: dict[str, PhaseRecord] = {}
+
+    def measure(self, phase: str, kernel, *args):
+        """Call ``kernel(*args)`` and charge its cost to ``phase``."""
+        record = self._records.get(phase)
+        if record is None:
+            record = self._records[phase] = PhaseRecord(self._iteration, phase)
+
+        def add_compile_time(duration):
+            record.compile_time += duration
+
+        start = time.perf_counter()
+        with event.install_timer("numba:compile", add_compile_time):
+            out = kernel(*args)
+        record.wall_time += time.perf_counter() - start
+        record.calls += 1
+        record.bytes_allocated += _nbytes(out)
+        return out
+
+    def instrumentation(self) -> Instrumentation:
+        return Instrumentation(list(self._records.values()))
+
+
+def _nbytes(out) -> int:
+    if isinstance(out, np.ndarray):
+        return out.nbytes
+    if isinstance(out, tuple):
+        return sum(_nbytes(elem) for elem in out)
+    return 0
+
+
+def step_instrumented(
+    data: NDArray,
+    offsets: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    backend: str,
+    iteration: int,
+):
+    """Serial Baum-Welch step running its phases as separate kernels.
+
+    Computes the same update as ``step``/``step_scaled`` for a single sequence
+    (offsets [0, T]) and ``step_multi_sequences[_scaled]`` for packed sequences,
+    but calls the forward pass, the backward pass and the M-step one at a time
+    from Python so that each can be timed.
+
+    Returns:
+        transition_log, emission_log, initial_log, the log-likelihood of every
+        sequence and the Instrumentation of the iteration
+    """
+    timer = PhaseTimer(iteration)
+    n_states, n_symbols = emission_log.shape
+
+    table = None
+    if backend == "log":
+        if use_symbol_table(n_states, n_symbols, transition_log.itemsize):
+            table = timer.measure(
+                PHASE_SYMBOL_TABLE, calc_symbol_table_log, transition_log, emission_log
+            )
+    else:
+        transition, emission, initial = (
+            np.exp(transition_log),
+            np.exp(emission_log),
+            np.exp(initial_log),
+        )
+
+    statistics = allocate_statistics(n_states, n_symbols)
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] == offsets[i]:
+            continue
+        sequence = data[offsets[i] : offsets[i + 1]]
+        if table is not None:
+            forward_log, norms[i] = timer.measure(
+                PHASE_FORWARD,
+                calc_forward_log_table_normalised,
+                sequence,
+                table,
+                emission_log,
+                initial_log,
+            )
+            timer.measure(
+                PHASE_BACKWARD,
+                accumulate_statistics_log_table_from_forward,
+                sequence,
+                forward_log,
+                table,
+                *statistics,
+            )
+        elif backend == "log":
+            forward_log, norms[i] = timer.measure(
+                PHASE_FORWARD,
+                calc_forward_log_normalised,
+                sequence,
+                transition_log,
+                emission_log,
+                initial_log,
+            )
+            timer.measure(
+                PHASE_BACKWARD,
+                accumulate_statistics_log_from_forward,
+                sequence,
+                forward_log,
+                transition_log,
+                emission_log,
+                *statistics,
+            )
+        else:
+            forward, scales = timer.measure(
+                PHASE_FORWARD,
+                calc_forward_scaled,
+                sequence,
+                transition,
+                emission,
+                initial,
+            )
+            norms[i] = likelihood_scaled(scales)
+            timer.measure(
+                PHASE_BACKWARD,
+                accumulate_statistics_scaled_from_forward,
+                sequence,
+                forward,
+                scales,
+                transition,
+                emission,
+                *statistics,
+            )
+
+    initial_log, transition_log, emission_log = timer.measure(
+        PHASE_UPDATE, update_variables_log_from_statistics, *statistics
+    )
+    return transition_log, emission_log, initial_log, norms, timer.instrumentation()
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import math
+import numpy as np
+from numpy.typing import NDArray
+from numba import jit, prange
+from .convergence import ConvergenceMonitor
+from .result import BaumWelchResult, MultistartResult
+from .step import BACKENDS, step_multi_sequences, step_multi_sequences_scaled
+from hmm_analysis.sequences import PackedSequences, pack_sequences
+from hmm_analysis.utils.casting import resolve_dtype
+
+STOP_PRUNED = "pruned"
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def multistart_step_log(
+    data: NDArray,
+    offsets: NDArray,
+    transitions_log: NDArray,
+    emissions_log: NDArray,
+    initials_log: NDArray,
+    active: NDArray,
+    likelihoods: NDArray,
+    sequence_likelihoods: NDArray,
+):
+    """One Baum-Welch step of every active start, the starts spread across threads.
+
+    The parameters of start k are transitions_log[k], emissions_log[k] and
+    initials_log[k], they are updated in place together with its total and
+    per-sequence log-likelihoods. The packed data is shared by all threads.
+    """
+    for k in prange(len(active)):
+        if not active[k]:
+            continue
+        (
+            transitions_log[k],
+            emissions_log[k],
+            initials_log[k],
+            likelihoods[k],
+            sequence_likelihoods[k],
+        ) = step_multi_sequences(
+            data, offsets, transitions_log[k], emissions_log[k], initials_log[k]
+        )
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def multistart_step_scaled(
+    data: NDArray,
+    offsets: NDArray,
+    transitions_log: NDArray,
+    emissions_log: NDArray,
+    initials_log: NDArray,
+    active: NDArray,
+    likelihoods: NDArray,
+    sequence_likelihoods: NDArray,
+):
+    """Scaled variant of ``multistart_step_log``."""
+    for k in prange(len(active)):
+        if not active[k]:
+            continue
+        (
+            transitions_log[k],
+            emissions_log[k],
+            initials_log[k],
+            likelihoods[k],
+            sequence_likelihoods[k],
+        ) = step_multi_sequences_scaled(
+            data, offsets, transitions_log[k], emissions_log[k], initials_log[k]
+        )
+
+
+def random_guesses(
+    n_states: int,
+    n_symbols: int,
+    n_starts: int,
+    seed: int | np.random.Generator | None = None,
+    concentration: float = 1.0,
+) -> list[tuple[NDArray, NDArray, NDArray]]:
+    """Draw random initial guesses, every row from a symmetric Dirichlet.
+
+    Returns:
+        A list of n_starts (transition, emission, initial) tuples
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        (
+            rng.dirichlet(np.full(n_states, concentration), size=n_states),
+            rng.dirichlet(np.full(n_symbols, concentration), size=n_states),
+            rng.dirichlet(np.full(n_states, concentration)),
+        )
+        for _ in range(n_starts)
+    ]
+
+
+def baum_welch_multistart(
+    data: NDArray | list[NDArray] | PackedSequences,
+    n_states: int | None = None,
+    n_starts: int = 50,
+    niters: int = 100,
+    guesses: list[tuple[NDArray, NDArray, NDArray]] | None = None,
+    n_symbols: int | None = None,
+    seed: int | np.random.Generator | None = None,
+    multi_sequence: bool = False,
+    backend: str = "log",
+    tol: float | None = None,
+    rtol: float | None = None,
+    patience: int = 1,
+    prune_after: int | None = None,
+    prune_keep: float = 0.5,
+    dtype=np.float64,
+    tqdm_on: bool = True,
+) -> MultistartResult:
+    """Baum-Welch from many initial guesses, keeping the best local optimum.
+
+    All starts advance together: every iteration runs one step of each active
+    start, with the starts spread across threads and the packed observations
+    shared between them. A start stops once it converges (see ``tol``, ``rtol``
+    and ``patience``), and with ``prune_after`` set only the best ``prune_keep``
+    fraction of the starts continues past that iteration.
+
+    Args:
+        data: Observation sequences (single array, or a list of arrays, a 2-D array
+            or PackedSequences for multi-sequence)
+        n_states: Number of hidden states of the random guesses
+        n_starts: Number of random guesses (default 50), ignored with ``guesses``
+        niters: Maximum number of iterations of every start
+        guesses: (transition, emission, initial) tuples to start from instead of
+            random guesses
+        n_symbols: Number of observation symbols of the random guesses, default
+            the largest observation + 1
+        seed: Seed or generator of the random guesses
+        multi_sequence: Whether to use multi-sequence processing (default False),
+            always on for PackedSequences
+        backend: Forward-backward engine, "log" (default) or "scaled"
+        tol: Absolute log-likelihood tolerance of every start, None to disable
+        rtol: Relative log-likelihood tolerance of every start, None to disable
+        patience: Consecutive iterations within tolerance before a start stops
+        prune_after: Iteration after which the losing starts are dropped, None
+            (default) runs every start to the end. Starts that have converged by
+            then are never pruned
+        prune_keep: Fraction of the starts kept when pruning (default 0.5)
+        dtype: np.float64 (default) or np.float32 for the parameters and the
+            message buffers, expected counts are accumulated in float64
+        tqdm_on: Whether to show progress bar (default True)
+
+    Returns:
+        MultistartResult: The best result and the final result of every start
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if not 0 < prune_keep <= 1:
+        raise ValueError("prune_keep must be in (0, 1]")
+    dtype = resolve_dtype(dtype)
+
+    # all starts share one packed copy of the observations
+    multi_sequence = multi_sequence or isinstance(data, PackedSequences)
+    if multi_sequence:
+        packed = pack_sequences(data)
+    else:
+        data = np.asarray(data)
+        packed = PackedSequences(data, np.array([0, len(data)], dtype=np.int64))
+
+    if guesses is None:
+        if n_states is None:
+            raise ValueError("either n_states or guesses must be given")
+        if n_symbols is None:
+            n_symbols = int(packed.data.max()) + 1
+        guesses = random_guesses(n_states, n_symbols, n_starts, seed)
+    if len(guesses) == 0:
+        raise ValueError("at least one start is needed")
+
+    # casting all starts to log space at once
+    with np.errstate(divide="ignore"):
+        transitions_log, emissions_log, initials_log = (
+            np.log(np.stack([np.asarray(guess[i], dtype=dtype) for guess in guesses]))
+            for i in range(3)
+        )
+
+    n_starts = len(guesses)
+    active = np.ones(n_starts, dtype=np.bool_)
+    pruned = np.zeros(n_starts, dtype=np.bool_)
+    likelihoods = np.zeros(n_starts)
+    sequence_likelihoods = np.zeros((n_starts, len(packed)))
+    monitors = [ConvergenceMonitor(tol, rtol, patience) for _ in range(n_starts)]
+    kernel = multistart_step_log if backend == "log" else multistart_step_scaled
+
+    iterations = range(niters)
+    progress_bar = None
+    if tqdm_on:
+        # the progress bar is only imported when it is shown
+        from tqdm import tqdm
+
+        iterations = progress_bar = tqdm(iterations, desc="Baum-Welch multistart")
+
+    try:
+        for iteration in iterations:
+            if not active.any():
+                break
+            kernel(
+                packed.data,
+                packed.offsets,
+                transitions_log,
+                emissions_log,
+                initials_log,
+                active,
+                likelihoods,
+                sequence_likelihoods,
+            )
+            for k in np.flatnonzero(active):
+                if monitors[k].update(likelihoods[k]):
+                    active[k] = False
+
+            if prune_after is not None and iteration + 1 == prune_after:
+                # only the best starts keep iterating, the converged ones have
+                # stopped on their own and keep their stop reason
+                n_keep = math.ceil(prune_keep * n_starts)
+                losing = np.array(
+                    [
+                        k
+                        for k in np.argsort(-likelihoods, kind="stable")[n_keep:]
+                        if not monitors[k].converged
+                    ],
+                    dtype=np.int64,
+                )
+                pruned[losing] = True
+                active[losing] = False
+    finally:
+        # stopping early leaves the bar open otherwise
+        if progress_bar is not None:
+            progress_bar.close()
+
+    results = []
+    for k, monitor in enumerate(monitors):
+        monitor.exhausted()
+        results.append(
+            BaumWelchResult.from_log(
+                transitions_log[k],
+                emissions_log[k],
+                initials_log[k],
+                likelihoods[k],
+                sequence_likelihoods_log=(
+                    sequence_likelihoods[k].copy() if multi_sequence else None
+                ),
+                n_iter=monitor.n_iter,
+                converged=monitor.converged,
+                stop_reason=STOP_PRUNED if pruned[k] else monitor.stop_reason,
+                likelihood_history=monitor.history,
+            )
+        )
+
+    best_index = int(np.argmax(np.where(pruned, -np.inf, likelihoods)))
+    return MultistartResult(
+        best=results[best_index],
+        best_index=best_index,
+        results=results,
+        likelihoods_log=likelihoods.copy(),
+        pruned=pruned,
+    )
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+import numpy as np
+from hmm_analysis.baum_welch.estimations import (
+    allocate_statistics,
+    accumulate_statistics_log_from_forward,
+)
+from hmm_analysis.baum_welch.variable_updates import (
+    update_variables_log_from_statistics,
+)
+from hmm_analysis.forward_backward import calc_forward_log
+from hmm_analysis.utils.casting import cast_log
+from hmm_analysis.utils.expsum_ops import logexpdot_vector_matrix, logsumexp_1d
+from numpy.typing import NDArray
+from numba import jit
+from .result import BaumWelchResult
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def chunk_statistics_log(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    predicted_log: NDArray,
+):
+    """Expected counts of one chunk of a stream, normalised per observation.
+
+    ``predicted_log`` is the distribution of the first hidden state of the chunk,
+    carried over from the end of the previous chunk.
+
+    Returns:
+        The (initial, transition, emission) statistics, the log-likelihood of the
+        chunk and the filtered log distribution of its last hidden state
+    """
+    forward_log = calc_forward_log(data, transition_log, emission_log, predicted_log)
+    norm = logsumexp_1d(forward_log[-1])
+
+    initial_acc, transition_acc, emission_acc = allocate_statistics(
+        transition_log.shape[0], emission_log.shape[1]
+    )
+    accumulate_statistics_log_from_forward(
+        data,
+        forward_log,
+        transition_log,
+        emission_log,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
+
+    # chunks of different lengths get the same weight in the running average
+    n = len(data)
+    return (
+        initial_acc,
+        transition_acc / n,
+        emission_acc / n,
+        norm,
+        forward_log[-1] - norm,
+    )
+
+
+def power_step_size(kappa: float = 0.6, offset: float = 2.0) -> Callable[[int], float]:
+    """Step-size schedule eta_k = (k + offset) ** -kappa for chunk k = 1, 2, ...
+
+    Convergence of stepwise EM requires 0.5 < kappa <= 1. Smaller kappa forgets
+    old chunks faster.
+    """
+    if not 0.5 < kappa <= 1:
+        raise ValueError("kappa must be in (0.5, 1]")
+
+    def step_size(k: int) -> float:
+        return (k + offset) ** -kappa
+
+    return step_size
+
+
+class OnlineBaumWelch:
+    """Online (stepwise) EM for unbounded observation streams.
+
+    Observations are fed in chunks with ``update``. Every chunk runs the log-space
+    forward recursion from the hidden state distribution carried over from the
+    previous chunk, and the fused backward pass yields its expected counts. Those
+    are blended into exponentially weighted running statistics,
+    s = (1 - eta_k) * s + eta_k * s_chunk, and the parameters are re-estimated
+    from them with the regular M-step. Each chunk costs O(len(chunk) * N^2), and
+    memory does not depend on the length of the stream.
+
+    The running statistics start from the counts the initial guess would expect
+    for one observation, so the guess keeps a weight that decays with the step
+    sizes. A symbol or transition missing from the first chunks keeps a positive
+    probability and does not zero out the parameters. The forward message is
+    carried across chunk boundaries, but the transition between the last
+    observation of a chunk and the first of the next one is not counted, so a
+    chunk of a single observation leaves the transition statistics as they are.
+
+    Args:
+        transition: Initial transition matrix guess
+        emission: Initial emission matrix guess
+        initial: Initial probability vector guess, the distribution of the
+            first hidden state of the stream
+        step_size: Callable mapping the chunk index k (1, 2, ...) to eta_k,
+            default ``power_step_size()``. ``lambda k: 1.0`` discards the
+            guess and every earlier chunk
+
+    Example:
+        estimator = OnlineBaumWelch(transition_guess, emission_guess, initial_guess)
+        for chunk in stream:
+            result = estimator.update(chunk)
+    """
+
+    def __init__(
+        self,
+        transition: NDArray,
+        emission: NDArray,
+        initial: NDArray,
+        step_size: Callable[[int], float] | None = None,
+    ):
+        self.transition_log, self.emission_log, self.initial_log = cast_log(
+            transition, emission, initial
+        )
+        self.step_size = step_size or power_step_size()
+        self.likelihood_log = None
+        self.n_chunks = 0
+        self.n_observations = 0
+
+        # running transition and emission statistics, seeded with the expected
+        # counts of one observation from uniformly weighted states of the guess,
+        # and the distribution of the next hidden state of the stream
+        n_states = self.transition_log.shape[0]
+        self._initial_acc = None
+        self._statistics = (
+            np.exp(self.transition_log) / n_states,
+            np.exp(self.emission_log) / n_states,
+        )
+        self._predicted_log = self.initial_log
+
+    def update(self, observations: NDArray) -> BaumWelchResult:
+        """Process the next chunk of the stream and re-estimate the parameters.
+
+        Returns:
+            BaumWelchResult with the current parameters, the likelihood is the
+            log-likelihood of this chunk given everything seen before it
+        """
+        observations = np.asarray(observations)
+        if len(observations) == 0:
+            return self.result
+
+        initial_acc, transition_acc, emission_acc, norm, filtered_log = (
+            chunk_statistics_log(
+                observations,
+                self.transition_log,
+                self.emission_log,
+                self._predicted_log,
+            )
+        )
+
+        if self._initial_acc is None:
+            # the start of the stream fixes the initial distribution
+            self._initial_acc = initial_acc
+        eta = self.step_size(self.n_chunks + 1)
+        transition_stats, emission_stats = self._statistics
+        if len(observations) > 1:
+            # a single observation has no transitions, the rows would be all zero
+            transition_stats = (1 - eta) * transition_stats + eta * transition_acc
+        emission_stats = (1 - eta) * emission_stats + eta * emission_acc
+        self._statistics = (transition_stats, emission_stats)
+
+        # M-step on the running statistics
+        self.initial_log, self.transition_log, self.emission_log = (
+            update_variables_log_from_statistics(self._initial_acc, *self._statistics)
+        )
+
+        # the next chunk starts one transition after the last filtered state
+        self._predicted_log = logexpdot_vector_matrix(filtered_log, self.transition_log)
+
+        self.likelihood_log = norm
+        self.n_chunks += 1
+        self.n_observations += len(observations)
+        return self.result
+
+    @property
+    def result(self) -> BaumWelchResult:
+        return BaumWelchResult.from_log(
+            self.transition_log,
+            self.emission_log,
+            self.initial_log,
+            self.likelihood_log,
+        )
+
+    @property
+    def transition(self) -> NDArray:
+        return np.exp(self.transition_log)
+
+    @property
+    def emission(self) -> NDArray:
+        return np.exp(self.emission_log)
+
+    @property
+    def initial(self) -> NDArray:
+        return np.exp(self.initial_log)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import numpy as np
+from hmm_analysis.baum_welch.estimations import (
+    accumulate_statistics_log,
+    accumulate_statistics_log_table,
+    accumulate_statistics_scaled,
+    accumulate_statistics_scaled_segment,
+)
+from hmm_analysis.baum_welch.variable_updates import (
+    update_variables_log_from_statistics,
+)
+from hmm_analysis.forward_backward import (
+    calc_chunk_messages_scaled,
+    calc_symbol_table_log,
+    calc_symbol_table_scaled,
+    calc_transfer_scaled,
+    use_symbol_table,
+)
+from numpy.typing import NDArray
+from numba import jit, prange
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def _allocate_worker_statistics(n_workers: int, n_states: int, n_symbols: int):
+    return (
+        np.zeros((n_workers, n_states)),
+        np.zeros((n_workers, n_states, n_states)),
+        np.zeros((n_workers, n_states, n_symbols)),
+    )
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def _reduce_worker_statistics(initial_acc, transition_acc, emission_acc):
+    # expected counts are additive, so the reduction is a plain sum over workers
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc.sum(axis=0), transition_acc.sum(axis=0), emission_acc.sum(axis=0)
+    )
+    return transition_log, emission_log, initial_log
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def step_multi_sequences_parallel(
+    data: NDArray,
+    offsets: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    schedule: NDArray,
+    worker_offsets: NDArray,
+):
+    """Multi-sequence Baum-Welch step with the E-step spread across threads.
+
+    The packed sequences are distributed over the workers according to ``schedule``
+    and ``worker_offsets`` as returned by ``schedule_longest_first``.
+    """
+    n_sequences = len(offsets) - 1
+    n_workers = len(worker_offsets) - 1
+    norms = np.empty(n_sequences)
+
+    # every worker owns its slice of the accumulators, no synchronisation needed
+    initial_acc, transition_acc, emission_acc = _allocate_worker_statistics(
+        n_workers, transition_log.shape[0], emission_log.shape[1]
+    )
+
+    # the symbol table is read-only and shared by all workers
+    symbol_table = use_symbol_table(
+        transition_log.shape[0], emission_log.shape[1], transition_log.itemsize
+    )
+    if symbol_table:
+        table = calc_symbol_table_log(transition_log, emission_log)
+    else:
+        table = np.empty(
+            (0, transition_log.shape[0], transition_log.shape[0]),
+            dtype=transition_log.dtype,
+        )
+
+    for w in prange(n_workers):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            if offsets[i + 1] == offsets[i]:
+                norms[i] = 0.0
+                continue
+            if symbol_table:
+                norms[i] = accumulate_statistics_log_table(
+                    data[offsets[i] : offsets[i + 1]],
+                    table,
+                    emission_log,
+                    initial_log,
+                    initial_acc[w],
+                    transition_acc[w],
+                    emission_acc[w],
+                )
+            else:
+                norms[i] = accumulate_statistics_log(
+                    data[offsets[i] : offsets[i + 1]],
+                    transition_log,
+                    emission_log,
+                    initial_log,
+                    initial_acc[w],
+                    transition_acc[w],
+                    emission_acc[w],
+                )
+
+    transition_log, emission_log, initial_log = _reduce_worker_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+
+    # same likelihood report as the serial multi-sequence step
+    return transition_log, emission_log, initial_log, norms.sum(), norms
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def step_multi_sequences_scaled_parallel(
+    data: NDArray,
+    offsets: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    schedule: NDArray,
+    worker_offsets: NDArray,
+):
+    """Scaled variant of ``step_multi_sequences_parallel``."""
+    transition, emission, initial = (
+        np.exp(transition_log),
+        np.exp(emission_log),
+        np.exp(initial_log),
+    )
+    n_sequences = len(offsets) - 1
+    n_workers = len(worker_offsets) - 1
+    norms = np.empty(n_sequences)
+
+    # every worker owns its slice of the accumulators, no synchronisation needed
+    initial_acc, transition_acc, emission_acc = _allocate_worker_statistics(
+        n_workers, transition.shape[0], emission.shape[1]
+    )
+
+    for w in prange(n_workers):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            if offsets[i + 1] == offsets[i]:
+                norms[i] = 0.0
+                continue
+            norms[i] = accumulate_statistics_scaled(
+                data[offsets[i] : offsets[i + 1]],
+                transition,
+                emission,
+                initial,
+                initial_acc[w],
+                transition_acc[w],
+                emission_acc[w],
+            )
+
+    transition_log, emission_log, initial_log = _reduce_worker_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+
+    # same likelihood report as the serial multi-sequence step
+    return transition_log, emission_log, initial_log, norms.sum(), norms
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def step_parallel_in_time(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    chunk_offsets: NDArray,
+):
+    """Single sequence Baum-Welch step with the sequence split across threads.
+
+    The forward recursion is a product of the matrices T * E[:, d], so every chunk
+    of the sequence (see ``split_chunks``) first computes its transfer matrix
+    concurrently. A serial pass over the chunks combines them into the messages
+    at the chunk boundaries, then all chunks accumulate their expected counts
+    concurrently. Computing a transfer matrix costs O(N^3) per step against the
+    O(N^2) of the serial recursion, so this pays off for small N.
+    """
+    # products of many step matrices are formed in float64 whatever the dtype
+    transition, emission, initial = (
+        np.exp(transition_log.astype(np.float64)),
+        np.exp(emission_log.astype(np.float64)),
+        np.exp(initial_log.astype(np.float64)),
+    )
+    n_states, n_symbols = emission.shape
+    n_chunks = len(chunk_offsets) - 1
+    table = calc_symbol_table_scaled(transition, emission)
+
+    transfers = np.empty((n_chunks, n_states, n_states))
+    log_scales = np.empty(n_chunks)
+    for c in prange(n_chunks):
+        transfer, log_scale = calc_transfer_scaled(
+            data, chunk_offsets[c], chunk_offsets[c + 1], table
+        )
+        transfers[c] = transfer
+        log_scales[c] = log_scale
+
+    first_forward = emission[:, data[0]] * initial
+    scale = first_forward.sum()
+    first_forward = first_forward / scale
+    forwards, backwards, first_backward, norm = calc_chunk_messages_scaled(
+        transfers, log_scales, first_forward, np.log(scale)
+    )
+
+    # every chunk owns its slice of the accumulators
+    initial_acc, transition_acc, emission_acc = _allocate_worker_statistics(
+        n_chunks, n_states, n_symbols
+    )
+    for c in prange(n_chunks):
+        accumulate_statistics_scaled_segment(
+            data,
+            chunk_offsets[c],
+            chunk_offsets[c + 1],
+            table,
+            forwards[c],
+            backwards[c],
+            transition_acc[c],
+            emission_acc[c],
+        )
+
+    # the first observation
+    hidden_state_prob = first_forward * first_backward
+    hidden_state_prob /= hidden_state_prob.sum()
+    initial_acc[0] += hidden_state_prob
+    emission_acc[0, :, data[0]] += hidden_state_prob
+
+    transition_log, emission_log, initial_log = _reduce_worker_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+    return transition_log, emission_log, initial_log, norm
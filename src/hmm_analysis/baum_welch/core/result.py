@@ -1,26 +1,225 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
-from hmm_analysis.utils.casting import cast_exp
+import numpy as np
+from .instrumentation import Instrumentation
+from hmm_analysis.utils.casting import cast_exp, cast_log
 from numpy.typing import NDArray
 
 
-@dataclass
 class BaumWelchResult:
-    transition: NDArray
-    emission: NDArray
-    initial: NDArray
-    likelihood_log: float
+    """Parameters and likelihood of one Baum-Welch iteration.
 
+    The estimators produce log-space parameters, and the probability-space
+    ``transition``, ``emission`` and ``initial`` are only exponentiated on first
+    access, at most once. A caller watching ``likelihood_log`` alone never pays
+    for them. Likewise a result built from probabilities computes the ``*_log``
+    arrays on demand. Assigning a parameter in either space replaces it, and the
+    other space is derived from the new value on its next access.
 
-def list_of_log_estimations_to_bw_results(list_of_log_estimations):
-    def _helper():
-        for elem in list_of_log_estimations:
-            transition, emission, initial, likelihood_log = elem
-            transition, emission, initial = cast_exp(transition, emission, initial)
-            yield BaumWelchResult(
-                transition=transition,
-                emission=emission,
-                initial=initial,
-                likelihood_log=likelihood_log,
+    Attributes:
+        transition, emission, initial: Estimated parameters (regular space)
+        transition_log, emission_log, initial_log: The same in log space
+        likelihood_log: Log-likelihood, the total over all sequences for
+            multi-sequence
+        sequence_likelihoods_log: Per-sequence log-likelihoods of a
+            multi-sequence fit
+        n_iter, converged, stop_reason, likelihood_history: Filled in by
+            baum_welch() once iterating stops
+        instrumentation: Per-phase timings of instrumented runs, all
+            iterations for baum_welch()
+    """
+
+    __slots__ = (
+        "_emission",
+        "_emission_log",
+        "_initial",
+        "_initial_log",
+        "_transition",
+        "_transition_log",
+        "converged",
+        "instrumentation",
+        "likelihood_history",
+        "likelihood_log",
+        "n_iter",
+        "sequence_likelihoods_log",
+        "stop_reason",
+    )
+
+    def __init__(
+        self,
+        transition: NDArray | None = None,
+        emission: NDArray | None = None,
+        initial: NDArray | None = None,
+        likelihood_log: float | None = None,
+        sequence_likelihoods_log: NDArray | None = None,
+        n_iter: int | None = None,
+        converged: bool | None = None,
+        stop_reason: str | None = None,
+        likelihood_history: NDArray | None = None,
+        instrumentation: Instrumentation | None = None,
+        *,
+        transition_log: NDArray | None = None,
+        emission_log: NDArray | None = None,
+        initial_log: NDArray | None = None,
+    ):
+        if (transition is None) == (transition_log is None) or (
+            (emission is None) == (emission_log is None)
+            or (initial is None) == (initial_log is None)
+        ):
+            raise ValueError(
+                "pass every parameter either in regular space or in log space"
             )
+        self._transition, self._transition_log = transition, transition_log
+        self._emission, self._emission_log = emission, emission_log
+        self._initial, self._initial_log = initial, initial_log
+        self.likelihood_log = likelihood_log
+        self.sequence_likelihoods_log = sequence_likelihoods_log
+        self.n_iter = n_iter
+        self.converged = converged
+        self.stop_reason = stop_reason
+        self.likelihood_history = likelihood_history
+        self.instrumentation = instrumentation
+
+    @classmethod
+    def from_log(
+        cls, transition_log, emission_log, initial_log, likelihood_log, **kwargs
+    ) -> BaumWelchResult:
+        """A result over log-space parameters, exponentiated lazily."""
+        return cls(
+            likelihood_log=likelihood_log,
+            transition_log=transition_log,
+            emission_log=emission_log,
+            initial_log=initial_log,
+            **kwargs,
+        )
+
+    @property
+    def transition(self) -> NDArray:
+        if self._transition is None:
+            (self._transition,) = cast_exp(self._transition_log)
+        return self._transition
+
+    @transition.setter
+    def transition(self, value: NDArray):
+        # the log-space copy is derived again on its next access
+        self._transition, self._transition_log = value, None
+
+    @property
+    def emission(self) -> NDArray:
+        if self._emission is None:
+            (self._emission,) = cast_exp(self._emission_log)
+        return self._emission
+
+    @emission.setter
+    def emission(self, value: NDArray):
+        # the log-space copy is derived again on its next access
+        self._emission, self._emission_log = value, None
+
+    @property
+    def initial(self) -> NDArray:
+        if self._initial is None:
+            (self._initial,) = cast_exp(self._initial_log)
+        return self._initial
+
+    @initial.setter
+    def initial(self, value: NDArray):
+        # the log-space copy is derived again on its next access
+        self._initial, self._initial_log = value, None
+
+    @property
+    def transition_log(self) -> NDArray:
+        if self._transition_log is None:
+            (self._transition_log,) = cast_log(self._transition)
+        return self._transition_log
+
+    @transition_log.setter
+    def transition_log(self, value: NDArray):
+        self._transition, self._transition_log = None, value
+
+    @property
+    def emission_log(self) -> NDArray:
+        if self._emission_log is None:
+            (self._emission_log,) = cast_log(self._emission)
+        return self._emission_log
+
+    @emission_log.setter
+    def emission_log(self, value: NDArray):
+        self._emission, self._emission_log = None, value
+
+    @property
+    def initial_log(self) -> NDArray:
+        if self._initial_log is None:
+            (self._initial_log,) = cast_log(self._initial)
+        return self._initial_log
+
+    @initial_log.setter
+    def initial_log(self, value: NDArray):
+        self._initial, self._initial_log = None, value
+
+    def __repr__(self) -> str:
+        fields = (
+            "transition",
+            "emission",
+            "initial",
+            "likelihood_log",
+            "sequence_likelihoods_log",
+            "n_iter",
+            "converged",
+            "stop_reason",
+            "likelihood_history",
+            "instrumentation",
+        )
+        arguments = ", ".join(f"{field}={getattr(self, field)!r}" for field in fields)
+        return f"{type(self).__name__}({arguments})"
+
+
+def log_estimation_to_bw_result(log_estimation) -> BaumWelchResult:
+    """Wrap one tuple yielded by the internal iterator, without copying."""
+    transition_log, emission_log, initial_log, likelihood_log = log_estimation[:4]
+    return BaumWelchResult.from_log(
+        transition_log,
+        emission_log,
+        initial_log,
+        likelihood_log,
+        sequence_likelihoods_log=(
+            log_estimation[4] if len(log_estimation) > 4 else None
+        ),
+        instrumentation=log_estimation[5] if len(log_estimation) > 5 else None,
+    )
+
+
+def list_of_log_estimations_to_bw_results(list_of_log_estimations):
+    return [
+        log_estimation_to_bw_result(log_estimation)
+        for log_estimation in list_of_log_estimations
+    ]
+
+
+@dataclass
+class MultistartResult:
+    """Outcome of ``baum_welch_multistart``.
+
+    Attributes:
+        best: Result of the start with the highest final log-likelihood
+        best_index: Index of that start
+        results: Final result of every start, in the order of the guesses
+        likelihoods_log: Final log-likelihood of every start
+        pruned: Whether every start was dropped before finishing
+    """
+
+    best: BaumWelchResult
+    best_index: int
+    results: list[BaumWelchResult]
+    likelihoods_log: NDArray
+    pruned: NDArray
+
+    @property
+    def n_iter(self) -> NDArray:
+        """Number of iterations run by every start."""
+        return np.array([result.n_iter for result in self.results])
 
-    return list(_helper())
+    @property
+    def converged(self) -> NDArray:
+        """Whether every start converged."""
+        return np.array([bool(result.converged) for result in self.results])
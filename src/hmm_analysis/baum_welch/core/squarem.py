@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import numpy as np
+from hmm_analysis.utils.casting import cast_dtype, cast_exp, cast_log
+from numpy.typing import NDArray
+
+# negative entries of an extrapolated matrix are clipped to this before the rows
+# are renormalised, structural zeros of the parameters stay exactly zero
+SIMPLEX_FLOOR = 1e-12
+
+# the maximal step length grows by this factor every time it is reached
+STEP_MAX_FACTOR = 4.0
+
+
+def project_simplex(matrix: NDArray) -> NDArray:
+    """Clip negative probabilities and renormalise the rows (the last axis)."""
+    matrix = np.where(matrix < 0, SIMPLEX_FLOOR, matrix)
+    return matrix / matrix.sum(axis=-1, keepdims=True)
+
+
+def squarem_extrapolate(
+    params0: tuple, params1: tuple, params2: tuple, step_max: float
+) -> tuple[list[NDArray], float]:
+    """SQUAREM (S3) extrapolation from two consecutive EM updates.
+
+    With r = params1 - params0 and v = params2 - params1 - r, the step length is
+    alpha = -|r| / |v| clipped to [-step_max, -1], and the extrapolated point
+    params0 - 2 alpha r + alpha^2 v is projected back onto the simplex. alpha = -1
+    gives params2, the plain double EM step.
+
+    Args:
+        params0, params1, params2: (transition, emission, initial) in probability
+            space, params1 and params2 the EM updates of params0 and params1
+
+    Returns:
+        The extrapolated parameters and the step length
+    """
+    r = [p1 - p0 for p0, p1 in zip(params0, params1)]
+    v = [p2 - p1 - ri for p1, p2, ri in zip(params1, params2, r)]
+    r_norm = np.sqrt(sum(np.sum(ri**2) for ri in r))
+    v_norm = np.sqrt(sum(np.sum(vi**2) for vi in v))
+    if v_norm == 0:
+        return list(params2), -1.0
+
+    alpha = min(max(-r_norm / v_norm, -step_max), -1.0)
+    extrapolated = [
+        project_simplex(p0 - 2 * alpha * ri + alpha**2 * vi)
+        for p0, ri, vi in zip(params0, r, v)
+    ]
+    return extrapolated, alpha
+
+
+def squarem_iter(em_step, transition_log: NDArray, emission_log: NDArray, initial_log):
+    """SQUAREM accelerated EM iterations.
+
+    Every cycle runs two EM steps, extrapolates along them and runs one more EM
+    step from the extrapolated point to stabilise it. If the likelihood of the
+    extrapolated point is below the one the cycle started from, the cycle falls
+    back to a third plain EM step instead, so the likelihood never decreases.
+
+    Args:
+        em_step: Maps (transition_log, emission_log, initial_log) to the updated
+            log parameters, the log-likelihood of its input and the per-sequence
+            log-likelihoods (or None). It is always called with parameters of
+            the dtype of ``transition_log``
+
+    Yields:
+        The same 5-tuples as em_step, one per cycle
+    """
+    step_max = 1.0
+    dtype = transition_log.dtype
+    params_log = (transition_log, emission_log, initial_log)
+    while True:
+        *params1_log, likelihood0, _ = em_step(*params_log)
+        *params2_log, _, _ = em_step(*params1_log)
+
+        extrapolated, alpha = squarem_extrapolate(
+            cast_exp(*params_log),
+            cast_exp(*params1_log),
+            cast_exp(*params2_log),
+            step_max,
+        )
+        if alpha == -step_max:
+            step_max *= STEP_MAX_FACTOR
+
+        # back to the dtype the em_step kernels are compiled for, the
+        # extrapolation may promote to float64
+        *new_params_log, likelihood, sequence_likelihoods = em_step(
+            *cast_dtype(dtype, *cast_log(*extrapolated))
+        )
+        if not likelihood >= likelihood0:
+            # the extrapolation overshot, continue with plain EM
+            step_max = max(step_max / STEP_MAX_FACTOR, 1.0)
+            *new_params_log, likelihood, sequence_likelihoods = em_step(*params2_log)
+
+        params_log = tuple(new_params_log)
+        yield (*params_log, likelihood, sequence_likelihoods)
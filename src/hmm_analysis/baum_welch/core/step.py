@@ -1,45 +1,266 @@
 from __future__ import annotations
 
+import itertools
+import numpy as np
 from hmm_analysis.baum_welch.variable_updates import (
-    update_variables_log,
-    update_variables_log_multi_sequence,
+    update_variables_log_from_statistics,
+    update_variables_log_sparse_from_statistics,
 )
-from hmm_analysis.forward_backward import get_forward_backward_likelihood_log
-from hmm_analysis.baum_welch.estimations import estimate_hidden_transition_log
-from hmm_analysis.utils.casting import cast_log
+from hmm_analysis.baum_welch.estimations import (
+    allocate_statistics,
+    accumulate_statistics_log,
+    accumulate_statistics_log_checkpointed,
+    accumulate_statistics_log_table,
+    accumulate_statistics_log_table_packed,
+    accumulate_statistics_log_sparse,
+    accumulate_statistics_log_sparse_packed,
+    accumulate_statistics_scaled,
+    accumulate_statistics_runs_scaled,
+    accumulate_statistics_log_packed,
+    accumulate_statistics_log_packed_into,
+    accumulate_statistics_log_table_packed_into,
+    accumulate_statistics_scaled_packed,
+    accumulate_statistics_scaled_packed_into,
+)
+from hmm_analysis.baum_welch.core.parallel import (
+    step_parallel_in_time,
+    step_multi_sequences_parallel,
+    step_multi_sequences_scaled_parallel,
+)
+from hmm_analysis.baum_welch.core.instrumentation import step_instrumented
+from hmm_analysis.baum_welch.core.squarem import squarem_iter
+from hmm_analysis.baum_welch.core.workspace import Workspace
+from hmm_analysis.forward_backward import (
+    calc_symbol_table_log,
+    calc_symbol_table_log_into,
+    compress_runs,
+    resolve_checkpoint_interval,
+    use_symbol_table,
+)
+from hmm_analysis.sparse import SparseTransition
+from hmm_analysis.sequences import (
+    PackedSequences,
+    SequenceStore,
+    pack_sequences,
+    schedule_chunks,
+    schedule_workers,
+)
+from hmm_analysis.utils.casting import cast_dtype, cast_log, resolve_dtype
 from numpy.typing import NDArray
 from numba import jit
 
+BACKENDS = ("log", "scaled")
+
 
 @jit(nopython=True, fastmath=True, cache=True)
 def step(
     data: NDArray, transition_log: NDArray, emission_log: NDArray, initial_log: NDArray
 ):
     """Single sequence Baum-Welch step implementation."""
-    # calculate forward and backward & casting them into numpy arrays
-    forward_log, backward_log, norm = get_forward_backward_likelihood_log(
-        data, initial_log, transition_log, emission_log
+    # expected counts of the hidden states and transitions, folded while walking
+    # the sequence instead of materialising the (T - 1, N, N) transition tensor
+    initial_acc, transition_acc, emission_acc = allocate_statistics(
+        transition_log.shape[0], emission_log.shape[1]
+    )
+    if use_symbol_table(
+        transition_log.shape[0], emission_log.shape[1], transition_log.itemsize
+    ):
+        # the symbol-conditioned transitions are built once per iteration
+        table = calc_symbol_table_log(transition_log, emission_log)
+        norm = accumulate_statistics_log_table(
+            data,
+            table,
+            emission_log,
+            initial_log,
+            initial_acc,
+            transition_acc,
+            emission_acc,
+        )
+    else:
+        norm = accumulate_statistics_log(
+            data,
+            transition_log,
+            emission_log,
+            initial_log,
+            initial_acc,
+            transition_acc,
+            emission_acc,
+        )
+
+    # updated variables - transition, emission, and initial
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
     )
 
-    # calculate the temporary variables, hidden state prob and transition prob
-    hidden_state_prob_log, transition_prob_log = estimate_hidden_transition_log(
-        data, forward_log, backward_log, transition_log, emission_log, norm
+    return transition_log, emission_log, initial_log, norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_checkpointed(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    interval: int,
+):
+    """Single sequence Baum-Welch step storing every ``interval``-th forward message."""
+    initial_acc, transition_acc, emission_acc = allocate_statistics(
+        transition_log.shape[0], emission_log.shape[1]
+    )
+    norm = accumulate_statistics_log_checkpointed(
+        data,
+        transition_log,
+        emission_log,
+        initial_log,
+        interval,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
+
+    # updated variables - transition, emission, and initial
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+
+    return transition_log, emission_log, initial_log, norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_sparse(
+    data: NDArray,
+    indptr: NDArray,
+    indices: NDArray,
+    transition_values_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+):
+    """Single sequence Baum-Welch step for a transition matrix in CSR layout."""
+    initial_acc = np.zeros(len(indptr) - 1)
+    transition_acc = np.zeros(len(indices))
+    emission_acc = np.zeros(emission_log.shape)
+    norm = accumulate_statistics_log_sparse(
+        data,
+        indptr,
+        indices,
+        transition_values_log,
+        emission_log,
+        initial_log,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
+
+    # only the stored transitions are re-estimated
+    initial_log, transition_values_log, emission_log = (
+        update_variables_log_sparse_from_statistics(
+            indptr, initial_acc, transition_acc, emission_acc
+        )
+    )
+
+    return transition_values_log, emission_log, initial_log, norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_scaled(
+    data: NDArray, transition_log: NDArray, emission_log: NDArray, initial_log: NDArray
+):
+    """Single sequence Baum-Welch step using the scaled (probability space) engine."""
+    transition, emission, initial = (
+        np.exp(transition_log),
+        np.exp(emission_log),
+        np.exp(initial_log),
+    )
+
+    # expected counts from the scaled forward-backward
+    initial_acc, transition_acc, emission_acc = allocate_statistics(
+        transition.shape[0], emission.shape[1]
+    )
+    norm = accumulate_statistics_scaled(
+        data, transition, emission, initial, initial_acc, transition_acc, emission_acc
+    )
+
+    # updated variables - transition, emission, and initial
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+
+    return transition_log, emission_log, initial_log, norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_run_length(
+    symbols: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    lengths: NDArray,
+):
+    """Single sequence Baum-Welch step on a run-length encoded sequence.
+
+    ``symbols`` and ``lengths`` are the runs as returned by ``compress_runs``.
+    """
+    # products of many step matrices are formed in float64 whatever the dtype
+    transition, emission, initial = (
+        np.exp(transition_log.astype(np.float64)),
+        np.exp(emission_log.astype(np.float64)),
+        np.exp(initial_log.astype(np.float64)),
+    )
+    initial_acc, transition_acc, emission_acc = allocate_statistics(
+        transition.shape[0], emission.shape[1]
+    )
+    norm = accumulate_statistics_runs_scaled(
+        symbols,
+        lengths,
+        transition,
+        emission,
+        initial,
+        initial_acc,
+        transition_acc,
+        emission_acc,
     )
 
     # updated variables - transition, emission, and initial
-    initial_log, transition_log, emission_log = update_variables_log(
-        data, hidden_state_prob_log, transition_prob_log, emission_log
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
     )
 
     return transition_log, emission_log, initial_log, norm
 
 
+def _get_step_functions(backend: str, parallel: bool = False):
+    """Return the (single sequence, multi sequence) step kernels of a backend."""
+    if backend == "log":
+        if parallel:
+            return step, step_multi_sequences_parallel
+        return step, step_multi_sequences
+    if backend == "scaled":
+        if parallel:
+            return step_scaled, step_multi_sequences_scaled_parallel
+        return step_scaled, step_multi_sequences_scaled
+    raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+
+def _get_workspace_step_functions(backend: str):
+    """Return the (single sequence, multi sequence) ``*_into`` step kernels."""
+    if backend == "log":
+        return step_into, step_multi_sequences_into
+    return step_scaled_into, step_multi_sequences_scaled_into
+
+
 def baum_welch_iter(
-    data: NDArray | list[NDArray],
+    data: NDArray | list[NDArray] | PackedSequences | SequenceStore,
     transition: NDArray,
     emission: NDArray,
     initial: NDArray,
     multi_sequence: bool = False,
+    backend: str = "log",
+    parallel: bool = False,
+    checkpoint_interval: int | str | None = None,
+    run_length: bool = False,
+    accelerate: bool = False,
+    dtype=np.float64,
+    instrument: bool = False,
 ):
     """Infinite iterator for Baum-Welch algorithm that yields results per iteration.
 
@@ -48,60 +269,672 @@ def baum_welch_iter(
     User explicitly controls single vs multi-sequence processing.
 
     Args:
-        data: Observation sequences (single array or list of arrays for multi-sequence)
+        data: Observation sequences (single array, or a list of arrays, a 2-D array
+            or PackedSequences for multi-sequence, or a SequenceStore streamed
+            from disk, see ``step_sequence_store``)
         transition: Initial transition matrix guess
         emission: Initial emission matrix guess
         initial: Initial probability vector guess
-        multi_sequence: Whether to use multi-sequence processing (default False)
+        multi_sequence: Whether to use multi-sequence processing (default False),
+            always on for PackedSequences and a SequenceStore
+        backend: Forward-backward engine, "log" (default) or "scaled"
+        parallel: Spread the E-step across threads (default False), sequences
+            for multi-sequence and chunks of time for a single sequence
+        checkpoint_interval: Store only every k-th forward message of a single
+            sequence and recompute the rest during the backward pass, an int k or
+            "sqrt" for k = ceil(sqrt(T)). None (default) stores all of them
+        run_length: Run-length encode a single sequence and jump over long runs
+            of repeated observations with matrix powers (default False)
+        accelerate: Yield SQUAREM extrapolated EM cycles instead of plain EM
+            steps, see ``squarem_iter`` (default False)
+        dtype: Floating point type of the parameters and of the message buffers
+            of the kernels, np.float64 (default) or np.float32. Expected counts
+            and likelihoods are always accumulated in float64
+        instrument: Run the forward pass, the backward pass and the M-step as
+            separate kernels and time each of them, see ``step_instrumented``
+            (default False). Serial log and scaled backends only
+
+    A SparseTransition guess runs the sparse log-space kernels, the yielded
+    transition_log is then a SparseTransition holding log-probabilities.
 
     Yields:
-        tuple: (transition_log, emission_log, initial_log, likelihood_log) for each iteration
+        tuple: (transition_log, emission_log, initial_log, likelihood_log,
+        sequence_likelihoods_log) for each iteration. likelihood_log is the total
+        over all sequences, sequence_likelihoods_log holds the one of every
+        sequence for multi-sequence and is None for a single sequence. With
+        instrument the tuples carry the Instrumentation of the iteration as a
+        sixth element
     """
+    single_step, multi_step = _get_step_functions(backend, parallel)
+    dtype = resolve_dtype(dtype)
+    if instrument and (
+        parallel
+        or checkpoint_interval is not None
+        or run_length
+        or accelerate
+        or isinstance(transition, SparseTransition)
+    ):
+        raise ValueError(
+            "instrument is only supported by the serial dense log and scaled "
+            "backends, without checkpointing, run_length or accelerate"
+        )
+    if isinstance(data, SequenceStore) and (
+        parallel or instrument or isinstance(transition, SparseTransition)
+    ):
+        raise ValueError(
+            "a SequenceStore is only supported by the serial dense log and "
+            "scaled backends, without instrument"
+        )
+
+    # the single sequence step of the log engine can trade memory for a second
+    # forward pass
+    single_step_args = ()
+    if run_length:
+        if (
+            multi_sequence
+            or isinstance(data, (PackedSequences, SequenceStore))
+            or parallel
+        ):
+            raise ValueError("run_length is only supported for a single sequence")
+        if checkpoint_interval is not None or isinstance(transition, SparseTransition):
+            raise ValueError(
+                "run_length can not be combined with checkpointing or sparse transitions"
+            )
+        single_step = step_run_length
+        data, lengths = compress_runs(data)
+        single_step_args = (lengths,)
+    if checkpoint_interval is not None:
+        if (
+            multi_sequence
+            or isinstance(data, (PackedSequences, SequenceStore))
+            or backend != "log"
+            or parallel
+        ):
+            raise ValueError(
+                "checkpoint_interval is only supported for a single sequence "
+                "with the serial log backend"
+            )
+        single_step = step_checkpointed
+        single_step_args = (
+            resolve_checkpoint_interval(len(data), checkpoint_interval),
+        )
+
     # casting all parameters to log space once
     transition_log, emission_log, initial_log = cast_log(transition, emission, initial)
 
+    if isinstance(transition, SparseTransition):
+        if backend != "log" or parallel or checkpoint_interval is not None:
+            raise ValueError(
+                "a SparseTransition is only supported by the serial log backend "
+                "without checkpointing"
+            )
+        if accelerate or dtype != np.float64:
+            raise ValueError(
+                "accelerate and float32 are not supported for a SparseTransition"
+            )
+        yield from _baum_welch_iter_sparse(
+            data, transition_log, emission_log, initial_log, multi_sequence
+        )
+        return
+    transition_log, emission_log, initial_log = cast_dtype(
+        dtype, transition_log, emission_log, initial_log
+    )
+
+    # multi-sequence kernels work on one flat buffer plus offsets, a store is
+    # read chunk by chunk on every iteration instead
+    multi_data = None
+    if isinstance(data, SequenceStore):
+        multi_sequence = True
+        multi_step = step_sequence_store
+        multi_data = (data,)
+    multi_sequence = multi_sequence or isinstance(data, PackedSequences)
+    if multi_sequence and multi_data is None:
+        packed = pack_sequences(data)
+        data, offsets = packed.data, packed.offsets
+        multi_data = (data, offsets)
+
+    # the work distribution only depends on the data, schedule it once
+    multi_step_args = ()
+    if isinstance(data, SequenceStore):
+        multi_step_args = (backend,)
+    elif multi_sequence and parallel:
+        multi_step_args = schedule_workers(offsets)
+    elif parallel:
+        # a single sequence is split in time across the threads
+        single_step = step_parallel_in_time
+        single_step_args = (schedule_chunks(len(data)),)
+
+    # the serial dense steps reuse one set of buffers across iterations
+    if not (
+        parallel
+        or instrument
+        or run_length
+        or checkpoint_interval is not None
+        or isinstance(data, SequenceStore)
+    ):
+        n_states, n_symbols = emission_log.shape
+        if multi_sequence:
+            workspace = Workspace.for_sequences(
+                offsets, n_states, n_symbols, backend, dtype
+            )
+        else:
+            workspace = Workspace(len(data), n_states, n_symbols, backend, dtype)
+        single_step, multi_step = _get_workspace_step_functions(backend)
+        single_step_args = multi_step_args = workspace.step_args()
+
+    if instrument:
+        yield from _baum_welch_iter_instrumented(
+            data if multi_sequence else np.asarray(data),
+            offsets if multi_sequence else None,
+            transition_log,
+            emission_log,
+            initial_log,
+            backend,
+            dtype,
+        )
+        return
+
+    def em_step(transition_log, emission_log, initial_log):
+        # user explicitly controls single vs multi-sequence processing
+        sequence_likelihoods_log = None
+        if multi_sequence:
+            (
+                transition_log,
+                emission_log,
+                initial_log,
+                likelihood_log,
+                sequence_likelihoods_log,
+            ) = multi_step(
+                *multi_data,
+                transition_log,
+                emission_log,
+                initial_log,
+                *multi_step_args,
+            )
+        else:
+            transition_log, emission_log, initial_log, likelihood_log = single_step(
+                data, transition_log, emission_log, initial_log, *single_step_args
+            )
+
+        # the M-step normalises float64 expected counts
+        transition_log, emission_log, initial_log = cast_dtype(
+            dtype, transition_log, emission_log, initial_log
+        )
+        return (
+            transition_log,
+            emission_log,
+            initial_log,
+            likelihood_log,
+            sequence_likelihoods_log,
+        )
+
+    if accelerate:
+        yield from squarem_iter(em_step, transition_log, emission_log, initial_log)
+        return
+
     # infinite iterator - user controls stopping
     while True:
-        # user explicitly controls single vs multi-sequence processing
+        (
+            transition_log,
+            emission_log,
+            initial_log,
+            likelihood_log,
+            sequence_likelihoods_log,
+        ) = em_step(transition_log, emission_log, initial_log)
+
+        yield (
+            transition_log,
+            emission_log,
+            initial_log,
+            likelihood_log,
+            sequence_likelihoods_log,
+        )
+
+
+def _baum_welch_iter_instrumented(
+    data, offsets, transition_log, emission_log, initial_log, backend, dtype
+):
+    """``baum_welch_iter`` through ``step_instrumented``, offsets is None for a
+    single sequence."""
+    multi_sequence = offsets is not None
+    if not multi_sequence:
+        offsets = np.array([0, len(data)], dtype=np.int64)
+
+    for iteration in itertools.count():
+        transition_log, emission_log, initial_log, norms, instrumentation = (
+            step_instrumented(
+                data,
+                offsets,
+                transition_log,
+                emission_log,
+                initial_log,
+                backend,
+                iteration,
+            )
+        )
+        transition_log, emission_log, initial_log = cast_dtype(
+            dtype, transition_log, emission_log, initial_log
+        )
+        yield (
+            transition_log,
+            emission_log,
+            initial_log,
+            norms.sum(),
+            norms if multi_sequence else None,
+            instrumentation,
+        )
+
+
+def _baum_welch_iter_sparse(
+    data, transition_log, emission_log, initial_log, multi_sequence
+):
+    """``baum_welch_iter`` for a SparseTransition of log-probabilities."""
+    indptr, indices = transition_log.indptr, transition_log.indices
+    transition_values_log = transition_log.values
+
+    multi_sequence = multi_sequence or isinstance(data, PackedSequences)
+    if multi_sequence:
+        packed = pack_sequences(data)
+
+    while True:
+        sequence_likelihoods_log = None
         if multi_sequence:
-            transition_log, emission_log, initial_log, likelihood_log = (
-                step_multi_sequences(data, transition_log, emission_log, initial_log)
+            (
+                transition_values_log,
+                emission_log,
+                initial_log,
+                likelihood_log,
+                sequence_likelihoods_log,
+            ) = step_multi_sequences_sparse(
+                packed.data,
+                packed.offsets,
+                indptr,
+                indices,
+                transition_values_log,
+                emission_log,
+                initial_log,
             )
         else:
-            transition_log, emission_log, initial_log, likelihood_log = step(
-                data, transition_log, emission_log, initial_log
+            transition_values_log, emission_log, initial_log, likelihood_log = (
+                step_sparse(
+                    data,
+                    indptr,
+                    indices,
+                    transition_values_log,
+                    emission_log,
+                    initial_log,
+                )
             )
 
-        yield transition_log, emission_log, initial_log, likelihood_log
+        yield (
+            transition_log.with_values(transition_values_log),
+            emission_log,
+            initial_log,
+            likelihood_log,
+            sequence_likelihoods_log,
+        )
 
 
 @jit(nopython=True, fastmath=True, cache=True)
 def step_multi_sequences(
-    data: list[NDArray],
+    data: NDArray,
+    offsets: NDArray,
     transition_log: NDArray,
     emission_log: NDArray,
     initial_log: NDArray,
 ):
-    """Multi-sequence Baum-Welch step implementation."""
-    hidden_state_prob_log_lst, transition_prob_log_lst = [], []
+    """Multi-sequence Baum-Welch step implementation.
 
-    for sequence in data:
-        # calculate forward and backward & casting them into numpy arrays
-        forward_log, backward_log, norm = get_forward_backward_likelihood_log(
-            sequence, initial_log, transition_log, emission_log
-        )
+    The sequences are packed, sequence i is data[offsets[i]:offsets[i + 1]]. The
+    total log-likelihood is returned followed by the one of every sequence.
+    """
+    initial_acc, transition_acc, emission_acc = allocate_statistics(
+        transition_log.shape[0], emission_log.shape[1]
+    )
 
-        # calculate the temporary variables, hidden state prob and transition prob
-        hidden_state_prob_log, transition_prob_log = estimate_hidden_transition_log(
-            sequence, forward_log, backward_log, transition_log, emission_log, norm
+    # expected counts are additive over sequences
+    if use_symbol_table(
+        transition_log.shape[0], emission_log.shape[1], transition_log.itemsize
+    ):
+        table = calc_symbol_table_log(transition_log, emission_log)
+        norms = accumulate_statistics_log_table_packed(
+            data,
+            offsets,
+            table,
+            emission_log,
+            initial_log,
+            initial_acc,
+            transition_acc,
+            emission_acc,
+        )
+    else:
+        norms = accumulate_statistics_log_packed(
+            data,
+            offsets,
+            transition_log,
+            emission_log,
+            initial_log,
+            initial_acc,
+            transition_acc,
+            emission_acc,
         )
 
-        hidden_state_prob_log_lst.append(hidden_state_prob_log)
-        transition_prob_log_lst.append(transition_prob_log)
+    # updated variables - transition, emission, and initial
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+
+    return transition_log, emission_log, initial_log, norms.sum(), norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_multi_sequences_scaled(
+    data: NDArray,
+    offsets: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+):
+    """Multi-sequence Baum-Welch step using the scaled (probability space) engine."""
+    transition, emission, initial = (
+        np.exp(transition_log),
+        np.exp(emission_log),
+        np.exp(initial_log),
+    )
+    initial_acc, transition_acc, emission_acc = allocate_statistics(
+        transition.shape[0], emission.shape[1]
+    )
+
+    # expected counts are additive over sequences
+    norms = accumulate_statistics_scaled_packed(
+        data,
+        offsets,
+        transition,
+        emission,
+        initial,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
 
     # updated variables - transition, emission, and initial
-    initial_log, transition_log, emission_log = update_variables_log_multi_sequence(
-        data, hidden_state_prob_log_lst, transition_prob_log_lst, emission_log
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+
+    return transition_log, emission_log, initial_log, norms.sum(), norms
+
+
+def step_sequence_store(
+    store: SequenceStore,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    backend: str = "log",
+):
+    """Multi-sequence Baum-Welch step streaming the sequences of a store.
+
+    The store is read front to back one chunk at a time, see
+    ``SequenceStore.chunks``, and every chunk is folded into the same expected
+    counts by the packed kernels of ``step_multi_sequences[_scaled]``. Only the
+    current chunk and the messages of its longest sequence are in memory.
+    """
+    n_states, n_symbols = emission_log.shape
+    initial_acc, transition_acc, emission_acc = allocate_statistics(n_states, n_symbols)
+
+    table = None
+    if backend == "log":
+        if use_symbol_table(n_states, n_symbols, transition_log.itemsize):
+            table = calc_symbol_table_log(transition_log, emission_log)
+    else:
+        transition, emission, initial = (
+            np.exp(transition_log),
+            np.exp(emission_log),
+            np.exp(initial_log),
+        )
+
+    norms = np.zeros(len(store))
+    for first, chunk in store.chunks():
+        if table is not None:
+            chunk_norms = accumulate_statistics_log_table_packed(
+                chunk.data,
+                chunk.offsets,
+                table,
+                emission_log,
+                initial_log,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+        elif backend == "log":
+            chunk_norms = accumulate_statistics_log_packed(
+                chunk.data,
+                chunk.offsets,
+                transition_log,
+                emission_log,
+                initial_log,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+        else:
+            chunk_norms = accumulate_statistics_scaled_packed(
+                chunk.data,
+                chunk.offsets,
+                transition,
+                emission,
+                initial,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+        norms[first : first + len(chunk)] = chunk_norms
+
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+    return transition_log, emission_log, initial_log, norms.sum(), norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_multi_sequences_into(
+    data: NDArray,
+    offsets: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    forward_log: NDArray,
+    table: NDArray,
+    initial_acc: NDArray,
+    transition_acc: NDArray,
+    emission_acc: NDArray,
+):
+    """``step_multi_sequences`` running in the buffers of a ``Workspace``.
+
+    The expected counts are reset in place and the symbol table is rebuilt in
+    ``table`` unless it is empty, only the updated parameters and the
+    likelihoods of the sequences are allocated.
+    """
+    initial_acc[:] = 0.0
+    transition_acc[:] = 0.0
+    emission_acc[:] = 0.0
+
+    if len(table) > 0:
+        calc_symbol_table_log_into(transition_log, emission_log, table)
+        norms = accumulate_statistics_log_table_packed_into(
+            data,
+            offsets,
+            table,
+            emission_log,
+            initial_log,
+            initial_acc,
+            transition_acc,
+            emission_acc,
+            forward_log,
+        )
+    else:
+        norms = accumulate_statistics_log_packed_into(
+            data,
+            offsets,
+            transition_log,
+            emission_log,
+            initial_log,
+            initial_acc,
+            transition_acc,
+            emission_acc,
+            forward_log,
+        )
+
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
     )
+    return transition_log, emission_log, initial_log, norms.sum(), norms
+
 
+@jit(nopython=True, fastmath=True, cache=True)
+def step_multi_sequences_scaled_into(
+    data: NDArray,
+    offsets: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    forward: NDArray,
+    scales: NDArray,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    initial_acc: NDArray,
+    transition_acc: NDArray,
+    emission_acc: NDArray,
+):
+    """``step_multi_sequences_scaled`` running in the buffers of a ``Workspace``.
+
+    The regular space parameters are exponentiated into ``transition``,
+    ``emission`` and ``initial``.
+    """
+    np.exp(transition_log, transition)
+    np.exp(emission_log, emission)
+    np.exp(initial_log, initial)
+    initial_acc[:] = 0.0
+    transition_acc[:] = 0.0
+    emission_acc[:] = 0.0
+
+    norms = accumulate_statistics_scaled_packed_into(
+        data,
+        offsets,
+        transition,
+        emission,
+        initial,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+        forward,
+        scales,
+    )
+
+    initial_log, transition_log, emission_log = update_variables_log_from_statistics(
+        initial_acc, transition_acc, emission_acc
+    )
+    return transition_log, emission_log, initial_log, norms.sum(), norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_into(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    forward_log: NDArray,
+    table: NDArray,
+    initial_acc: NDArray,
+    transition_acc: NDArray,
+    emission_acc: NDArray,
+):
+    """``step`` running in the buffers of a ``Workspace``."""
+    transition_log, emission_log, initial_log, norm, _ = step_multi_sequences_into(
+        data,
+        np.array([0, len(data)]),
+        transition_log,
+        emission_log,
+        initial_log,
+        forward_log,
+        table,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
+    return transition_log, emission_log, initial_log, norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_scaled_into(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    forward: NDArray,
+    scales: NDArray,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    initial_acc: NDArray,
+    transition_acc: NDArray,
+    emission_acc: NDArray,
+):
+    """``step_scaled`` running in the buffers of a ``Workspace``."""
+    transition_log, emission_log, initial_log, norm, _ = (
+        step_multi_sequences_scaled_into(
+            data,
+            np.array([0, len(data)]),
+            transition_log,
+            emission_log,
+            initial_log,
+            forward,
+            scales,
+            transition,
+            emission,
+            initial,
+            initial_acc,
+            transition_acc,
+            emission_acc,
+        )
+    )
     return transition_log, emission_log, initial_log, norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def step_multi_sequences_sparse(
+    data: NDArray,
+    offsets: NDArray,
+    indptr: NDArray,
+    indices: NDArray,
+    transition_values_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+):
+    """Multi-sequence Baum-Welch step for a transition matrix in CSR layout."""
+    initial_acc = np.zeros(len(indptr) - 1)
+    transition_acc = np.zeros(len(indices))
+    emission_acc = np.zeros(emission_log.shape)
+
+    # expected counts are additive over sequences
+    norms = accumulate_statistics_log_sparse_packed(
+        data,
+        offsets,
+        indptr,
+        indices,
+        transition_values_log,
+        emission_log,
+        initial_log,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
+
+    initial_log, transition_values_log, emission_log = (
+        update_variables_log_sparse_from_statistics(
+            indptr, initial_acc, transition_acc, emission_acc
+        )
+    )
+
+    return transition_values_log, emission_log, initial_log, norms.sum(), norms
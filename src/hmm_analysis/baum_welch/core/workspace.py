@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+from hmm_analysis.baum_welch.estimations import allocate_statistics
+from hmm_analysis.forward_backward import use_symbol_table
+
+
+class Workspace:
+    """Buffers of the serial Baum-Welch step, allocated once for all iterations.
+
+    ``baum_welch_iter`` sizes a workspace from the data and the model and hands
+    its buffers to the ``*_into`` step kernels, which overwrite them on every
+    iteration. A steady-state iteration then only allocates the updated
+    parameters it yields, the per-sequence likelihoods and O(N) temporaries.
+
+    Attributes:
+        forward: (max_length, N) forward messages of the longest sequence
+        scales: (max_length,) Rabiner scaling constants, scaled backend only
+        table: (M, N, N) symbol table of the log backend, (0, N, N) when
+            ``use_symbol_table`` rejects it
+        parameters: Regular space (transition, emission, initial), scaled
+            backend only
+        statistics: (initial, transition, emission) expected count accumulators
+
+    Args:
+        max_length: Length of the longest sequence
+        n_states: Number of hidden states N
+        n_symbols: Number of observation symbols M
+        backend: "log" (default) or "scaled"
+        dtype: Floating point type of the parameters, np.float64 (default) or
+            np.float32. The scales and expected counts are always float64
+    """
+
+    def __init__(
+        self,
+        max_length: int,
+        n_states: int,
+        n_symbols: int,
+        backend: str = "log",
+        dtype=np.float64,
+    ):
+        if backend not in ("log", "scaled"):
+            raise ValueError(f"Unknown backend {backend!r}, expected 'log' or 'scaled'")
+        self.backend = backend
+        self.forward = np.empty((max_length, n_states), dtype=dtype)
+        self.statistics = allocate_statistics(n_states, n_symbols)
+        if backend == "log":
+            fits = use_symbol_table(n_states, n_symbols, np.dtype(dtype).itemsize)
+            n_table = n_symbols if fits else 0
+            self.table = np.empty((n_table, n_states, n_states), dtype=dtype)
+            self.scales = None
+            self.parameters = None
+        else:
+            self.table = None
+            self.scales = np.empty(max_length)
+            self.parameters = (
+                np.empty((n_states, n_states), dtype=dtype),
+                np.empty((n_states, n_symbols), dtype=dtype),
+                np.empty(n_states, dtype=dtype),
+            )
+
+    @classmethod
+    def for_sequences(
+        cls,
+        offsets: NDArray,
+        n_states: int,
+        n_symbols: int,
+        backend: str = "log",
+        dtype=np.float64,
+    ) -> Workspace:
+        """A workspace for the packed sequences delimited by ``offsets``."""
+        lengths = np.diff(offsets)
+        max_length = int(lengths.max()) if len(lengths) else 0
+        return cls(max_length, n_states, n_symbols, backend, dtype)
+
+    def step_args(self) -> tuple:
+        """The buffers in the trailing argument order of the ``*_into`` steps."""
+        if self.backend == "log":
+            return (self.forward, self.table, *self.statistics)
+        return (self.forward, self.scales, *self.parameters, *self.statistics)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self.step_args())
@@ -1,3 +1,47 @@
-from .estimate import estimate_hidden_transition_log, estimate_hidden_transition
+from .estimate import (
+    estimate_hidden_transition_log,
+    estimate_hidden_transition,
+)
+from .sufficient_statistics import (
+    allocate_statistics,
+    accumulate_statistics_log,
+    accumulate_statistics_log_from_forward,
+    accumulate_statistics_log_checkpointed,
+    accumulate_statistics_log_table,
+    accumulate_statistics_log_table_from_forward,
+    accumulate_statistics_log_table_packed,
+    accumulate_statistics_log_sparse,
+    accumulate_statistics_log_sparse_packed,
+    accumulate_statistics_scaled,
+    accumulate_statistics_scaled_from_forward,
+    accumulate_statistics_runs_scaled,
+    accumulate_statistics_scaled_segment,
+    accumulate_statistics_log_packed,
+    accumulate_statistics_log_packed_into,
+    accumulate_statistics_log_table_packed_into,
+    accumulate_statistics_scaled_packed,
+    accumulate_statistics_scaled_packed_into,
+)
 
-__all__ = ["estimate_hidden_transition_log", "estimate_hidden_transition"]
+__all__ = [
+    "accumulate_statistics_log",
+    "accumulate_statistics_log_checkpointed",
+    "accumulate_statistics_log_from_forward",
+    "accumulate_statistics_log_packed",
+    "accumulate_statistics_log_packed_into",
+    "accumulate_statistics_log_sparse",
+    "accumulate_statistics_log_sparse_packed",
+    "accumulate_statistics_log_table",
+    "accumulate_statistics_log_table_from_forward",
+    "accumulate_statistics_log_table_packed",
+    "accumulate_statistics_log_table_packed_into",
+    "accumulate_statistics_runs_scaled",
+    "accumulate_statistics_scaled",
+    "accumulate_statistics_scaled_from_forward",
+    "accumulate_statistics_scaled_packed",
+    "accumulate_statistics_scaled_packed_into",
+    "accumulate_statistics_scaled_segment",
+    "allocate_statistics",
+    "estimate_hidden_transition",
+    "estimate_hidden_transition_log",
+]
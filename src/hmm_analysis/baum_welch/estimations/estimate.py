@@ -1,5 +1,11 @@
-from .hidden_state_prob import calc_hidden_state_prob_log, calc_hidden_state_prob
-from .transition_prob import calc_transition_prob_log, calc_transition_prob
+from .hidden_state_prob import (
+    calc_hidden_state_prob_log,
+    calc_hidden_state_prob,
+)
+from .transition_prob import (
+    calc_transition_prob_log,
+    calc_transition_prob,
+)
 import numpy as np
 from numba import jit
 
@@ -36,3 +36,11 @@ def calc_hidden_state_prob_logexp(forward_lst: np.ndarray, backward_lst: np.ndar
         omega_log = calc_hidden_state_prob_log(forward_lst_log, backward_lst_log)
 
     return np.exp(omega_log)
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_hidden_state_prob_scaled(
+    forward_lst_scaled: np.ndarray, backward_lst_scaled: np.ndarray
+):
+    # with Rabiner scaling the product is already normalised at every t
+    return forward_lst_scaled * backward_lst_scaled
@@ -0,0 +1,699 @@
+import numpy as np
+from numba import jit
+from hmm_analysis.forward_backward import (
+    calc_forward_log_normalised,
+    calc_forward_log_normalised_into,
+    calc_forward_log_table_normalised,
+    calc_forward_log_table_normalised_into,
+    calc_forward_scaled,
+    calc_forward_scaled_into,
+    calc_forward_checkpoints_log,
+    calc_forward_segment_log,
+    calc_forward_log_sparse,
+    backward_step_table_log,
+    normalise_log,
+    calc_forward_runs_scaled,
+    calc_symbol_table_scaled,
+    long_run,
+    matrix_power_scaled,
+    matrix_vector_normalised,
+    vector_matrix_normalised,
+    likelihood_scaled,
+)
+from hmm_analysis.utils.expsum_ops import (
+    logexpdot_sparse_vector,
+    logsumexp_1d,
+    logsumexp_2d,
+)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def allocate_statistics(n_states: int, n_symbols: int):
+    """Zeroed (initial, transition, emission) expected count accumulators."""
+    return (
+        np.zeros(n_states),
+        np.zeros((n_states, n_states)),
+        np.zeros((n_states, n_symbols)),
+    )
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log(
+    data: np.ndarray,
+    transition_log: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """Fused log-space E-step adding the expected counts of one sequence.
+
+    The forward messages are stored, the backward pass is rolled and the hidden
+    state and transition probabilities of every step are folded into the
+    accumulators as it goes, so no (T - 1, N, N) tensor is ever materialised.
+
+    Returns:
+        The log-likelihood of the sequence
+    """
+    forward_log, norm = calc_forward_log_normalised(
+        data, transition_log, emission_log, initial_log
+    )
+
+    accumulate_statistics_log_from_forward(
+        data,
+        forward_log,
+        transition_log,
+        emission_log,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
+    return norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_from_forward(
+    data: np.ndarray,
+    forward_log: np.ndarray,
+    transition_log: np.ndarray,
+    emission_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """Backward half of ``accumulate_statistics_log`` for precomputed forwards."""
+    emission_log_transpose = emission_log.T
+    backward_log = np.zeros(transition_log.shape[0], dtype=transition_log.dtype)
+
+    for t in range(len(data) - 1, -1, -1):
+        # hidden state probability at t, normalised by its own total rather than
+        # the likelihood so the rounding of the long message chains cancels
+        posterior_log = forward_log[t] + backward_log
+        step_norm = logsumexp_1d(posterior_log)
+        hidden_state_prob = np.exp(posterior_log - step_norm)
+        emission_acc[:, data[t]] += hidden_state_prob
+        if t == 0:
+            initial_acc += hidden_state_prob
+            break
+
+        # transition(i, j) + emission(j, d) + backward(j) is shared between the
+        # transition probability at t - 1 and the backward message at t - 1
+        shared = transition_log + (emission_log_transpose[data[t]] + backward_log)
+        backward_log = logsumexp_2d(shared)
+        # the forward message at t - 1 with the backward message at t - 1 before
+        # its normalisation give the total of the transition probability
+        transition_norm = logsumexp_1d(forward_log[t - 1] + backward_log)
+        transition_acc += np.exp(
+            forward_log[t - 1].reshape(-1, 1) + shared - transition_norm
+        )
+        normalise_log(backward_log)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_table(
+    data: np.ndarray,
+    table: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """``accumulate_statistics_log`` indexing a precomputed symbol table.
+
+    ``table`` is ``calc_symbol_table_log(transition_log, emission_log)``, built once
+    per iteration, so no N x N temporary is created per time step.
+
+    Returns:
+        The log-likelihood of the sequence
+    """
+    forward_log, norm = calc_forward_log_table_normalised(
+        data, table, emission_log, initial_log
+    )
+    accumulate_statistics_log_table_from_forward(
+        data, forward_log, table, initial_acc, transition_acc, emission_acc
+    )
+    return norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_table_from_forward(
+    data: np.ndarray,
+    forward_log: np.ndarray,
+    table: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """Backward half of ``accumulate_statistics_log_table`` for precomputed forwards."""
+    n_states = table.shape[1]
+    backward_log = np.zeros(n_states, dtype=table.dtype)
+    new_backward_log = np.empty(n_states, dtype=table.dtype)
+
+    for t in range(len(data) - 1, -1, -1):
+        # hidden state probability at t, normalised by its own total
+        posterior_log = forward_log[t] + backward_log
+        step_norm = logsumexp_1d(posterior_log)
+        hidden_state_prob = np.exp(posterior_log - step_norm)
+        emission_acc[:, data[t]] += hidden_state_prob
+        if t == 0:
+            initial_acc += hidden_state_prob
+            break
+
+        # the backward message at t - 1, before its normalisation it gives the
+        # total of the transition probability between t - 1 and t
+        table_d = table[data[t]]
+        backward_step_table_log(table_d, backward_log, new_backward_log)
+        transition_norm = logsumexp_1d(forward_log[t - 1] + new_backward_log)
+        for i in range(n_states):
+            for j in range(n_states):
+                transition_acc[i, j] += np.exp(
+                    forward_log[t - 1, i]
+                    + table_d[i, j]
+                    + backward_log[j]
+                    - transition_norm
+                )
+        normalise_log(new_backward_log)
+        backward_log, new_backward_log = new_backward_log, backward_log
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_checkpointed(
+    data: np.ndarray,
+    transition_log: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    interval: int,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """``accumulate_statistics_log`` keeping only every ``interval``-th forward message.
+
+    The backward pass walks the segments between checkpoints from last to first,
+    recomputing each segment's forward messages from its checkpoint. Memory is
+    O((T / interval + interval) * N) for one extra forward pass.
+
+    Returns:
+        The log-likelihood of the sequence
+    """
+    checkpoints, norm = calc_forward_checkpoints_log(
+        data, transition_log, emission_log, initial_log, interval
+    )
+    emission_log_transpose = emission_log.T
+    backward_log = np.zeros(transition_log.shape[0], dtype=transition_log.dtype)
+    forward_log = np.empty(
+        shape=(min(interval, len(data)), transition_log.shape[0]),
+        dtype=transition_log.dtype,
+    )
+
+    for c in range(len(checkpoints) - 1, -1, -1):
+        start = c * interval
+        stop = min(start + interval, len(data))
+        calc_forward_segment_log(
+            data, transition_log, emission_log, checkpoints[c], start, stop, forward_log
+        )
+
+        for t in range(stop - 1, start - 1, -1):
+            f = forward_log[t - start]
+            if t < len(data) - 1:
+                # the backward message at t, only the forward message at t is
+                # needed for the transition probability between t and t + 1
+                shared = transition_log + (
+                    emission_log_transpose[data[t + 1]] + backward_log
+                )
+                backward_log = logsumexp_2d(shared)
+                # normalised by the total before the backward message is shifted
+                transition_norm = logsumexp_1d(f + backward_log)
+                transition_acc += np.exp(f.reshape(-1, 1) + shared - transition_norm)
+                normalise_log(backward_log)
+
+            posterior_log = f + backward_log
+            step_norm = logsumexp_1d(posterior_log)
+            hidden_state_prob = np.exp(posterior_log - step_norm)
+            emission_acc[:, data[t]] += hidden_state_prob
+
+    initial_acc += hidden_state_prob
+    return norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_sparse(
+    data: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    transition_values_log: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """``accumulate_statistics_log`` for a transition matrix in CSR layout.
+
+    ``transition_acc`` holds one expected count per stored transition, so every
+    step costs O(nnz) instead of O(N^2).
+
+    Returns:
+        The log-likelihood of the sequence
+    """
+    forward_log = calc_forward_log_sparse(
+        data, indptr, indices, transition_values_log, emission_log, initial_log
+    )
+    norm = logsumexp_1d(forward_log[-1])
+    emission_log_transpose = emission_log.T
+    backward_log = np.zeros(len(indptr) - 1, dtype=transition_values_log.dtype)
+
+    for t in range(len(data) - 1, -1, -1):
+        # hidden state probability at t
+        hidden_state_prob = np.exp(forward_log[t] + backward_log - norm)
+        emission_acc[:, data[t]] += hidden_state_prob
+        if t == 0:
+            initial_acc += hidden_state_prob
+            break
+
+        # emission(j, d) + backward(j) is shared between the transition
+        # probability at t - 1 and the backward message at t - 1
+        shared = emission_log_transpose[data[t]] + backward_log
+        for i in range(len(indptr) - 1):
+            for k in range(indptr[i], indptr[i + 1]):
+                transition_acc[k] += np.exp(
+                    forward_log[t - 1, i]
+                    + transition_values_log[k]
+                    + shared[indices[k]]
+                    - norm
+                )
+        backward_log = logexpdot_sparse_vector(
+            indptr, indices, transition_values_log, shared
+        )
+
+    return norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_scaled(
+    data: np.ndarray,
+    transition: np.ndarray,
+    emission: np.ndarray,
+    initial: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """Fused scaled (probability space) E-step adding the expected counts of one sequence.
+
+    Returns:
+        The log-likelihood of the sequence
+    """
+    forward, scales = calc_forward_scaled(data, transition, emission, initial)
+    accumulate_statistics_scaled_from_forward(
+        data,
+        forward,
+        scales,
+        transition,
+        emission,
+        initial_acc,
+        transition_acc,
+        emission_acc,
+    )
+    return likelihood_scaled(scales)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_scaled_from_forward(
+    data: np.ndarray,
+    forward: np.ndarray,
+    scales: np.ndarray,
+    transition: np.ndarray,
+    emission: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """Backward half of ``accumulate_statistics_scaled`` for precomputed forwards."""
+    n_states = transition.shape[0]
+    backward = np.ones(n_states)
+    weighted = np.empty(n_states)
+
+    for t in range(len(data) - 1, -1, -1):
+        # with Rabiner scaling forward * backward is already normalised
+        d = data[t]
+        for i in range(n_states):
+            emission_acc[i, d] += forward[t, i] * backward[i]
+        if t == 0:
+            for i in range(n_states):
+                initial_acc[i] += forward[0, i] * backward[i]
+            break
+
+        # emission(j, d) * backward(j) / c(t) is shared between the transition
+        # probability at t - 1 and the backward message at t - 1
+        for j in range(n_states):
+            weighted[j] = emission[j, d] * backward[j] / scales[t]
+        for i in range(n_states):
+            prob = 0.0
+            for j in range(n_states):
+                term = transition[i, j] * weighted[j]
+                transition_acc[i, j] += forward[t - 1, i] * term
+                prob += term
+            backward[i] = prob
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_runs_scaled(
+    symbols: np.ndarray,
+    lengths: np.ndarray,
+    transition: np.ndarray,
+    emission: np.ndarray,
+    initial: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """Scaled E-step over a run-length encoded sequence (see ``compress_runs``).
+
+    With A = table[d] for a run of r observations of symbol d, u the forward
+    message before the run and v the backward message at its end, the summed
+    transition probabilities of the run are A * S.T with
+    S = sum_s A^s (v u) A^(r - 1 - s), the top-right block of
+    [[A, v u], [0, A]]^r. Long runs therefore cost O(N^3 log r) instead of
+    O(r N^2). Every step contributes probability one, so S is normalised to r.
+
+    Returns:
+        The log-likelihood of the sequence
+    """
+    n_states = len(initial)
+    table = calc_symbol_table_scaled(transition, emission)
+    starts, norm = calc_forward_runs_scaled(symbols, lengths, table, emission, initial)
+    beta = np.ones(n_states) / n_states
+    block = np.zeros((2 * n_states, 2 * n_states))
+
+    for k in range(len(symbols) - 1, -1, -1):
+        d = symbols[k]
+        step = table[d]
+        length = lengths[k] - 1 if k == 0 else lengths[k]
+
+        if long_run(length, n_states):
+            block[:n_states, :n_states] = step
+            block[n_states:, n_states:] = step
+            block[:n_states, n_states:] = np.outer(beta, starts[k])
+            power, _ = matrix_power_scaled(block, length)
+
+            transition_prob = step * power[:n_states, n_states:].T
+            transition_prob *= length / transition_prob.sum()
+            transition_acc += transition_prob
+            emission_acc[:, d] += transition_prob.sum(axis=0)
+            beta = matrix_vector_normalised(power[:n_states, :n_states], beta)
+            continue
+
+        # short runs step through their observations from the run's forward message
+        alphas = np.empty((max(length, 1), n_states))
+        alphas[0] = starts[k]
+        for s in range(1, length):
+            alphas[s], _ = vector_matrix_normalised(alphas[s - 1], step)
+        for s in range(length - 1, -1, -1):
+            transition_prob = np.outer(alphas[s], beta) * step
+            transition_prob /= transition_prob.sum()
+            transition_acc += transition_prob
+            emission_acc[:, d] += transition_prob.sum(axis=0)
+            beta = matrix_vector_normalised(step, beta)
+
+    # the first observation
+    hidden_state_prob = starts[0] * beta
+    hidden_state_prob /= hidden_state_prob.sum()
+    initial_acc += hidden_state_prob
+    emission_acc[:, symbols[0]] += hidden_state_prob
+
+    return norm
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_scaled_segment(
+    data: np.ndarray,
+    start: int,
+    stop: int,
+    table: np.ndarray,
+    forward: np.ndarray,
+    backward: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """Add the expected counts of the time steps data[start:stop] of a sequence.
+
+    ``table`` is ``calc_symbol_table_scaled(transition, emission)``, ``forward`` the
+    normalised forward message at start - 1 and ``backward`` the backward message
+    at stop - 1, e.g. from ``calc_chunk_messages_scaled``. Every transition
+    probability is normalised on its own, so the chunks of a sequence can be
+    processed independently.
+    """
+    n_states = table.shape[1]
+    forwards = np.empty((stop - start, n_states))
+    if stop > start:
+        forwards[0] = forward
+    for t in range(start + 1, stop):
+        forwards[t - start], _ = vector_matrix_normalised(
+            forwards[t - start - 1], table[data[t - 1]]
+        )
+
+    for t in range(stop - 1, start - 1, -1):
+        step = table[data[t]]
+        transition_prob = np.outer(forwards[t - start], backward) * step
+        transition_prob /= transition_prob.sum()
+        transition_acc += transition_prob
+        emission_acc[:, data[t]] += transition_prob.sum(axis=0)
+        backward = matrix_vector_normalised(step, backward)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_packed(
+    data: np.ndarray,
+    offsets: np.ndarray,
+    transition_log: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """``accumulate_statistics_log`` over packed sequences.
+
+    Returns:
+        The log-likelihood of every sequence (0 for empty sequences)
+    """
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            norms[i] = accumulate_statistics_log(
+                data[offsets[i] : offsets[i + 1]],
+                transition_log,
+                emission_log,
+                initial_log,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+    return norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_table_packed(
+    data: np.ndarray,
+    offsets: np.ndarray,
+    table: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """``accumulate_statistics_log_table`` over packed sequences.
+
+    Returns:
+        The log-likelihood of every sequence (0 for empty sequences)
+    """
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            norms[i] = accumulate_statistics_log_table(
+                data[offsets[i] : offsets[i + 1]],
+                table,
+                emission_log,
+                initial_log,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+    return norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_scaled_packed(
+    data: np.ndarray,
+    offsets: np.ndarray,
+    transition: np.ndarray,
+    emission: np.ndarray,
+    initial: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """``accumulate_statistics_scaled`` over packed sequences.
+
+    Returns:
+        The log-likelihood of every sequence (0 for empty sequences)
+    """
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            norms[i] = accumulate_statistics_scaled(
+                data[offsets[i] : offsets[i + 1]],
+                transition,
+                emission,
+                initial,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+    return norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_packed_into(
+    data: np.ndarray,
+    offsets: np.ndarray,
+    transition_log: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+    forward_log: np.ndarray,
+):
+    """``accumulate_statistics_log_packed`` reusing a (max length, N) forward buffer.
+
+    Returns:
+        The log-likelihood of every sequence (0 for empty sequences)
+    """
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            sequence = data[offsets[i] : offsets[i + 1]]
+            norms[i] = calc_forward_log_normalised_into(
+                sequence, transition_log, emission_log, initial_log, forward_log
+            )
+            accumulate_statistics_log_from_forward(
+                sequence,
+                forward_log,
+                transition_log,
+                emission_log,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+    return norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_table_packed_into(
+    data: np.ndarray,
+    offsets: np.ndarray,
+    table: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+    forward_log: np.ndarray,
+):
+    """``accumulate_statistics_log_table_packed`` reusing a forward buffer.
+
+    Returns:
+        The log-likelihood of every sequence (0 for empty sequences)
+    """
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            sequence = data[offsets[i] : offsets[i + 1]]
+            norms[i] = calc_forward_log_table_normalised_into(
+                sequence, table, emission_log, initial_log, forward_log
+            )
+            accumulate_statistics_log_table_from_forward(
+                sequence, forward_log, table, initial_acc, transition_acc, emission_acc
+            )
+    return norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_scaled_packed_into(
+    data: np.ndarray,
+    offsets: np.ndarray,
+    transition: np.ndarray,
+    emission: np.ndarray,
+    initial: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+    forward: np.ndarray,
+    scales: np.ndarray,
+):
+    """``accumulate_statistics_scaled_packed`` reusing forward and scale buffers.
+
+    Returns:
+        The log-likelihood of every sequence (0 for empty sequences)
+    """
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            sequence = data[offsets[i] : offsets[i + 1]]
+            calc_forward_scaled_into(
+                sequence, transition, emission, initial, forward, scales
+            )
+            accumulate_statistics_scaled_from_forward(
+                sequence,
+                forward,
+                scales,
+                transition,
+                emission,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+            # likelihood_scaled without the temporary of the logs
+            for t in range(len(sequence)):
+                norms[i] += np.log(scales[t])
+    return norms
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def accumulate_statistics_log_sparse_packed(
+    data: np.ndarray,
+    offsets: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    transition_values_log: np.ndarray,
+    emission_log: np.ndarray,
+    initial_log: np.ndarray,
+    initial_acc: np.ndarray,
+    transition_acc: np.ndarray,
+    emission_acc: np.ndarray,
+):
+    """``accumulate_statistics_log_sparse`` over packed sequences.
+
+    Returns:
+        The log-likelihood of every sequence (0 for empty sequences)
+    """
+    norms = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            norms[i] = accumulate_statistics_log_sparse(
+                data[offsets[i] : offsets[i + 1]],
+                indptr,
+                indices,
+                transition_values_log,
+                emission_log,
+                initial_log,
+                initial_acc,
+                transition_acc,
+                emission_acc,
+            )
+    return norms
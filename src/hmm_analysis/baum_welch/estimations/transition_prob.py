@@ -64,7 +64,7 @@ def calc_transition_prob_log(
     rows, cols = shifted_forward_log.shape
 
     # calculate the emission times backward column vector
-    res = np.empty(shape=(rows, cols, cols))
+    res = np.empty(shape=(rows, cols, cols), dtype=shifted_forward_log.dtype)
     for i, d in enumerate(data[1:]):
         m = emission_log.T[d]
         b = shifted_backward_log[i]
@@ -75,7 +75,7 @@ def calc_transition_prob_log(
         if i < len(column_vec):
             res[i] = column_vec[i].reshape(cols, -1) + row_vec + transition_log - norm
         else:
-            res[i] = np.full((cols, cols), -np.inf)
+            res[i] = np.full((cols, cols), -np.inf, dtype=res.dtype)
 
     # return result
     return res
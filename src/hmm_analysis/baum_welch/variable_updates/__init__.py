@@ -1,8 +1,12 @@
 from .update_variables import update_variables_log, update_variables_log_multi_sequence
+from .update_variables import update_variables_log_from_statistics
+from .update_variables import update_variables_log_sparse_from_statistics
 from .update_variables import update_variables
 
 __all__ = [
+    "update_variables",
     "update_variables_log",
+    "update_variables_log_from_statistics",
     "update_variables_log_multi_sequence",
-    "update_variables",
+    "update_variables_log_sparse_from_statistics",
 ]
@@ -46,8 +46,14 @@ def calc_updated_emission_log_multi_sequence(
     emission_shape: tuple[int, int],
 ):
     numerators, denominators = (
-        np.empty((len(data_lst), emission_shape[0], emission_shape[1])),
-        np.empty((len(data_lst), state_prob_log_lst[0].shape[1], 1)),
+        np.empty(
+            (len(data_lst), emission_shape[0], emission_shape[1]),
+            dtype=state_prob_log_lst[0].dtype,
+        ),
+        np.empty(
+            (len(data_lst), state_prob_log_lst[0].shape[1], 1),
+            dtype=state_prob_log_lst[0].dtype,
+        ),
     )
 
     for i in range(len(data_lst)):
@@ -73,7 +79,9 @@ def _calc_updated_emission_log_numerator_denominator(
 ):
     denomenator = logsumexp_2d(state_prob_log.T)
 
-    numerator = np.empty(shape=(emission_shape[1], emission_shape[0]))
+    numerator = np.empty(
+        shape=(emission_shape[1], emission_shape[0]), dtype=state_prob_log.dtype
+    )
     for i in range(emission_shape[1]):
         # Create boolean mask for filtering
         mask = data == i
@@ -81,7 +89,7 @@ def _calc_updated_emission_log_numerator_denominator(
 
         if len(filtered_indices) == 0:
             # No observations for this emission symbol
-            numerator[i] = np.full(emission_shape[0], -np.inf)
+            numerator[i] = np.full(emission_shape[0], -np.inf, dtype=numerator.dtype)
         else:
             # Extract rows using indices to avoid empty array creation
             filtered_data = state_prob_log[filtered_indices]
@@ -98,3 +106,9 @@ def calc_updated_emission_logexp(
         result = calc_updated_emission_log(data, state_prob_log, emission_shape)
 
     return np.exp(result)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def calc_updated_emission_log_from_statistics(emission_acc: np.ndarray):
+    # the row sums of the expected emission counts are the expected state counts
+    return np.log(emission_acc) - np.log(emission_acc.sum(axis=1)).reshape(-1, 1)
@@ -16,7 +16,10 @@ def calc_updated_initial_log(state_prob_log: np.ndarray):
 
 @jit(nopython=True, fastmath=True, cache=True)
 def calc_updated_initial_log_multi_sequence(state_prob_log_lst: list[np.ndarray]):
-    result = np.empty((len(state_prob_log_lst), state_prob_log_lst[0].shape[1]))
+    result = np.empty(
+        (len(state_prob_log_lst), state_prob_log_lst[0].shape[1]),
+        dtype=state_prob_log_lst[0].dtype,
+    )
     for i in range(len(state_prob_log_lst)):
         result[i] = state_prob_log_lst[i][0]
     result = logsumexp_2d(result.T)
@@ -24,3 +27,9 @@ def calc_updated_initial_log_multi_sequence(state_prob_log_lst: list[np.ndarray]
     #     result += elem[0]
     return result - np.log(len(state_prob_log_lst))
     # return sum([elem[0] for elem in state_prob_log_lst]) / len(state_prob_log_lst)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def calc_updated_initial_log_from_statistics(initial_acc: np.ndarray):
+    # every sequence contributes a distribution, normalising averages them
+    return np.log(initial_acc) - np.log(np.sum(initial_acc))
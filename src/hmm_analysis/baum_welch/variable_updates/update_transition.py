@@ -40,9 +40,13 @@ def calc_updated_transition_log_multi_sequence(
                 len(transition_prob_log_lst),
                 transition_prob_log_lst[0].shape[1],
                 transition_prob_log_lst[0].shape[2],
-            )
+            ),
+            dtype=transition_prob_log_lst[0].dtype,
+        ),
+        np.empty(
+            (len(transition_prob_log_lst), state_prob_log_lst[0].shape[1], 1),
+            dtype=state_prob_log_lst[0].dtype,
         ),
-        np.empty((len(transition_prob_log_lst), state_prob_log_lst[0].shape[1], 1)),
     )
 
     # for transition_prob_log, state_prob_log in zip(transition_prob_log_lst, state_prob_log_lst):
@@ -83,3 +87,23 @@ def calc_updated_transition_logexp(transition_prob: np.ndarray, state_prob: np.n
         result = calc_updated_transition_log(transition_prob_log, state_prob_log)
 
     return np.exp(result)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def calc_updated_transition_log_from_statistics(transition_acc: np.ndarray):
+    # the row sums of the expected transition counts are the expected state counts
+    return np.log(transition_acc) - np.log(transition_acc.sum(axis=1)).reshape(-1, 1)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def calc_updated_transition_log_sparse_from_statistics(
+    indptr: np.ndarray, transition_acc: np.ndarray
+):
+    # normalising the stored counts of every row keeps the sparsity structure
+    transition_values_log = np.empty(len(transition_acc))
+    for i in range(len(indptr) - 1):
+        row = transition_acc[indptr[i] : indptr[i + 1]]
+        transition_values_log[indptr[i] : indptr[i + 1]] = np.log(row) - np.log(
+            row.sum()
+        )
+    return transition_values_log
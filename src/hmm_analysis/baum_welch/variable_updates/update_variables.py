@@ -2,16 +2,20 @@ from .update_initial import (
     calc_updated_initial_log,
     calc_updated_initial,
     calc_updated_initial_log_multi_sequence,
+    calc_updated_initial_log_from_statistics,
 )
 from .update_transition import (
     calc_updated_transition_log,
     calc_updated_transition,
     calc_updated_transition_log_multi_sequence,
+    calc_updated_transition_log_from_statistics,
+    calc_updated_transition_log_sparse_from_statistics,
 )
 from .update_emission import (
     calc_updated_emission_log,
     calc_updated_emission,
     calc_updated_emission_log_multi_sequence,
+    calc_updated_emission_log_from_statistics,
 )
 from numba import jit
 
@@ -46,6 +50,28 @@ def update_variables_log_multi_sequence(
     return initial_log, transition_log, emission_log
 
 
+@jit(nopython=True, fastmath=True, cache=True)
+def update_variables_log_from_statistics(initial_acc, transition_acc, emission_acc):
+    # updated variables - transition, emission, and initial from expected counts
+    initial_log = calc_updated_initial_log_from_statistics(initial_acc)
+    transition_log = calc_updated_transition_log_from_statistics(transition_acc)
+    emission_log = calc_updated_emission_log_from_statistics(emission_acc)
+    return initial_log, transition_log, emission_log
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def update_variables_log_sparse_from_statistics(
+    indptr, initial_acc, transition_acc, emission_acc
+):
+    # transition_acc holds the counts of the stored transitions of a CSR matrix
+    initial_log = calc_updated_initial_log_from_statistics(initial_acc)
+    transition_values_log = calc_updated_transition_log_sparse_from_statistics(
+        indptr, transition_acc
+    )
+    emission_log = calc_updated_emission_log_from_statistics(emission_acc)
+    return initial_log, transition_values_log, emission_log
+
+
 def update_variables(data, hidden_state_prob, transition_prob, emission):
     # updated variables - transition, emission, and initial
     initial = calc_updated_initial(hidden_state_prob)
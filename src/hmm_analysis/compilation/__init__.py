@@ -0,0 +1,10 @@
+from .signatures import kernel_signatures, parameter_types
+from .warmup import precompile, set_cache_dir, warmup
+
+__all__ = [
+    "kernel_signatures",
+    "parameter_types",
+    "precompile",
+    "set_cache_dir",
+    "warmup",
+]
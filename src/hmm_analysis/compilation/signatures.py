@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import numpy as np
+from numba import from_dtype, types
+
+# observations and packed offsets as the public functions hand them to the kernels
+OBSERVATIONS_TYPE = types.Array(types.int64, 1, "C")
+OFFSETS_TYPE = types.Array(types.int64, 1, "C")
+
+BACKPOINTER_DTYPES = (np.uint8, np.uint16, np.uint32)
+
+
+def array_type(dtype, ndim: int) -> types.Array:
+    """Numba type of a C-contiguous array of ``dtype``."""
+    return types.Array(from_dtype(np.dtype(dtype)), ndim, "C")
+
+
+def parameter_types(dtype=np.float64) -> tuple[types.Array, types.Array, types.Array]:
+    """Numba types of the (transition, emission, initial) kernel arguments."""
+    return array_type(dtype, 2), array_type(dtype, 2), array_type(dtype, 1)
+
+
+def bank_types(dtype=np.float64) -> tuple[types.Array, types.Array, types.Array]:
+    """Numba types of the stacked (transitions, emissions, initials) of a bank."""
+    return array_type(dtype, 3), array_type(dtype, 3), array_type(dtype, 2)
+
+
+def kernel_signatures(dtype=np.float64, parallel: bool = False) -> list[tuple]:
+    """Explicit typed signatures of the kernels the public functions call.
+
+    The kernels are not declared with these signatures, a signature in the
+    decorator compiles at import and disables compilation for any other type.
+    ``precompile`` compiles them on request instead.
+
+    Args:
+        dtype: Floating point type of the parameters, see ``baum_welch``
+        parallel: Include the multi-threaded kernels, their compilation is slow
+
+    Returns:
+        A list of (dispatcher, argument types) pairs
+    """
+    # the kernels are imported here so that the signatures do not import numba code
+    from hmm_analysis.baum_welch.core.parallel import (
+        step_multi_sequences_parallel,
+        step_multi_sequences_scaled_parallel,
+        step_parallel_in_time,
+    )
+    from hmm_analysis.baum_welch.core.step import (
+        step,
+        step_into,
+        step_multi_sequences,
+        step_multi_sequences_into,
+        step_multi_sequences_scaled,
+        step_multi_sequences_scaled_into,
+        step_scaled,
+        step_scaled_into,
+    )
+    from hmm_analysis.reconstruction.batch import (
+        calc_viterbi_log_parallel,
+        reconstruct_log_parallel,
+        reconstruct_scaled_parallel,
+    )
+    from hmm_analysis.reconstruction.reconstruct import (
+        reconstruct_log,
+        reconstruct_log_packed,
+        reconstruct_scaled,
+        reconstruct_scaled_packed,
+    )
+    from hmm_analysis.reconstruction.viterbi import (
+        calc_viterbi_log,
+        calc_viterbi_log_packed,
+    )
+    from hmm_analysis.forward_backward.rolling import (
+        calc_likelihood_log_rolling,
+        calc_likelihood_scaled_rolling,
+    )
+    from hmm_analysis.scoring.bank import (
+        score_models_log_parallel,
+        score_models_scaled_parallel,
+    )
+    from hmm_analysis.scoring.score import score_log_parallel, score_scaled_parallel
+    from hmm_analysis.sequences.scheduling import schedule_longest_first
+
+    single = (OBSERVATIONS_TYPE, *parameter_types(dtype))
+    packed = (OBSERVATIONS_TYPE, OFFSETS_TYPE, *parameter_types(dtype))
+    schedule = (OFFSETS_TYPE, OFFSETS_TYPE)
+    # symbol table of the log kernels, see prepare_symbol_table_log
+    table = array_type(dtype, 3)
+    # Workspace buffers, see Workspace.step_args
+    statistics = (array_type(np.float64, 1), *(array_type(np.float64, 2),) * 2)
+    workspace_log = (array_type(dtype, 2), array_type(dtype, 3), *statistics)
+    workspace_scaled = (
+        array_type(dtype, 2),
+        array_type(np.float64, 1),
+        *parameter_types(dtype),
+        *statistics,
+    )
+
+    signatures = [
+        (step, single),
+        (step_scaled, single),
+        (step_multi_sequences, packed),
+        (step_multi_sequences_scaled, packed),
+        (step_into, (*single, *workspace_log)),
+        (step_scaled_into, (*single, *workspace_scaled)),
+        (step_multi_sequences_into, (*packed, *workspace_log)),
+        (step_multi_sequences_scaled_into, (*packed, *workspace_scaled)),
+        (reconstruct_log, (*single, table)),
+        (reconstruct_scaled, single),
+        (reconstruct_log_packed, (*packed, table)),
+        (reconstruct_scaled_packed, packed),
+        (calc_likelihood_log_rolling, (*single, table)),
+        (calc_likelihood_scaled_rolling, single),
+    ]
+    if parallel:
+        signatures += [
+            (step_parallel_in_time, (*single, OFFSETS_TYPE)),
+            (step_multi_sequences_parallel, (*packed, *schedule)),
+            (step_multi_sequences_scaled_parallel, (*packed, *schedule)),
+            (score_log_parallel, (*packed, table, *schedule)),
+            (score_scaled_parallel, (*packed, *schedule)),
+            (
+                score_models_log_parallel,
+                (*packed, *bank_types(dtype), array_type(dtype, 4), *schedule),
+            ),
+            (score_models_scaled_parallel, (*packed, *bank_types(dtype), *schedule)),
+        ]
+
+    # Viterbi decoding and the batch reconstruction always run in float64
+    if np.dtype(dtype) == np.float64:
+        for backpointer_dtype in BACKPOINTER_DTYPES:
+            signatures += [
+                (calc_viterbi_log, (*single, array_type(backpointer_dtype, 2))),
+                (calc_viterbi_log_packed, (*packed, array_type(backpointer_dtype, 2))),
+            ]
+        if parallel:
+            signatures += [
+                (schedule_longest_first, (OFFSETS_TYPE, types.int64)),
+                (reconstruct_log_parallel, (*packed, table, *schedule)),
+                (reconstruct_scaled_parallel, (*packed, *schedule)),
+            ]
+            signatures += [
+                (
+                    calc_viterbi_log_parallel,
+                    (*packed, *schedule, array_type(backpointer_dtype, 3)),
+                )
+                for backpointer_dtype in BACKPOINTER_DTYPES
+            ]
+
+    return signatures
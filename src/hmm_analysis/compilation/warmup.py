@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import numba
+import numpy as np
+from hmm_analysis.utils.casting import resolve_dtype
+from .signatures import kernel_signatures
+
+# modules defining cached kernels, numba picks their cache directory on import
+KERNEL_MODULES = (
+    "hmm_analysis.baum_welch",
+    "hmm_analysis.forward_backward",
+    "hmm_analysis.reconstruction",
+    "hmm_analysis.scoring",
+    "hmm_analysis.sequences",
+    "hmm_analysis.utils.expsum_ops",
+)
+
+
+def set_cache_dir(cache_dir: str | os.PathLike):
+    """Write and read the compiled kernels in ``cache_dir``.
+
+    By default numba caches next to the sources in ``__pycache__``, which is lost
+    on read-only installs. This has the effect of the NUMBA_CACHE_DIR environment
+    variable, and also sets it for child processes. It has to run before the
+    kernels are imported, i.e. before the first access to a function of
+    ``hmm_analysis``.
+
+    Raises:
+        RuntimeError: If the kernels are already imported
+    """
+    loaded = [name for name in KERNEL_MODULES if name in sys.modules]
+    if loaded:
+        raise RuntimeError(
+            f"set_cache_dir must run before the kernels are imported, {loaded[0]} "
+            "is already loaded. Set NUMBA_CACHE_DIR instead"
+        )
+    cache_dir = os.fspath(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ["NUMBA_CACHE_DIR"] = cache_dir
+    numba.config.CACHE_DIR = cache_dir
+
+
+def precompile(dtypes=(np.float64,), parallel: bool = False) -> int:
+    """Compile the kernels for their signatures in ``kernel_signatures``.
+
+    Kernels found in the cache are loaded instead of compiled.
+
+    Returns:
+        The number of compiled signatures
+    """
+    n_compiled = 0
+    for dtype in dtypes:
+        for dispatcher, signature in kernel_signatures(resolve_dtype(dtype), parallel):
+            dispatcher.compile(signature)
+            n_compiled += 1
+    return n_compiled
+
+
+def warmup(
+    cache_dir: str | os.PathLike | None = None,
+    dtypes=(np.float64,),
+    parallel: bool = False,
+) -> int:
+    """Compile the kernels ahead of the first call, e.g. when building an image.
+
+    Every process compiles the numba kernels on their first call, which adds
+    seconds before the first result. With ``cache_dir`` the compiled code is
+    written there, and later processes pointing NUMBA_CACHE_DIR (or
+    ``set_cache_dir``) at the same directory load it without compiling. The
+    directory only has to be writable while warming up.
+
+    Args:
+        cache_dir: Directory of the compiled kernels, None keeps numba's default
+        dtypes: Floating point types to compile for, see ``baum_welch``
+        parallel: Also compile the multi-threaded kernels (default False)
+
+    Returns:
+        The number of compiled signatures
+
+    Example:
+        # at image build time
+        python -c "import hmm_analysis; hmm_analysis.warmup('/opt/hmm_cache')"
+        # at run time
+        NUMBA_CACHE_DIR=/opt/hmm_cache python worker.py
+    """
+    if cache_dir is not None:
+        set_cache_dir(cache_dir)
+    return precompile(dtypes, parallel)
@@ -1,18 +1,112 @@
-from .likelihood import likelihood_log, likelihood
-from .backward import calc_backward, calc_backward_log
-from .forward import calc_forward, calc_forward_log
+from .likelihood import likelihood_log, likelihood, likelihood_scaled
+from .backward import calc_backward, calc_backward_log, calc_backward_scaled
+from .forward import (
+    calc_forward,
+    calc_forward_log,
+    calc_forward_scaled,
+    calc_forward_scaled_into,
+)
+from .sparse import calc_forward_log_sparse, calc_backward_log_sparse
+from .symbol_table import (
+    SYMBOL_TABLE_MAX_BYTES,
+    backward_step_table_log,
+    calc_symbol_table_log,
+    calc_symbol_table_log_into,
+    forward_step_table_log,
+    prepare_symbol_table_log,
+    use_symbol_table,
+)
+from .normalised import (
+    calc_backward_log_normalised,
+    calc_backward_log_table_normalised,
+    calc_forward_log_normalised,
+    calc_forward_log_normalised_into,
+    calc_forward_log_table_normalised,
+    calc_forward_log_table_normalised_into,
+    normalise_log,
+)
+from .run_length import (
+    RUN_CONVERGENCE_TOL,
+    calc_backward_runs_scaled,
+    calc_forward_runs_scaled,
+    calc_symbol_table_scaled,
+    compress_runs,
+    long_run,
+    matrix_power_scaled,
+    matrix_vector_normalised,
+    vector_matrix_normalised,
+)
+from .chunked import (
+    calc_chunk_messages_scaled,
+    calc_posterior_segment_scaled,
+    calc_transfer_scaled,
+)
+from .rolling import (
+    calc_bank_likelihood_log_rolling,
+    calc_bank_likelihood_scaled_rolling,
+    calc_likelihood_log_rolling,
+    calc_likelihood_scaled_rolling,
+    forward_step_table_log_normalised,
+)
+from .checkpoint import (
+    calc_forward_checkpoints_log,
+    calc_forward_segment_log,
+    resolve_checkpoint_interval,
+)
 from .forward_backward_likelihood import (
     get_forward_backward_likelihood_log,
+    get_forward_backward_likelihood_scaled,
     get_forward_backward_likelihood,
 )
 
 __all__ = [
-    "likelihood_log",
-    "likelihood",
+    "RUN_CONVERGENCE_TOL",
+    "SYMBOL_TABLE_MAX_BYTES",
+    "backward_step_table_log",
     "calc_backward",
     "calc_backward_log",
+    "calc_backward_log_normalised",
+    "calc_backward_log_sparse",
+    "calc_backward_log_table_normalised",
+    "calc_backward_runs_scaled",
+    "calc_backward_scaled",
+    "calc_bank_likelihood_log_rolling",
+    "calc_bank_likelihood_scaled_rolling",
+    "calc_chunk_messages_scaled",
     "calc_forward",
+    "calc_forward_checkpoints_log",
     "calc_forward_log",
-    "get_forward_backward_likelihood_log",
+    "calc_forward_log_normalised",
+    "calc_forward_log_normalised_into",
+    "calc_forward_log_sparse",
+    "calc_forward_log_table_normalised",
+    "calc_forward_log_table_normalised_into",
+    "calc_forward_runs_scaled",
+    "calc_forward_scaled",
+    "calc_forward_scaled_into",
+    "calc_forward_segment_log",
+    "calc_likelihood_log_rolling",
+    "calc_likelihood_scaled_rolling",
+    "calc_posterior_segment_scaled",
+    "calc_symbol_table_log",
+    "calc_symbol_table_log_into",
+    "calc_symbol_table_scaled",
+    "calc_transfer_scaled",
+    "compress_runs",
+    "forward_step_table_log",
+    "forward_step_table_log_normalised",
     "get_forward_backward_likelihood",
+    "get_forward_backward_likelihood_log",
+    "get_forward_backward_likelihood_scaled",
+    "likelihood",
+    "likelihood_log",
+    "likelihood_scaled",
+    "long_run",
+    "matrix_power_scaled",
+    "matrix_vector_normalised",
+    "normalise_log",
+    "prepare_symbol_table_log",
+    "resolve_checkpoint_interval",
+    "use_symbol_table",
+    "vector_matrix_normalised",
 ]
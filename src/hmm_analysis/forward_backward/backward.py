@@ -25,8 +25,8 @@ def calc_backward_log(
 ) -> NDArray:
     # iterating over data and constructing f_i(k)
     emission_log_transpose = emission_log.T
-    log_prob = np.zeros(transition_log.shape[0])
-    res = np.empty(shape=(len(data), len(log_prob)))
+    log_prob = np.zeros(transition_log.shape[0], dtype=transition_log.dtype)
+    res = np.empty(shape=(len(data), len(log_prob)), dtype=log_prob.dtype)
     res[0] = log_prob
 
     for i, d in enumerate(data[1:][::-1]):
@@ -49,3 +49,23 @@ def calc_backward_logexp(
         res = calc_backward_log(data, transition_log, emission_log)
 
     return np.exp(res)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def calc_backward_scaled(
+    data: NDArray, transition: NDArray, emission: NDArray, scales: NDArray
+) -> NDArray:
+    # iterating over data and constructing b_i(k) scaled with the forward constants
+    n_states = transition.shape[0]
+    res = np.empty(shape=(len(data), n_states), dtype=transition.dtype)
+    res[len(data) - 1] = 1.0
+
+    for t in range(len(data) - 2, -1, -1):
+        d = data[t + 1]
+        for i in range(n_states):
+            prob = 0.0
+            for j in range(n_states):
+                prob += transition[i, j] * emission[j, d] * res[t + 1, j]
+            res[t, i] = prob / scales[t + 1]
+
+    return res
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import math
+import numpy as np
+from numpy.typing import NDArray
+from hmm_analysis.utils.expsum_ops import logexpdot_vector_matrix
+from .normalised import normalise_log
+from numba import jit
+
+
+def resolve_checkpoint_interval(length: int, interval: int | str | None) -> int:
+    """Number of time steps between stored forward messages.
+
+    ``None`` keeps every message (one segment spanning the whole sequence) and
+    ``"sqrt"`` picks ceil(sqrt(T)), which minimises the memory to about 2 sqrt(T)
+    messages at the cost of a second forward pass.
+    """
+    if interval is None:
+        return max(length, 1)
+    if isinstance(interval, str):
+        if interval != "sqrt":
+            raise ValueError(
+                f"Unknown checkpoint interval {interval!r}, expected an int or 'sqrt'"
+            )
+        return max(math.ceil(math.sqrt(length)), 1)
+    if interval < 1:
+        raise ValueError("checkpoint interval must be a positive integer")
+    return int(interval)
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_checkpoints_log(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    interval: int,
+):
+    """Rolling log-space forward pass keeping every ``interval``-th message.
+
+    The messages are normalised to a logsumexp of 0 as they go.
+
+    Returns:
+        The forward messages at t = 0, interval, 2 * interval, ... and the
+        log-likelihood of the sequence
+    """
+    emission_log_transpose = emission_log.T
+    n_segments = (len(data) + interval - 1) // interval
+    checkpoints = np.empty(
+        shape=(n_segments, transition_log.shape[0]), dtype=transition_log.dtype
+    )
+
+    log_prob = emission_log_transpose[data[0]] + initial_log
+    norm = float(normalise_log(log_prob))
+    checkpoints[0] = log_prob
+    for t in range(1, len(data)):
+        log_prob = emission_log_transpose[data[t]] + logexpdot_vector_matrix(
+            log_prob, transition_log
+        )
+        norm += normalise_log(log_prob)
+        if t % interval == 0:
+            checkpoints[t // interval] = log_prob
+
+    return checkpoints, norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_segment_log(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    checkpoint: NDArray,
+    start: int,
+    stop: int,
+    out: NDArray,
+):
+    """Recompute the forward messages of data[start:stop] into ``out`` from the
+    checkpoint at ``start``."""
+    emission_log_transpose = emission_log.T
+    out[0] = checkpoint
+    for t in range(start + 1, stop):
+        out[t - start] = emission_log_transpose[data[t]] + logexpdot_vector_matrix(
+            out[t - start - 1], transition_log
+        )
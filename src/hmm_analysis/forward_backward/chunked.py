@@ -0,0 +1,93 @@
+import numpy as np
+from numpy.typing import NDArray
+from .run_length import matrix_vector_normalised, vector_matrix_normalised
+from numba import jit
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_transfer_scaled(data: NDArray, start: int, stop: int, table: NDArray):
+    """Transfer matrix of data[start:stop], the product of table[data[t]].
+
+    The forward message after the chunk is the message before it times the
+    transfer matrix, the backward message before it is the transfer matrix times
+    the message after it.
+
+    Returns:
+        The transfer matrix renormalised to a largest entry of 1 and its log scale
+    """
+    n_states = table.shape[1]
+    res = np.eye(n_states)
+    new_res = np.empty((n_states, n_states))
+    log_scale = 0.0
+    for t in range(start, stop):
+        step = table[data[t]]
+        scale = 0.0
+        for i in range(n_states):
+            for j in range(n_states):
+                value = 0.0
+                for k in range(n_states):
+                    value += res[i, k] * step[k, j]
+                new_res[i, j] = value
+                scale = max(scale, value)
+        for i in range(n_states):
+            for j in range(n_states):
+                res[i, j] = new_res[i, j] / scale
+        log_scale += np.log(scale)
+    return res, log_scale
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_chunk_messages_scaled(
+    transfers: NDArray, log_scales: NDArray, first_forward: NDArray, norm: float
+):
+    """Combine chunk transfer matrices into the messages at the chunk boundaries.
+
+    ``first_forward`` is the normalised forward message of the first observation,
+    which precedes the first chunk, with log-normaliser ``norm``.
+
+    Returns:
+        The normalised forward message before and backward message at the end of
+        every chunk, the backward message of the first observation and the
+        log-likelihood
+    """
+    n_chunks, n_states = transfers.shape[0], transfers.shape[1]
+    forwards = np.empty((n_chunks, n_states))
+    backwards = np.empty((n_chunks, n_states))
+
+    alpha = first_forward
+    for c in range(n_chunks):
+        forwards[c] = alpha
+        alpha, scale = vector_matrix_normalised(alpha, transfers[c])
+        norm += log_scales[c] + np.log(scale)
+
+    beta = np.ones(n_states) / n_states
+    for c in range(n_chunks - 1, -1, -1):
+        backwards[c] = beta
+        beta = matrix_vector_normalised(transfers[c], beta)
+
+    return forwards, backwards, beta, norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_posterior_segment_scaled(
+    data: NDArray,
+    start: int,
+    stop: int,
+    table: NDArray,
+    forward: NDArray,
+    backward: NDArray,
+    out: NDArray,
+):
+    """Hidden state probabilities of data[start:stop] into ``out``.
+
+    ``forward`` is the normalised forward message at start - 1 and ``backward``
+    the backward message at stop - 1, both from ``calc_chunk_messages_scaled``.
+    """
+    for t in range(start, stop):
+        forward, _ = vector_matrix_normalised(forward, table[data[t]])
+        out[t - start] = forward
+
+    for t in range(stop - 1, start - 1, -1):
+        out[t - start] *= backward
+        out[t - start] /= out[t - start].sum()
+        backward = matrix_vector_normalised(table[data[t]], backward)
@@ -28,7 +28,7 @@ def calc_forward_log(
     # iterating over data and constructing f_i(k)
     emission_log_transpose = emission_log.T
     log_prob = emission_log_transpose[data[0]] + initial_log
-    res = np.empty(shape=(len(data), len(log_prob)))
+    res = np.empty(shape=(len(data), len(log_prob)), dtype=log_prob.dtype)
     res[0] = log_prob
 
     for i, d in enumerate(data[1:]):
@@ -53,3 +53,49 @@ def calc_forward_logexp(
         res = calc_forward_log(data, transition_log, emission_log, initial_log)
 
     return np.exp(res)
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_scaled(
+    data: NDArray, transition: NDArray, emission: NDArray, initial: NDArray
+) -> tuple[NDArray, NDArray]:
+    res = np.empty(shape=(len(data), transition.shape[0]), dtype=transition.dtype)
+    scales = np.empty(len(data))
+    calc_forward_scaled_into(data, transition, emission, initial, res, scales)
+    return res, scales
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_scaled_into(
+    data: NDArray,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    out: NDArray,
+    scales: NDArray,
+):
+    """``calc_forward_scaled`` writing into out[:len(data)] and scales[:len(data)]."""
+    # iterating over data and constructing f_i(k) normalised to sum to one,
+    # the normalisation constants c_i are kept aside (Rabiner scaling)
+    n_states = transition.shape[0]
+
+    scale = 0.0
+    for j in range(n_states):
+        out[0, j] = emission[j, data[0]] * initial[j]
+        scale += out[0, j]
+    scales[0] = scale
+    for j in range(n_states):
+        out[0, j] /= scale
+
+    for t in range(1, len(data)):
+        d = data[t]
+        scale = 0.0
+        for j in range(n_states):
+            prob = 0.0
+            for i in range(n_states):
+                prob += out[t - 1, i] * transition[i, j]
+            out[t, j] = emission[j, d] * prob
+            scale += out[t, j]
+        scales[t] = scale
+        for j in range(n_states):
+            out[t, j] /= scale
@@ -1,7 +1,7 @@
 import numpy as np
-from .likelihood import likelihood_log, likelihood
-from .backward import calc_backward_log, calc_backward
-from .forward import calc_forward_log, calc_forward
+from .likelihood import likelihood_log, likelihood, likelihood_scaled
+from .backward import calc_backward_log, calc_backward, calc_backward_scaled
+from .forward import calc_forward_log, calc_forward, calc_forward_scaled
 from numba import jit
 
 
@@ -18,6 +18,17 @@ def get_forward_backward_likelihood_log(
     return forwards_log, backwards_log, norm
 
 
+@jit(nopython=True, fastmath=True, cache=True)
+def get_forward_backward_likelihood_scaled(data, initial, transition, emission):
+    forwards, scales = calc_forward_scaled(data, transition, emission, initial)
+    backwards = calc_backward_scaled(data, transition, emission, scales)
+
+    # the log likelihood is the sum of the log scales
+    norm = likelihood_scaled(scales)
+
+    return forwards, backwards, scales, norm
+
+
 def get_forward_backward_likelihood(data, initial, transition, emission):
     forwards = calc_forward(data, transition, emission, initial)
     backwards = calc_backward(data, transition, emission)
@@ -10,3 +10,8 @@ def likelihood(forward_lst, backward_lst):
 @jit(cache=True, nopython=True, fastmath=True)
 def likelihood_log(forward_lst_log, backward_lst_log):
     return logsumexp_1d(forward_lst_log[0] + backward_lst_log[0])
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def likelihood_scaled(scales):
+    return np.sum(np.log(scales))
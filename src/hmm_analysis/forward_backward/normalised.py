@@ -0,0 +1,130 @@
+import numpy as np
+from numpy.typing import NDArray
+from hmm_analysis.utils.expsum_ops import (
+    logexpdot_matrix_vector,
+    logexpdot_vector_matrix,
+    logsumexp_1d,
+)
+from .symbol_table import backward_step_table_log, forward_step_table_log
+from numba import jit
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def normalise_log(log_prob: NDArray) -> float:
+    """Shift a log-space message in place to a logsumexp of 0.
+
+    Returns:
+        The shift, to be accumulated in float64 by the caller
+    """
+    shift = logsumexp_1d(log_prob)
+    log_prob -= shift
+    return shift
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_log_normalised(
+    data: NDArray, transition_log: NDArray, emission_log: NDArray, initial_log: NDArray
+):
+    """``calc_forward_log`` with every message normalised to a logsumexp of 0.
+
+    The messages stay of order log(N) instead of growing with t, so they keep
+    their resolution in float32 on long sequences.
+
+    Returns:
+        The normalised forward messages and the log-likelihood (float64)
+    """
+    res = np.empty(shape=(len(data), transition_log.shape[0]), dtype=emission_log.dtype)
+    norm = calc_forward_log_normalised_into(
+        data, transition_log, emission_log, initial_log, res
+    )
+    return res, norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_log_normalised_into(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    out: NDArray,
+) -> float:
+    """``calc_forward_log_normalised`` writing the messages into out[:len(data)].
+
+    Returns:
+        The log-likelihood (float64)
+    """
+    emission_log_transpose = emission_log.T
+    out[0] = emission_log_transpose[data[0]] + initial_log
+    norm = float(normalise_log(out[0]))
+
+    for t in range(1, len(data)):
+        out[t] = emission_log_transpose[data[t]] + logexpdot_vector_matrix(
+            out[t - 1], transition_log
+        )
+        norm += normalise_log(out[t])
+
+    return norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_backward_log_normalised(
+    data: NDArray, transition_log: NDArray, emission_log: NDArray
+) -> NDArray:
+    """``calc_backward_log`` with every message normalised to a logsumexp of 0."""
+    emission_log_transpose = emission_log.T
+    n_states = transition_log.shape[0]
+    res = np.empty(shape=(len(data), n_states), dtype=transition_log.dtype)
+    res[len(data) - 1] = -np.log(n_states)
+
+    for t in range(len(data) - 2, -1, -1):
+        res[t] = logexpdot_matrix_vector(
+            emission_log_transpose[data[t + 1]] + transition_log, res[t + 1]
+        )
+        normalise_log(res[t])
+
+    return res
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_log_table_normalised(
+    data: NDArray, table: NDArray, emission_log: NDArray, initial_log: NDArray
+):
+    """``calc_forward_log_normalised`` indexing the symbol table."""
+    res = np.empty(shape=(len(data), len(initial_log)), dtype=table.dtype)
+    norm = calc_forward_log_table_normalised_into(
+        data, table, emission_log, initial_log, res
+    )
+    return res, norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_log_table_normalised_into(
+    data: NDArray,
+    table: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    out: NDArray,
+) -> float:
+    """``calc_forward_log_table_normalised`` writing the messages into out[:len(data)]."""
+    out[0] = emission_log[:, data[0]] + initial_log
+    norm = float(normalise_log(out[0]))
+
+    for t in range(1, len(data)):
+        forward_step_table_log(out[t - 1], table[data[t]], out[t])
+        norm += normalise_log(out[t])
+
+    return norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_backward_log_table_normalised(data: NDArray, table: NDArray) -> NDArray:
+    """``calc_backward_log_normalised`` indexing the symbol table."""
+    n_states = table.shape[1]
+    res = np.empty(shape=(len(data), n_states), dtype=table.dtype)
+    res[len(data) - 1] = -np.log(n_states)
+
+    for t in range(len(data) - 2, -1, -1):
+        backward_step_table_log(table[data[t + 1]], res[t + 1], res[t])
+        normalise_log(res[t])
+
+    return res
@@ -0,0 +1,224 @@
+import numpy as np
+from numpy.typing import NDArray
+from hmm_analysis.utils.expsum_ops import MINUS_INF, logexpdot_vector_matrix
+from .normalised import normalise_log
+from numba import jit
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def forward_step_table_log_normalised(
+    log_prob: NDArray, table_d: NDArray, out: NDArray
+) -> float:
+    """``forward_step_table_log`` then ``normalise_log`` of out, without temporaries.
+
+    Returns:
+        The normalisation shift
+    """
+    n_states = len(log_prob)
+    for j in range(n_states):
+        max_scalar = MINUS_INF
+        for i in range(n_states):
+            max_scalar = max(max_scalar, log_prob[i] + table_d[i, j])
+        total = 0.0
+        for i in range(n_states):
+            total += np.exp(log_prob[i] + table_d[i, j] - max_scalar)
+        out[j] = -np.inf if total == 0 else max_scalar + np.log(total)
+
+    max_scalar = MINUS_INF
+    for j in range(n_states):
+        max_scalar = max(max_scalar, out[j])
+    if max_scalar < MINUS_INF:
+        shift = -np.inf
+    else:
+        total = 0.0
+        for j in range(n_states):
+            total += np.exp(out[j] - max_scalar)
+        shift = max_scalar + np.log(total)
+    for j in range(n_states):
+        out[j] -= shift
+    return shift
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_likelihood_log_rolling(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    table: NDArray,
+) -> float:
+    """Log-likelihood of a sequence from the forward recursion alone.
+
+    Only the current normalised forward message is kept, O(N) memory instead of
+    the (T, N) forward and backward messages. ``table`` is the symbol table of
+    ``calc_symbol_table_log``, built once by the caller, or an empty (0, N, N)
+    array to step with the transition matrix.
+
+    Returns:
+        The log-likelihood (float64), 0 for an empty sequence
+    """
+    if len(data) == 0:
+        return 0.0
+    n_states = len(initial_log)
+    log_prob = emission_log[:, data[0]] + initial_log
+    norm = float(normalise_log(log_prob))
+
+    if len(table) > 0:
+        new_log_prob = np.empty(n_states, dtype=table.dtype)
+        for t in range(1, len(data)):
+            norm += forward_step_table_log_normalised(
+                log_prob, table[data[t]], new_log_prob
+            )
+            log_prob, new_log_prob = new_log_prob, log_prob
+    else:
+        emission_log_transpose = emission_log.T
+        for t in range(1, len(data)):
+            log_prob = emission_log_transpose[data[t]] + logexpdot_vector_matrix(
+                log_prob, transition_log
+            )
+            norm += normalise_log(log_prob)
+
+    return norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_likelihood_scaled_rolling(
+    data: NDArray, transition: NDArray, emission: NDArray, initial: NDArray
+) -> float:
+    """``calc_likelihood_log_rolling`` with the scaled (probability space) recursion.
+
+    Returns:
+        The log-likelihood (float64), the sum of the log scaling constants, -inf
+        once an observation has probability 0
+    """
+    if len(data) == 0:
+        return 0.0
+    n_states = transition.shape[0]
+    prob = np.empty(n_states, dtype=transition.dtype)
+    new_prob = np.empty(n_states, dtype=transition.dtype)
+
+    scale = 0.0
+    for j in range(n_states):
+        prob[j] = emission[j, data[0]] * initial[j]
+        scale += prob[j]
+    if scale == 0:
+        return -np.inf
+    for j in range(n_states):
+        prob[j] /= scale
+    norm = np.log(scale)
+
+    for t in range(1, len(data)):
+        d = data[t]
+        scale = 0.0
+        for j in range(n_states):
+            total = 0.0
+            for i in range(n_states):
+                total += prob[i] * transition[i, j]
+            new_prob[j] = emission[j, d] * total
+            scale += new_prob[j]
+        if scale == 0:
+            return -np.inf
+        for j in range(n_states):
+            new_prob[j] /= scale
+        norm += np.log(scale)
+        prob, new_prob = new_prob, prob
+
+    return norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_bank_likelihood_log_rolling(
+    data: NDArray,
+    transitions_log: NDArray,
+    emissions_log: NDArray,
+    initials_log: NDArray,
+    tables: NDArray,
+) -> NDArray:
+    """``calc_likelihood_log_rolling`` of one sequence under K stacked models.
+
+    The models advance together, every observation is read once and moves the
+    (K, N) forward messages of all of them. ``tables`` holds the symbol tables
+    symbol first, tables[d, k] = calc_symbol_table_log(...)[d] of model k, so
+    that a step reads one contiguous (K, N, N) block. An empty (0, K, N, N)
+    array steps with the transition matrices instead.
+
+    Returns:
+        The log-likelihood under every model (float64), 0 for an empty sequence
+    """
+    n_models, n_states = initials_log.shape
+    norms = np.zeros(n_models)
+    if len(data) == 0:
+        return norms
+    log_probs = np.empty((n_models, n_states), dtype=initials_log.dtype)
+    new_log_probs = np.empty((n_models, n_states), dtype=initials_log.dtype)
+    for k in range(n_models):
+        log_probs[k] = emissions_log[k, :, data[0]] + initials_log[k]
+        norms[k] = normalise_log(log_probs[k])
+
+    for t in range(1, len(data)):
+        d = data[t]
+        for k in range(n_models):
+            if len(tables) > 0:
+                norms[k] += forward_step_table_log_normalised(
+                    log_probs[k], tables[d, k], new_log_probs[k]
+                )
+            else:
+                new_log_probs[k] = emissions_log[k, :, d] + logexpdot_vector_matrix(
+                    log_probs[k], transitions_log[k]
+                )
+                norms[k] += normalise_log(new_log_probs[k])
+        log_probs, new_log_probs = new_log_probs, log_probs
+
+    return norms
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_bank_likelihood_scaled_rolling(
+    data: NDArray, transitions: NDArray, emissions: NDArray, initials: NDArray
+) -> NDArray:
+    """``calc_bank_likelihood_log_rolling`` with the scaled recursion.
+
+    A model stops at the first observation it gives probability 0 and scores
+    -inf, the others carry on.
+    """
+    n_models, n_states = initials.shape
+    norms = np.zeros(n_models)
+    if len(data) == 0:
+        return norms
+    # flags rather than tests of norms for -inf, which fastmath may fold away
+    impossible = np.zeros(n_models, dtype=np.bool_)
+    probs = np.empty((n_models, n_states), dtype=initials.dtype)
+    new_prob = np.empty(n_states, dtype=initials.dtype)
+    for k in range(n_models):
+        scale = 0.0
+        for j in range(n_states):
+            probs[k, j] = emissions[k, j, data[0]] * initials[k, j]
+            scale += probs[k, j]
+        if scale == 0:
+            impossible[k] = True
+            continue
+        for j in range(n_states):
+            probs[k, j] /= scale
+        norms[k] = np.log(scale)
+
+    for t in range(1, len(data)):
+        d = data[t]
+        for k in range(n_models):
+            if impossible[k]:
+                continue
+            scale = 0.0
+            for j in range(n_states):
+                total = 0.0
+                for i in range(n_states):
+                    total += probs[k, i] * transitions[k, i, j]
+                new_prob[j] = emissions[k, j, d] * total
+                scale += new_prob[j]
+            if scale == 0:
+                impossible[k] = True
+                continue
+            for j in range(n_states):
+                probs[k, j] = new_prob[j] / scale
+            norms[k] += np.log(scale)
+
+    norms[impossible] = -np.inf
+    return norms
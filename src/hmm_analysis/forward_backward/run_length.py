@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+from numba import jit
+
+# a run is jumped over with matrix powers when its length exceeds
+# RUN_LENGTH_FACTOR * N * log2(length), shorter runs are walked step by step
+RUN_LENGTH_FACTOR = 8
+
+# normalised messages closer than this are treated as converged inside a run
+RUN_CONVERGENCE_TOL = 1e-12
+
+
+def compress_runs(data: NDArray) -> tuple[NDArray, NDArray]:
+    """Run-length encode an observation sequence.
+
+    Returns:
+        The symbol and the length (int64) of every run of repeated observations
+    """
+    data = np.asarray(data)
+    if len(data) == 0:
+        return data[:0], np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.diff(data)) + 1
+    starts = np.concatenate(([0], starts))
+    lengths = np.diff(np.append(starts, len(data))).astype(np.int64)
+    return data[starts], lengths
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def long_run(length: int, n_states: int) -> bool:
+    return length > RUN_LENGTH_FACTOR * n_states * np.log2(max(length, 2))
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def matmul(a: NDArray, b: NDArray) -> NDArray:
+    res = np.zeros((a.shape[0], b.shape[1]))
+    for i in range(a.shape[0]):
+        for k in range(a.shape[1]):
+            for j in range(b.shape[1]):
+                res[i, j] += a[i, k] * b[k, j]
+    return res
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def matrix_power_scaled(m: NDArray, power: int):
+    """Repeated squaring with renormalisation, m^power = res * exp(log_scale).
+
+    Returns:
+        The rescaled power (largest entry 1) and its log scale
+    """
+    res = np.eye(m.shape[0])
+    log_scale = 0.0
+    base = m.copy()
+    base_log_scale = 0.0
+    while power > 0:
+        if power & 1:
+            res = matmul(res, base)
+            scale = res.max()
+            res /= scale
+            log_scale += np.log(scale) + base_log_scale
+        power >>= 1
+        if power:
+            base = matmul(base, base)
+            scale = base.max()
+            base /= scale
+            base_log_scale = 2 * base_log_scale + np.log(scale)
+    return res, log_scale
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_symbol_table_scaled(transition: NDArray, emission: NDArray) -> NDArray:
+    """Probability space symbol table, table[d, i, j] = T(i, j) * E(j, d)."""
+    n_states, n_symbols = emission.shape
+    table = np.empty(shape=(n_symbols, n_states, n_states))
+    for d in range(n_symbols):
+        table[d] = transition * emission[:, d]
+    return table
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def vector_matrix_normalised(v: NDArray, m: NDArray):
+    res = np.zeros(m.shape[1])
+    for i in range(m.shape[0]):
+        for j in range(m.shape[1]):
+            res[j] += v[i] * m[i, j]
+    scale = res.sum()
+    return res / scale, scale
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def matrix_vector_normalised(m: NDArray, v: NDArray):
+    res = np.zeros(m.shape[0])
+    for i in range(m.shape[0]):
+        for j in range(m.shape[1]):
+            res[i] += m[i, j] * v[j]
+    return res / res.sum()
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_runs_scaled(
+    symbols: NDArray,
+    lengths: NDArray,
+    table: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+):
+    """Scaled forward pass over run-length encoded observations.
+
+    A long run of symbol d advances the message by table[d]^length, computed by
+    repeated squaring, other runs step through their observations.
+
+    Returns:
+        The normalised forward message before every run (after the first
+        observation for run 0) and the log-likelihood
+    """
+    n_states = len(initial)
+    starts = np.empty(shape=(len(symbols), n_states))
+    alpha = emission[:, symbols[0]] * initial
+    scale = alpha.sum()
+    alpha = alpha / scale
+    norm = np.log(scale)
+
+    for k in range(len(symbols)):
+        starts[k] = alpha
+        step = table[symbols[k]]
+        length = lengths[k] - 1 if k == 0 else lengths[k]
+        if long_run(length, n_states):
+            power, log_scale = matrix_power_scaled(step, length)
+            alpha, scale = vector_matrix_normalised(alpha, power)
+            norm += log_scale + np.log(scale)
+        else:
+            for _ in range(length):
+                alpha, scale = vector_matrix_normalised(alpha, step)
+                norm += np.log(scale)
+
+    return starts, norm
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_backward_runs_scaled(symbols: NDArray, lengths: NDArray, table: NDArray):
+    """Scaled backward pass over run-length encoded observations.
+
+    Returns:
+        The normalised backward message at the last observation of every run
+    """
+    n_states = table.shape[1]
+    ends = np.empty(shape=(len(symbols), n_states))
+    beta = np.ones(n_states) / n_states
+
+    for k in range(len(symbols) - 1, -1, -1):
+        ends[k] = beta
+        step = table[symbols[k]]
+        length = lengths[k] - 1 if k == 0 else lengths[k]
+        if long_run(length, n_states):
+            power, _ = matrix_power_scaled(step, length)
+            beta = matrix_vector_normalised(power, beta)
+        else:
+            for _ in range(length):
+                beta = matrix_vector_normalised(step, beta)
+
+    return ends
@@ -0,0 +1,57 @@
+import numpy as np
+from numpy.typing import NDArray
+from hmm_analysis.utils.expsum_ops import (
+    logexpdot_sparse_vector,
+    logexpdot_vector_sparse,
+)
+from numba import jit
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_forward_log_sparse(
+    data: NDArray,
+    indptr: NDArray,
+    indices: NDArray,
+    transition_values_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+) -> NDArray:
+    # calc_forward_log with the transition matrix in CSR layout
+    emission_log_transpose = emission_log.T
+    log_prob = emission_log_transpose[data[0]] + initial_log
+    res = np.empty(shape=(len(data), len(log_prob)), dtype=log_prob.dtype)
+    res[0] = log_prob
+
+    for t in range(1, len(data)):
+        log_prob = emission_log_transpose[data[t]] + logexpdot_vector_sparse(
+            log_prob, indptr, indices, transition_values_log
+        )
+        res[t] = log_prob
+
+    return res
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_backward_log_sparse(
+    data: NDArray,
+    indptr: NDArray,
+    indices: NDArray,
+    transition_values_log: NDArray,
+    emission_log: NDArray,
+) -> NDArray:
+    # calc_backward_log with the transition matrix in CSR layout
+    emission_log_transpose = emission_log.T
+    res = np.empty(
+        shape=(len(data), len(indptr) - 1), dtype=transition_values_log.dtype
+    )
+    res[len(data) - 1] = 0.0
+
+    for t in range(len(data) - 2, -1, -1):
+        res[t] = logexpdot_sparse_vector(
+            indptr,
+            indices,
+            transition_values_log,
+            emission_log_transpose[data[t + 1]] + res[t + 1],
+        )
+
+    return res
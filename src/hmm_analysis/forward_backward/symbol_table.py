@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+from hmm_analysis.utils.expsum_ops import MINUS_INF
+from numba import jit
+
+# largest (M, N, N) symbol table, in bytes, the log engine builds per iteration
+SYMBOL_TABLE_MAX_BYTES = 64 * 2**20
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def use_symbol_table(n_states: int, n_symbols: int, itemsize: int = 8) -> bool:
+    """Whether the (M, N, N) table of ``itemsize`` byte entries fits the budget."""
+    return n_symbols * n_states * n_states * itemsize <= SYMBOL_TABLE_MAX_BYTES
+
+
+def prepare_symbol_table_log(
+    transition_log: NDArray, emission_log: NDArray, n_observations: int | None = None
+) -> NDArray:
+    """The symbol table the log kernels take, built once for all their sequences.
+
+    The table is only built when ``use_symbol_table`` allows it and, given
+    ``n_observations``, when there are at least as many observations as
+    symbols. Otherwise it is an empty (0, N, N) array and the kernels step with
+    the transition matrix.
+    """
+    n_states, n_symbols = emission_log.shape
+    if use_symbol_table(n_states, n_symbols, transition_log.itemsize) and (
+        n_observations is None or n_observations >= n_symbols
+    ):
+        return calc_symbol_table_log(transition_log, emission_log)
+    return np.empty((0, n_states, n_states), dtype=transition_log.dtype)
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_symbol_table_log(transition_log: NDArray, emission_log: NDArray) -> NDArray:
+    """Symbol-conditioned transition matrices, table[d, i, j] = T(i, j) + E(j, d).
+
+    ``table[d]`` is the transition into an observation of symbol d, the backward
+    step is logsumexp_j(table[d, i, j] + b(j)) and the forward step
+    logsumexp_i(f(i) + table[d, i, j]).
+    """
+    n_states, n_symbols = emission_log.shape
+    table = np.empty(shape=(n_symbols, n_states, n_states), dtype=transition_log.dtype)
+    calc_symbol_table_log_into(transition_log, emission_log, table)
+    return table
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def calc_symbol_table_log_into(
+    transition_log: NDArray, emission_log: NDArray, out: NDArray
+):
+    """``calc_symbol_table_log`` writing into a preallocated (M, N, N) ``out``."""
+    n_states, n_symbols = emission_log.shape
+    for d in range(n_symbols):
+        for i in range(n_states):
+            for j in range(n_states):
+                out[d, i, j] = transition_log[i, j] + emission_log[j, d]
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def forward_step_table_log(log_prob: NDArray, table_d: NDArray, out: NDArray):
+    """out(j) = logsumexp_i(log_prob(i) + table_d(i, j)) without temporaries."""
+    n_states = len(log_prob)
+    out[:] = MINUS_INF
+    for i in range(n_states):
+        for j in range(n_states):
+            out[j] = max(out[j], log_prob[i] + table_d[i, j])
+
+    total = np.zeros(n_states)
+    for i in range(n_states):
+        for j in range(n_states):
+            total[j] += np.exp(log_prob[i] + table_d[i, j] - out[j])
+    for j in range(n_states):
+        out[j] = -np.inf if total[j] == 0 else out[j] + np.log(total[j])
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def backward_step_table_log(table_d: NDArray, log_prob: NDArray, out: NDArray):
+    """out(i) = logsumexp_j(table_d(i, j) + log_prob(j)) without temporaries."""
+    n_states = len(log_prob)
+    for i in range(n_states):
+        max_scalar = MINUS_INF
+        for j in range(n_states):
+            max_scalar = max(max_scalar, table_d[i, j] + log_prob[j])
+        total = 0.0
+        for j in range(n_states):
+            total += np.exp(table_d[i, j] + log_prob[j] - max_scalar)
+        out[i] = -np.inf if total == 0 else max_scalar + np.log(total)
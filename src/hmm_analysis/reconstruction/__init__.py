@@ -1,3 +1,12 @@
 from .reconstruct import reconstruct
+from .viterbi import viterbi
+from .batch import reconstruct_batch, viterbi_batch
+from .streaming import FixedLagSmoother
 
-__all__ = ["reconstruct"]
+__all__ = [
+    "FixedLagSmoother",
+    "reconstruct",
+    "reconstruct_batch",
+    "viterbi",
+    "viterbi_batch",
+]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from hmm_analysis.baum_welch.core.step import BACKENDS
+from hmm_analysis.forward_backward import prepare_symbol_table_log
+from hmm_analysis.sparse import SparseTransition
+from hmm_analysis.sequences import PackedSequences, pack_sequences, schedule_workers
+from hmm_analysis.utils.casting import cast_log
+from .reconstruct import reconstruct_log, reconstruct_scaled
+from .viterbi import backpointer_dtype, calc_viterbi_log
+import numpy as np
+from numba import jit, prange
+from numpy.typing import NDArray
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def reconstruct_log_parallel(
+    data,
+    offsets,
+    transition_log,
+    emission_log,
+    initial_log,
+    table,
+    schedule,
+    worker_offsets,
+):
+    # every worker writes its own sequences' slices of the packed output, the
+    # symbol table is shared by all of them
+    states = np.empty(len(data), dtype=np.int64)
+    for w in prange(len(worker_offsets) - 1):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            if offsets[i + 1] > offsets[i]:
+                states[offsets[i] : offsets[i + 1]] = reconstruct_log(
+                    data[offsets[i] : offsets[i + 1]],
+                    transition_log,
+                    emission_log,
+                    initial_log,
+                    table,
+                )
+    return states
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def reconstruct_scaled_parallel(
+    data, offsets, transition, emission, initial, schedule, worker_offsets
+):
+    # every worker writes its own sequences' slices of the packed output
+    states = np.empty(len(data), dtype=np.int64)
+    for w in prange(len(worker_offsets) - 1):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            if offsets[i + 1] > offsets[i]:
+                states[offsets[i] : offsets[i + 1]] = reconstruct_scaled(
+                    data[offsets[i] : offsets[i + 1]], transition, emission, initial
+                )
+    return states
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def calc_viterbi_log_parallel(
+    data,
+    offsets,
+    transition_log,
+    emission_log,
+    initial_log,
+    schedule,
+    worker_offsets,
+    backpointers,
+):
+    # backpointers holds one scratch buffer per worker, sized to the longest sequence
+    paths = np.empty(len(data), dtype=np.int64)
+    log_probs = np.zeros(len(offsets) - 1)
+    for w in prange(len(worker_offsets) - 1):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            if offsets[i + 1] > offsets[i]:
+                path, log_prob = calc_viterbi_log(
+                    data[offsets[i] : offsets[i + 1]],
+                    transition_log,
+                    emission_log,
+                    initial_log,
+                    backpointers[w],
+                )
+                paths[offsets[i] : offsets[i + 1]] = path
+                log_probs[i] = log_prob
+    return paths, log_probs
+
+
+def reconstruct_batch(
+    sequences: list[NDArray] | NDArray | PackedSequences,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    backend: str = "log",
+) -> PackedSequences:
+    """Reconstruct the hidden states of many sequences in parallel.
+
+    The parameters are prepared once and all sequences are decoded inside one
+    compiled call, spread across threads longest sequence first.
+
+    Args:
+        sequences: List of observation sequences, a 2-D array or PackedSequences
+        transition: Transition matrix (left multiplication: P(X_i) * T)
+        emission: Emission matrix
+        initial: Initial probability vector
+        backend: Forward-backward engine, "log" (default) or "scaled"
+
+    Returns:
+        The most likely hidden state of every observation, packed with the
+        offsets of the input sequences
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+    if isinstance(transition, SparseTransition):
+        transition = transition.to_dense()
+
+    packed = pack_sequences(sequences)
+    schedule, worker_offsets = schedule_workers(packed.offsets)
+
+    if backend == "log":
+        transition_log, emission_log, initial_log = cast_log(
+            transition, emission, initial
+        )
+        table = prepare_symbol_table_log(transition_log, emission_log, len(packed.data))
+        parameters = (transition_log, emission_log, initial_log, table)
+        kernel = reconstruct_log_parallel
+    else:
+        parameters = (transition, emission, initial)
+        kernel = reconstruct_scaled_parallel
+
+    states = kernel(packed.data, packed.offsets, *parameters, schedule, worker_offsets)
+    return PackedSequences(states, packed.offsets)
+
+
+def viterbi_batch(
+    sequences: list[NDArray] | NDArray | PackedSequences,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+) -> tuple[PackedSequences, NDArray]:
+    """Viterbi-decode many sequences in parallel.
+
+    Args:
+        sequences: List of observation sequences, a 2-D array or PackedSequences
+        transition: Transition matrix (left multiplication: P(X_i) * T)
+        emission: Emission matrix
+        initial: Initial probability vector
+
+    Returns:
+        The most likely paths, packed with the offsets of the input sequences,
+        and the joint log-probability of every path
+    """
+    if isinstance(transition, SparseTransition):
+        transition = transition.to_dense()
+
+    packed = pack_sequences(sequences)
+    schedule, worker_offsets = schedule_workers(packed.offsets)
+    transition_log, emission_log, initial_log = cast_log(transition, emission, initial)
+
+    max_length = int(packed.lengths.max(initial=0))
+    backpointers = np.empty(
+        (len(worker_offsets) - 1, max_length, transition_log.shape[0]),
+        dtype=backpointer_dtype(transition_log.shape[0]),
+    )
+    paths, log_probs = calc_viterbi_log_parallel(
+        packed.data,
+        packed.offsets,
+        transition_log,
+        emission_log,
+        initial_log,
+        schedule,
+        worker_offsets,
+        backpointers,
+    )
+    return PackedSequences(paths, packed.offsets), log_probs
@@ -1,40 +1,407 @@
-from hmm_analysis.forward_backward import get_forward_backward_likelihood_log
+from __future__ import annotations
+
+from hmm_analysis.forward_backward import (
+    calc_backward_log_sparse,
+    calc_forward_log_sparse,
+    RUN_CONVERGENCE_TOL,
+    calc_backward_log_normalised,
+    calc_backward_log_table_normalised,
+    calc_backward_runs_scaled,
+    calc_chunk_messages_scaled,
+    calc_forward_runs_scaled,
+    calc_posterior_segment_scaled,
+    calc_transfer_scaled,
+    calc_symbol_table_scaled,
+    compress_runs,
+    long_run,
+    matrix_vector_normalised,
+    normalise_log,
+    vector_matrix_normalised,
+    calc_forward_checkpoints_log,
+    calc_forward_log_normalised,
+    calc_forward_log_table_normalised,
+    calc_forward_segment_log,
+    get_forward_backward_likelihood_scaled,
+    prepare_symbol_table_log,
+    resolve_checkpoint_interval,
+)
 from hmm_analysis.baum_welch.estimations.hidden_state_prob import (
-    calc_hidden_state_prob_log,
+    calc_hidden_state_prob_scaled,
 )
-from hmm_analysis.utils.casting import cast_log
+from hmm_analysis.baum_welch.core.step import BACKENDS
+from hmm_analysis.sequences import PackedSequences, schedule_chunks
+from hmm_analysis.sparse import SparseTransition
+from hmm_analysis.utils.casting import cast_dtype, cast_log, resolve_dtype
+from hmm_analysis.utils.expsum_ops import logsumexp_2d
 import numpy as np
+from numba import jit, prange
 from numpy.typing import NDArray
 
 
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_log(data, transition_log, emission_log, initial_log, table):
+    # table is prepare_symbol_table_log(...), empty when the table is not used
+    if len(table) > 0:
+        forward_log, _ = calc_forward_log_table_normalised(
+            data, table, emission_log, initial_log
+        )
+        backward_log = calc_backward_log_table_normalised(data, table)
+    else:
+        forward_log, _ = calc_forward_log_normalised(
+            data, transition_log, emission_log, initial_log
+        )
+        backward_log = calc_backward_log_normalised(data, transition_log, emission_log)
+
+    # the reconstructing is the maximum of the hidden state probability at each
+    # time, which does not depend on the normalisation of the messages
+    return np.argmax(forward_log + backward_log, axis=1)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_scaled(data, transition, emission, initial):
+    forward, backward, _, _ = get_forward_backward_likelihood_scaled(
+        data, initial, transition, emission
+    )
+    hidden_state_prob = calc_hidden_state_prob_scaled(forward, backward)
+    return np.argmax(hidden_state_prob, axis=1)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_log_checkpointed(
+    data, transition_log, emission_log, initial_log, interval
+):
+    # only every interval-th forward message is kept, the segments in between are
+    # recomputed while the backward message rolls from the end of the sequence
+    checkpoints, _ = calc_forward_checkpoints_log(
+        data, transition_log, emission_log, initial_log, interval
+    )
+    emission_log_transpose = emission_log.T
+    backward_log = np.zeros(transition_log.shape[0], dtype=transition_log.dtype)
+    forward_log = np.empty(
+        shape=(min(interval, len(data)), transition_log.shape[0]),
+        dtype=transition_log.dtype,
+    )
+    states = np.empty(len(data), dtype=np.int64)
+
+    for c in range(len(checkpoints) - 1, -1, -1):
+        start = c * interval
+        stop = min(start + interval, len(data))
+        calc_forward_segment_log(
+            data, transition_log, emission_log, checkpoints[c], start, stop, forward_log
+        )
+        for t in range(stop - 1, start - 1, -1):
+            if t < len(data) - 1:
+                backward_log = logsumexp_2d(
+                    transition_log
+                    + (emission_log_transpose[data[t + 1]] + backward_log)
+                )
+                normalise_log(backward_log)
+            # the argmax of the hidden state probability does not need the norm
+            states[t] = np.argmax(forward_log[t - start] + backward_log)
+
+    return states
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_log_sparse(
+    data, indptr, indices, transition_values_log, emission_log, initial_log
+):
+    # the transition matrix is in CSR layout, the argmax does not need the norm
+    forward_log = calc_forward_log_sparse(
+        data, indptr, indices, transition_values_log, emission_log, initial_log
+    )
+    backward_log = calc_backward_log_sparse(
+        data, indptr, indices, transition_values_log, emission_log
+    )
+    return np.argmax(forward_log + backward_log, axis=1)
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_log_sparse_packed(
+    data, offsets, indptr, indices, transition_values_log, emission_log, initial_log
+):
+    states = np.empty(len(data), dtype=np.int64)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            states[offsets[i] : offsets[i + 1]] = reconstruct_log_sparse(
+                data[offsets[i] : offsets[i + 1]],
+                indptr,
+                indices,
+                transition_values_log,
+                emission_log,
+                initial_log,
+            )
+    return states
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_run_length(symbols, lengths, transition, emission, initial):
+    # forward messages before and backward messages at the end of every run
+    table = calc_symbol_table_scaled(transition, emission)
+    starts = calc_forward_runs_scaled(symbols, lengths, table, emission, initial)[0]
+    ends = calc_backward_runs_scaled(symbols, lengths, table)
+    n_states = len(initial)
+    states = np.empty(lengths.sum(), dtype=np.int64)
+
+    position = 1
+    backward = ends[0]  # for a first run of one observation
+    for k in range(len(symbols)):
+        step = table[symbols[k]]
+        length = lengths[k] - 1 if k == 0 else lengths[k]
+        if length == 0:
+            continue
+        converging = long_run(length, n_states)
+
+        # backward messages from the end of the run, inside a long run they
+        # converge and the stepping stops early
+        backwards = np.empty((min(length, 1024), n_states))
+        backwards[0] = ends[k]
+        n_backwards = 1
+        while n_backwards < length:
+            if n_backwards == len(backwards):
+                grown = np.empty((min(2 * n_backwards, length), n_states))
+                grown[:n_backwards] = backwards
+                backwards = grown
+            backwards[n_backwards] = matrix_vector_normalised(
+                step, backwards[n_backwards - 1]
+            )
+            n_backwards += 1
+            if converging and (
+                np.abs(backwards[n_backwards - 1] - backwards[n_backwards - 2]).max()
+                < RUN_CONVERGENCE_TOL
+            ):
+                break
+
+        # once both messages have converged the state is constant
+        forward = starts[k]
+        converged = False
+        constant_state = -1
+        for s in range(length):
+            settled = converged and length - 1 - s >= n_backwards - 1
+            if settled and constant_state >= 0:
+                states[position + s] = constant_state
+                continue
+            if not converged:
+                new_forward, _ = vector_matrix_normalised(forward, step)
+                converged = converging and (
+                    np.abs(new_forward - forward).max() < RUN_CONVERGENCE_TOL
+                )
+                forward = new_forward
+            backward = backwards[min(length - 1 - s, n_backwards - 1)]
+            states[position + s] = np.argmax(forward * backward)
+            if settled:
+                constant_state = states[position + s]
+        position += length
+
+        if k == 0:
+            # the backward message of the first observation
+            backward = matrix_vector_normalised(
+                step, backwards[min(length - 1, n_backwards - 1)]
+            )
+
+    states[0] = np.argmax(starts[0] * backward)
+    return states
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def reconstruct_parallel_in_time(data, transition, emission, initial, chunk_offsets):
+    # transfer matrices of the chunks, then the messages at the chunk boundaries
+    n_states = len(initial)
+    n_chunks = len(chunk_offsets) - 1
+    table = calc_symbol_table_scaled(transition, emission)
+    transfers = np.empty((n_chunks, n_states, n_states))
+    log_scales = np.empty(n_chunks)
+    for c in prange(n_chunks):
+        transfer, log_scale = calc_transfer_scaled(
+            data, chunk_offsets[c], chunk_offsets[c + 1], table
+        )
+        transfers[c] = transfer
+        log_scales[c] = log_scale
+
+    first_forward = emission[:, data[0]] * initial
+    first_forward = first_forward / first_forward.sum()
+    forwards, backwards, first_backward, _ = calc_chunk_messages_scaled(
+        transfers, log_scales, first_forward, 0.0
+    )
+
+    states = np.empty(len(data), dtype=np.int64)
+    states[0] = np.argmax(first_forward * first_backward)
+    for c in prange(n_chunks):
+        start, stop = chunk_offsets[c], chunk_offsets[c + 1]
+        hidden_state_prob = np.empty((stop - start, n_states))
+        calc_posterior_segment_scaled(
+            data, start, stop, table, forwards[c], backwards[c], hidden_state_prob
+        )
+        for t in range(stop - start):
+            states[start + t] = np.argmax(hidden_state_prob[t])
+    return states
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_log_packed(
+    data, offsets, transition_log, emission_log, initial_log, table
+):
+    # states are written to a buffer aligned with the packed observations, the
+    # symbol table is shared by all sequences
+    states = np.empty(len(data), dtype=np.int64)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            states[offsets[i] : offsets[i + 1]] = reconstruct_log(
+                data[offsets[i] : offsets[i + 1]],
+                transition_log,
+                emission_log,
+                initial_log,
+                table,
+            )
+    return states
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def reconstruct_scaled_packed(data, offsets, transition, emission, initial):
+    # states are written to a buffer aligned with the packed observations
+    states = np.empty(len(data), dtype=np.int64)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            states[offsets[i] : offsets[i + 1]] = reconstruct_scaled(
+                data[offsets[i] : offsets[i + 1]], transition, emission, initial
+            )
+    return states
+
+
 def reconstruct(
-    data: NDArray, transition: NDArray, emission: NDArray, initial: NDArray
-) -> NDArray:
+    data: NDArray | PackedSequences,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    backend: str = "log",
+    checkpoint_interval: int | str | None = None,
+    run_length: bool = False,
+    parallel: bool = False,
+    dtype=np.float64,
+) -> NDArray | PackedSequences:
     """Reconstruct hidden states using maximum likelihood estimation.
 
     Given HMM parameters and observations, estimates the most likely sequence
     of hidden states using the forward-backward algorithm.
 
     Args:
-        data: Observation sequence
-        transition: Transition matrix (left multiplication: P(X_i) * T)
+        data: Observation sequence, or PackedSequences to reconstruct many at once
+        transition: Transition matrix (left multiplication: P(X_i) * T), or a
+            SparseTransition (log backend only)
         emission: Emission matrix
         initial: Initial probability vector
+        backend: Forward-backward engine, "log" (default) or "scaled"
+        checkpoint_interval: For a single long sequence, store only every k-th
+            forward message and recompute the segments in between during the
+            backward pass. An int k, or "sqrt" for O(sqrt(T) * N) memory. None
+            (default) stores all of them. Log backend only
+        run_length: For a single sequence with long runs of repeated symbols,
+            jump over the runs with matrix powers. Inside a long run the
+            normalised messages converge, so the states are filled in without
+            stepping through every observation (default False)
+        parallel: Split a single sequence into one chunk per thread. The chunk
+            transfer matrices and the posteriors are computed concurrently, at
+            O(N^3) work per step, with the scaled engine (default False). Use
+            reconstruct_batch for many sequences
+        dtype: Floating point type of the parameters and of the forward,
+            backward and posterior buffers, np.float64 (default) or np.float32.
+            The run_length and parallel engines always work in float64
 
     Returns:
-        Array of most likely hidden state indices for each observation
+        Array of most likely hidden state indices for each observation. For
+        PackedSequences the states are returned packed with the same offsets
     """
-    # casting parameters to log
-    transition, emission, initial = cast_log(transition, emission, initial)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    dtype = resolve_dtype(dtype)
 
-    forward_log, backward_log, likelihood = get_forward_backward_likelihood_log(
-        data, initial, transition, emission
-    )
+    if checkpoint_interval is not None and (
+        isinstance(data, PackedSequences) or backend != "log"
+    ):
+        raise ValueError(
+            "checkpoint_interval is only supported for a single sequence "
+            "with the log backend"
+        )
+
+    if parallel:
+        if (
+            isinstance(data, PackedSequences)
+            or checkpoint_interval is not None
+            or run_length
+            or isinstance(transition, SparseTransition)
+        ):
+            raise ValueError(
+                "parallel is only supported for a single sequence with a dense "
+                "transition, without checkpointing or run_length, use "
+                "reconstruct_batch for many sequences"
+            )
+        data = np.asarray(data)
+        transition, emission, initial = (
+            np.asarray(param, dtype=np.float64)
+            for param in (transition, emission, initial)
+        )
+        return reconstruct_parallel_in_time(
+            data, transition, emission, initial, schedule_chunks(len(data))
+        )
+
+    if run_length:
+        if isinstance(data, PackedSequences) or checkpoint_interval is not None:
+            raise ValueError(
+                "run_length is only supported for a single sequence without "
+                "checkpointing"
+            )
+        if isinstance(transition, SparseTransition):
+            transition = transition.to_dense()
+        symbols, lengths = compress_runs(data)
+        return reconstruct_run_length(symbols, lengths, transition, emission, initial)
+
+    if isinstance(transition, SparseTransition):
+        if backend != "log" or checkpoint_interval is not None or dtype != np.float64:
+            raise ValueError(
+                "a SparseTransition is only supported by the float64 log backend "
+                "without checkpointing"
+            )
+        return _reconstruct_sparse(data, transition, emission, initial)
 
-    # the reconstructing is the maximum of the hidden state probability at each time
-    hidden_state_prob = calc_hidden_state_prob_log(
-        forward_log, backward_log, likelihood
+    # casting parameters to log
+    if backend == "log":
+        transition, emission, initial = cast_log(transition, emission, initial)
+    transition, emission, initial = cast_dtype(
+        dtype, *(np.asarray(param) for param in (transition, emission, initial))
     )
 
-    # hidden state index
-    return np.argmax(hidden_state_prob, axis=1)
+    if checkpoint_interval is not None:
+        interval = resolve_checkpoint_interval(len(data), checkpoint_interval)
+        return reconstruct_log_checkpointed(
+            data, transition, emission, initial, interval
+        )
+
+    packed = isinstance(data, PackedSequences)
+    parameters = (transition, emission, initial)
+    if backend == "log":
+        # one table for all the sequences, worth building for their total length
+        n_observations = len(data.data) if packed else len(data)
+        parameters += (prepare_symbol_table_log(transition, emission, n_observations),)
+
+    if packed:
+        kernel = (
+            reconstruct_log_packed if backend == "log" else reconstruct_scaled_packed
+        )
+        states = kernel(data.data, data.offsets, *parameters)
+        return PackedSequences(states, data.offsets)
+
+    kernel = reconstruct_log if backend == "log" else reconstruct_scaled
+    return kernel(data, *parameters)
+
+
+def _reconstruct_sparse(data, transition, emission, initial):
+    transition_log, emission_log, initial_log = cast_log(transition, emission, initial)
+    sparse_args = (transition_log.indptr, transition_log.indices, transition_log.values)
+
+    if isinstance(data, PackedSequences):
+        states = reconstruct_log_sparse_packed(
+            data.data, data.offsets, *sparse_args, emission_log, initial_log
+        )
+        return PackedSequences(states, data.offsets)
+
+    return reconstruct_log_sparse(data, *sparse_args, emission_log, initial_log)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import numpy as np
+from hmm_analysis.utils.casting import cast_log
+from hmm_analysis.utils.expsum_ops import (
+    logexpdot_vector_matrix,
+    logsumexp_1d,
+    logsumexp_2d,
+)
+from numba import jit
+from numpy.typing import NDArray
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def smooth_window_log(
+    transition_log: NDArray,
+    emission_log: NDArray,
+    forward_buffer: NDArray,
+    data_buffer: NDArray,
+    n_pending: int,
+    n_emit: int,
+    states: NDArray,
+    probs: NDArray,
+    position: int,
+):
+    """Smooth the first ``n_emit`` of the ``n_pending`` buffered steps.
+
+    The backward message is rolled from the newest buffered observation, the
+    posteriors are written to ``states`` / ``probs`` starting at ``position``.
+    """
+    emission_log_transpose = emission_log.T
+    backward_log = np.zeros(transition_log.shape[0])
+
+    for t in range(n_pending - 1, -1, -1):
+        if t < n_emit:
+            posterior_log = forward_buffer[t] + backward_log
+            posterior_log = posterior_log - logsumexp_1d(posterior_log)
+            probs[position + t] = np.exp(posterior_log)
+            states[position + t] = np.argmax(posterior_log)
+        if t > 0:
+            backward_log = logsumexp_2d(
+                transition_log + (emission_log_transpose[data_buffer[t]] + backward_log)
+            )
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def fixed_lag_update_log(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    predicted_log: NDArray,
+    forward_buffer: NDArray,
+    data_buffer: NDArray,
+    n_pending: int,
+    block: int,
+):
+    """Feed observations to a fixed-lag smoother.
+
+    ``forward_buffer`` / ``data_buffer`` hold the normalised forward messages and
+    observations of the ``n_pending`` steps not emitted yet, ``predicted_log`` is
+    the distribution of the next hidden state and is updated in place. Whenever
+    the buffer is full (lag + 1 steps) its oldest ``block`` steps are smoothed and
+    emitted, so every step is emitted at most lag observations late.
+
+    Returns:
+        The emitted states and probabilities, the new number of pending steps and
+        the log-likelihood of ``data`` given the observations before it
+    """
+    window = forward_buffer.shape[0]
+    emission_log_transpose = emission_log.T
+    states = np.empty(len(data) + window, dtype=np.int64)
+    probs = np.empty(shape=(len(data) + window, transition_log.shape[0]))
+    n_emitted = 0
+    norm = 0.0
+
+    for t in range(len(data)):
+        # normalised forward message, the normalisers sum to the log-likelihood
+        forward_log = emission_log_transpose[data[t]] + predicted_log
+        scale = logsumexp_1d(forward_log)
+        forward_log = forward_log - scale
+        norm += scale
+        predicted_log[:] = logexpdot_vector_matrix(forward_log, transition_log)
+
+        forward_buffer[n_pending] = forward_log
+        data_buffer[n_pending] = data[t]
+        n_pending += 1
+
+        if n_pending == window:
+            smooth_window_log(
+                transition_log,
+                emission_log,
+                forward_buffer,
+                data_buffer,
+                n_pending,
+                block,
+                states,
+                probs,
+                n_emitted,
+            )
+            n_emitted += block
+
+            # the rest of the window stays as look-ahead for the next block
+            n_pending -= block
+            forward_buffer[:n_pending] = forward_buffer[block:window].copy()
+            data_buffer[:n_pending] = data_buffer[block:window].copy()
+
+    return states[:n_emitted], probs[:n_emitted], n_pending, norm
+
+
+class FixedLagSmoother:
+    """Streaming reconstruction with a bounded delay (fixed-lag smoothing).
+
+    Observations are fed one at a time or in chunks. A filtered forward message is
+    kept for every step that has not been emitted yet, at most ``lag + 1`` of them.
+    Once the window is full, a backward pass over it smooths the oldest ``block``
+    steps, which are emitted with between ``lag - block + 1`` and ``lag`` steps of
+    look-ahead. Memory is O(lag * N) and the cost per observation is amortised
+    O((lag / block) * N^2), O(N^2) for the default ``block = lag // 2``.
+
+    Args:
+        transition: Transition matrix (left multiplication: P(X_i) * T)
+        emission: Emission matrix
+        initial: Initial probability vector, the distribution of the first
+            hidden state of the stream
+        lag: Maximum delay, in observations, before a state is emitted
+        block: Number of states emitted per backward pass, 1 <= block <= lag + 1,
+            default max(lag // 2, 1)
+
+    Example:
+        smoother = FixedLagSmoother(transition, emission, initial, lag=50)
+        for chunk in stream:
+            states = smoother.update(chunk)
+        states = smoother.flush()
+    """
+
+    def __init__(
+        self,
+        transition: NDArray,
+        emission: NDArray,
+        initial: NDArray,
+        lag: int,
+        block: int | None = None,
+    ):
+        if lag < 0:
+            raise ValueError("lag must be non-negative")
+        block = max(lag // 2, 1) if block is None else block
+        if not 1 <= block <= lag + 1:
+            raise ValueError("block must be between 1 and lag + 1")
+
+        self.transition_log, self.emission_log, initial_log = cast_log(
+            transition, emission, initial
+        )
+        self.lag = lag
+        self.block = block
+        self.likelihood_log = 0.0
+        self.n_observed = 0
+        self.n_emitted = 0
+
+        n_states = self.transition_log.shape[0]
+        self._predicted_log = initial_log.astype(np.float64)
+        self._forward_buffer = np.empty((lag + 1, n_states))
+        self._data_buffer = np.empty(lag + 1, dtype=np.int64)
+        self._n_pending = 0
+
+    def update(
+        self, observations: NDArray | int, return_probabilities: bool = False
+    ) -> NDArray | tuple[NDArray, NDArray]:
+        """Add observations and emit the states that reached the lag.
+
+        Args:
+            observations: A single observation or a chunk of observations
+            return_probabilities: Also return the smoothed hidden state
+                probabilities of the emitted steps
+
+        Returns:
+            The most likely hidden state of every emitted step, in stream order,
+            and their (n_emitted, N) probabilities if requested
+        """
+        observations = np.atleast_1d(np.asarray(observations, dtype=np.int64))
+        states, probs, self._n_pending, norm = fixed_lag_update_log(
+            observations,
+            self.transition_log,
+            self.emission_log,
+            self._predicted_log,
+            self._forward_buffer,
+            self._data_buffer,
+            self._n_pending,
+            self.block,
+        )
+        self.likelihood_log += norm
+        self.n_observed += len(observations)
+        self.n_emitted += len(states)
+
+        if return_probabilities:
+            return states, probs
+        return states
+
+    def flush(
+        self, return_probabilities: bool = False
+    ) -> NDArray | tuple[NDArray, NDArray]:
+        """Emit every pending state using the look-ahead available so far.
+
+        The stream can be continued afterwards, the emitted states are simply
+        smoothed with less than ``lag`` steps of look-ahead.
+        """
+        n_pending = self._n_pending
+        states = np.empty(n_pending, dtype=np.int64)
+        probs = np.empty((n_pending, self.transition_log.shape[0]))
+        if n_pending:
+            smooth_window_log(
+                self.transition_log,
+                self.emission_log,
+                self._forward_buffer,
+                self._data_buffer,
+                n_pending,
+                n_pending,
+                states,
+                probs,
+                0,
+            )
+        self._n_pending = 0
+        self.n_emitted += n_pending
+
+        if return_probabilities:
+            return states, probs
+        return states
+
+    @property
+    def n_pending(self) -> int:
+        """Number of observations whose state has not been emitted yet."""
+        return self._n_pending
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from hmm_analysis.sparse import SparseTransition
+from hmm_analysis.sequences import PackedSequences
+from hmm_analysis.utils.casting import cast_log
+import numpy as np
+from numba import jit
+from numpy.typing import NDArray
+
+
+def backpointer_dtype(n_states: int):
+    """Smallest unsigned integer type able to index ``n_states`` states."""
+    if n_states <= np.iinfo(np.uint8).max + 1:
+        return np.uint8
+    if n_states <= np.iinfo(np.uint16).max + 1:
+        return np.uint16
+    return np.uint32
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def calc_viterbi_log(
+    data: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    backpointers: NDArray,
+):
+    """Log-space Viterbi decoding of a single sequence.
+
+    ``backpointers`` is a (len(data), N) scratch buffer, its dtype only has to be
+    wide enough to hold a state index (see ``backpointer_dtype``).
+
+    Returns:
+        The most likely hidden state path and its joint log-probability
+    """
+    n_states = transition_log.shape[0]
+    delta = emission_log[:, data[0]] + initial_log
+    new_delta = np.empty(n_states)
+
+    for t in range(1, len(data)):
+        d = data[t]
+        for j in range(n_states):
+            # comparisons start from state 0 rather than -inf to stay fastmath safe
+            best, arg = delta[0] + transition_log[0, j], 0
+            for i in range(1, n_states):
+                value = delta[i] + transition_log[i, j]
+                if value > best:
+                    best, arg = value, i
+            new_delta[j] = best + emission_log[j, d]
+            backpointers[t, j] = arg
+        delta, new_delta = new_delta, delta
+
+    # backtracking from the best final state
+    path = np.empty(len(data), dtype=np.int64)
+    path[-1] = np.argmax(delta)
+    for t in range(len(data) - 1, 0, -1):
+        path[t - 1] = backpointers[t, path[t]]
+
+    return path, delta[path[-1]]
+
+
+@jit(nopython=True, fastmath=True, cache=True)
+def calc_viterbi_log_packed(
+    data: NDArray,
+    offsets: NDArray,
+    transition_log: NDArray,
+    emission_log: NDArray,
+    initial_log: NDArray,
+    backpointers: NDArray,
+):
+    """``calc_viterbi_log`` over packed sequences.
+
+    ``backpointers`` needs as many rows as the longest sequence, it is reused.
+
+    Returns:
+        The packed paths and the log-probability of every path
+    """
+    paths = np.empty(len(data), dtype=np.int64)
+    log_probs = np.zeros(len(offsets) - 1)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            path, log_prob = calc_viterbi_log(
+                data[offsets[i] : offsets[i + 1]],
+                transition_log,
+                emission_log,
+                initial_log,
+                backpointers,
+            )
+            paths[offsets[i] : offsets[i + 1]] = path
+            log_probs[i] = log_prob
+    return paths, log_probs
+
+
+def viterbi(
+    data: NDArray | PackedSequences,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+) -> tuple[NDArray, float] | tuple[PackedSequences, NDArray]:
+    """Most likely hidden state path (maximum a posteriori) using Viterbi decoding.
+
+    Unlike ``reconstruct``, which picks the most likely state at every time step
+    independently, this returns the single most likely path. It takes one pass
+    over the data and stores only compact backpointers.
+
+    Args:
+        data: Observation sequence, or PackedSequences to decode many at once
+        transition: Transition matrix (left multiplication: P(X_i) * T)
+        emission: Emission matrix
+        initial: Initial probability vector
+
+    Returns:
+        The path and its joint log-probability. For PackedSequences the paths are
+        returned packed with the same offsets, with one log-probability per sequence
+    """
+    if isinstance(transition, SparseTransition):
+        transition = transition.to_dense()
+    transition_log, emission_log, initial_log = cast_log(transition, emission, initial)
+    dtype = backpointer_dtype(transition_log.shape[0])
+
+    if isinstance(data, PackedSequences):
+        max_length = int(data.lengths.max(initial=0))
+        backpointers = np.empty((max_length, transition_log.shape[0]), dtype=dtype)
+        paths, log_probs = calc_viterbi_log_packed(
+            data.data,
+            data.offsets,
+            transition_log,
+            emission_log,
+            initial_log,
+            backpointers,
+        )
+        return PackedSequences(paths, data.offsets), log_probs
+
+    backpointers = np.empty((len(data), transition_log.shape[0]), dtype=dtype)
+    path, log_prob = calc_viterbi_log(
+        data, transition_log, emission_log, initial_log, backpointers
+    )
+    return path, float(log_prob)
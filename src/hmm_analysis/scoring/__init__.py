@@ -0,0 +1,9 @@
+from .score import score, score_batch
+from .bank import ModelBank, score_models
+
+__all__ = [
+    "ModelBank",
+    "score",
+    "score_batch",
+    "score_models",
+]
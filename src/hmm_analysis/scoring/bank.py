@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hmm_analysis.baum_welch.core.step import BACKENDS
+from hmm_analysis.forward_backward import (
+    calc_bank_likelihood_log_rolling,
+    calc_bank_likelihood_scaled_rolling,
+    calc_symbol_table_log_into,
+    use_symbol_table,
+)
+from hmm_analysis.sparse import SparseTransition
+from hmm_analysis.sequences import PackedSequences, pack_sequences, schedule_workers
+from hmm_analysis.utils.casting import cast_dtype, cast_log, resolve_dtype
+import numpy as np
+from numba import jit, prange
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class ModelBank:
+    """Many HMMs with the same numbers of states and symbols, stacked.
+
+    Model ``k`` is ``(transitions[k], emissions[k], initials[k])``. The stacked
+    arrays are handed to the kernels as they are, which advance all models
+    together over every observation, see ``score_models``.
+
+    Attributes:
+        transitions: (K, N, N) transition matrices
+        emissions: (K, N, M) emission matrices
+        initials: (K, N) initial probability vectors
+    """
+
+    transitions: NDArray
+    emissions: NDArray
+    initials: NDArray
+
+    def __post_init__(self):
+        transitions = np.ascontiguousarray(self.transitions, dtype=np.float64)
+        emissions = np.ascontiguousarray(self.emissions, dtype=np.float64)
+        initials = np.ascontiguousarray(self.initials, dtype=np.float64)
+        if transitions.ndim != 3 or emissions.ndim != 3 or initials.ndim != 2:
+            raise ValueError(
+                "transitions, emissions and initials must be 3-D, 3-D and 2-D arrays"
+            )
+        n_models, n_states = initials.shape
+        if (
+            transitions.shape != (n_models, n_states, n_states)
+            or emissions.shape[:2] != (n_models, n_states)
+            or n_models == 0
+        ):
+            raise ValueError(
+                "expected (K, N, N) transitions, (K, N, M) emissions and (K, N) "
+                "initials for K > 0 models"
+            )
+        object.__setattr__(self, "transitions", transitions)
+        object.__setattr__(self, "emissions", emissions)
+        object.__setattr__(self, "initials", initials)
+
+    @classmethod
+    def from_models(cls, models) -> ModelBank:
+        """Stack (transition, emission, initial) tuples or BaumWelchResults."""
+        parameters = []
+        for model in models:
+            if not isinstance(model, tuple):
+                model = (model.transition, model.emission, model.initial)
+            transition, emission, initial = model
+            if isinstance(transition, SparseTransition):
+                transition = transition.to_dense()
+            parameters.append((transition, emission, initial))
+        if not parameters:
+            raise ValueError("a model bank needs at least one model")
+        if len({np.shape(emission) for _, emission, _ in parameters}) > 1:
+            raise ValueError(
+                "all models must have the same numbers of states and symbols"
+            )
+        return cls(*(np.stack(arrays) for arrays in zip(*parameters)))
+
+    @property
+    def n_states(self) -> int:
+        return self.initials.shape[1]
+
+    @property
+    def n_symbols(self) -> int:
+        return self.emissions.shape[2]
+
+    def __len__(self) -> int:
+        return len(self.initials)
+
+    def __getitem__(self, k: int) -> tuple[NDArray, NDArray, NDArray]:
+        return self.transitions[k], self.emissions[k], self.initials[k]
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def score_models_log_parallel(
+    data,
+    offsets,
+    transitions_log,
+    emissions_log,
+    initials_log,
+    tables,
+    schedule,
+    worker_offsets,
+):
+    # every worker writes the rows of its own sequences
+    scores = np.zeros((len(offsets) - 1, len(initials_log)))
+    for w in prange(len(worker_offsets) - 1):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            scores[i] = calc_bank_likelihood_log_rolling(
+                data[offsets[i] : offsets[i + 1]],
+                transitions_log,
+                emissions_log,
+                initials_log,
+                tables,
+            )
+    return scores
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def score_models_scaled_parallel(
+    data, offsets, transitions, emissions, initials, schedule, worker_offsets
+):
+    # every worker writes the rows of its own sequences
+    scores = np.zeros((len(offsets) - 1, len(initials)))
+    for w in prange(len(worker_offsets) - 1):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            scores[i] = calc_bank_likelihood_scaled_rolling(
+                data[offsets[i] : offsets[i + 1]], transitions, emissions, initials
+            )
+    return scores
+
+
+def prepare_bank_parameters(
+    bank: ModelBank,
+    backend: str = "log",
+    dtype=np.float64,
+    n_observations: int | None = None,
+) -> tuple:
+    """``prepare_parameters`` for a model bank.
+
+    The log backend builds the (M, K, N, N) symbol tables of all models when
+    they fit into ``SYMBOL_TABLE_MAX_BYTES`` together and, given
+    ``n_observations``, there are at least as many observations as symbols.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    dtype = resolve_dtype(dtype)
+    if backend == "scaled":
+        return tuple(cast_dtype(dtype, bank.transitions, bank.emissions, bank.initials))
+
+    transitions_log, emissions_log, initials_log = cast_dtype(
+        dtype, *cast_log(bank.transitions, bank.emissions, bank.initials)
+    )
+    n_models, n_states, n_symbols = len(bank), bank.n_states, bank.n_symbols
+    # the K tables of M (N, N) matrices share the budget of a single table
+    fits = use_symbol_table(n_states, n_models * n_symbols, transitions_log.itemsize)
+    n_table = n_symbols
+    if not fits or (n_observations is not None and n_observations < n_symbols):
+        n_table = 0
+    # symbol first, a step of all models reads one contiguous (K, N, N) block
+    tables = np.empty((n_table, n_models, n_states, n_states), dtype=dtype)
+    if n_table:
+        for k in range(n_models):
+            calc_symbol_table_log_into(
+                transitions_log[k], emissions_log[k], tables[:, k]
+            )
+    return transitions_log, emissions_log, initials_log, tables
+
+
+def score_models(
+    sequences: list[NDArray] | NDArray | PackedSequences,
+    bank: ModelBank,
+    backend: str = "log",
+    dtype=np.float64,
+) -> NDArray:
+    """Log-likelihood of every sequence under every model of a bank.
+
+    The sequences are scored in parallel, longest first. Each is read once: one
+    forward recursion advances all models of the bank together, with the
+    rolling O(K * N) messages of ``score``.
+
+    Args:
+        sequences: List of observation sequences, a 2-D array or PackedSequences
+        bank: The models, see ``ModelBank``
+        backend: Forward engine, "log" (default) or "scaled"
+        dtype: np.float64 (default) or np.float32 for the parameters and the
+            messages, the log-likelihoods are accumulated in float64
+
+    Returns:
+        (n_sequences, K) log-likelihoods, e.g. ``scores.argmax(axis=1)`` picks
+        the most likely model of every sequence
+
+    Example:
+        bank = ModelBank.from_models(results)
+        labels = score_models(sequences, bank).argmax(axis=1)
+    """
+    packed = pack_sequences(sequences)
+    parameters = prepare_bank_parameters(bank, backend, dtype, len(packed.data))
+    schedule, worker_offsets = schedule_workers(packed.offsets)
+
+    kernel = (
+        score_models_log_parallel if backend == "log" else score_models_scaled_parallel
+    )
+    return kernel(packed.data, packed.offsets, *parameters, schedule, worker_offsets)
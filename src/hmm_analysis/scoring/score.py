@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from hmm_analysis.baum_welch.core.step import BACKENDS
+from hmm_analysis.forward_backward import (
+    calc_likelihood_log_rolling,
+    calc_likelihood_scaled_rolling,
+    prepare_symbol_table_log,
+)
+from hmm_analysis.sparse import SparseTransition
+from hmm_analysis.sequences import PackedSequences, pack_sequences, schedule_workers
+from hmm_analysis.utils.casting import cast_dtype, cast_log, resolve_dtype
+import numpy as np
+from numba import jit, prange
+from numpy.typing import NDArray
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def score_log_parallel(
+    data,
+    offsets,
+    transition_log,
+    emission_log,
+    initial_log,
+    table,
+    schedule,
+    worker_offsets,
+):
+    # every worker writes the scores of its own sequences
+    scores = np.zeros(len(offsets) - 1)
+    for w in prange(len(worker_offsets) - 1):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            scores[i] = calc_likelihood_log_rolling(
+                data[offsets[i] : offsets[i + 1]],
+                transition_log,
+                emission_log,
+                initial_log,
+                table,
+            )
+    return scores
+
+
+@jit(nopython=True, fastmath=True, cache=True, parallel=True)
+def score_scaled_parallel(
+    data, offsets, transition, emission, initial, schedule, worker_offsets
+):
+    # every worker writes the scores of its own sequences
+    scores = np.zeros(len(offsets) - 1)
+    for w in prange(len(worker_offsets) - 1):
+        for k in range(worker_offsets[w], worker_offsets[w + 1]):
+            i = schedule[k]
+            scores[i] = calc_likelihood_scaled_rolling(
+                data[offsets[i] : offsets[i + 1]], transition, emission, initial
+            )
+    return scores
+
+
+def prepare_parameters(
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    backend: str = "log",
+    dtype=np.float64,
+    n_observations: int | None = None,
+) -> tuple:
+    """Parameters in the form the scoring kernels take, computed once.
+
+    For the log backend these are the log parameters followed by the
+    ``prepare_symbol_table_log`` table for ``n_observations`` observations.
+
+    Returns:
+        (transition_log, emission_log, initial_log, table) for "log",
+        (transition, emission, initial) for "scaled"
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    dtype = resolve_dtype(dtype)
+
+    if isinstance(transition, SparseTransition):
+        transition = transition.to_dense()
+    transition, emission, initial = (
+        np.asarray(param) for param in (transition, emission, initial)
+    )
+    if backend == "scaled":
+        return tuple(cast_dtype(dtype, transition, emission, initial))
+
+    transition_log, emission_log, initial_log = cast_dtype(
+        dtype, *cast_log(transition, emission, initial)
+    )
+    table = prepare_symbol_table_log(transition_log, emission_log, n_observations)
+    return transition_log, emission_log, initial_log, table
+
+
+def score(
+    data: NDArray,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    backend: str = "log",
+    dtype=np.float64,
+) -> float:
+    """Log-likelihood of an observation sequence.
+
+    Runs the forward recursion alone and keeps only the current message, so it
+    costs about half of ``get_forward_backward_likelihood_log`` and O(N) memory.
+
+    Args:
+        data: Observation sequence
+        transition: Transition matrix (left multiplication: P(X_i) * T), or a
+            SparseTransition
+        emission: Emission matrix
+        initial: Initial probability vector
+        backend: Forward engine, "log" (default) or "scaled"
+        dtype: Floating point type of the parameters and of the forward
+            message, np.float64 (default) or np.float32. The log-likelihood
+            is accumulated in float64
+
+    Returns:
+        The log-likelihood of the sequence, 0 for an empty sequence
+    """
+    data = np.asarray(data)
+    parameters = prepare_parameters(
+        transition, emission, initial, backend, dtype, len(data)
+    )
+    if backend == "log":
+        return calc_likelihood_log_rolling(data, *parameters)
+    return calc_likelihood_scaled_rolling(data, *parameters)
+
+
+def score_batch(
+    sequences: list[NDArray] | NDArray | PackedSequences,
+    transition: NDArray,
+    emission: NDArray,
+    initial: NDArray,
+    backend: str = "log",
+    dtype=np.float64,
+) -> NDArray:
+    """Log-likelihoods of many sequences, scored in parallel.
+
+    The parameters are prepared once and all sequences are scored inside one
+    compiled call, spread across threads longest sequence first, each with the
+    forward recursion of ``score``.
+
+    Args:
+        sequences: List of observation sequences, a 2-D array or PackedSequences
+        transition: Transition matrix (left multiplication: P(X_i) * T), or a
+            SparseTransition
+        emission: Emission matrix
+        initial: Initial probability vector
+        backend: Forward engine, "log" (default) or "scaled"
+        dtype: np.float64 (default) or np.float32, see ``score``
+
+    Returns:
+        The log-likelihood of every sequence, 0 for empty sequences
+    """
+    packed = pack_sequences(sequences)
+    parameters = prepare_parameters(
+        transition, emission, initial, backend, dtype, len(packed.data)
+    )
+    schedule, worker_offsets = schedule_workers(packed.offsets)
+
+    kernel = score_log_parallel if backend == "log" else score_scaled_parallel
+    return kernel(packed.data, packed.offsets, *parameters, schedule, worker_offsets)
@@ -0,0 +1,18 @@
+from .packed import PackedSequences, pack_sequences
+from .scheduling import (
+    schedule_chunks,
+    schedule_longest_first,
+    schedule_workers,
+    split_chunks,
+)
+from .store import SequenceStore
+
+__all__ = [
+    "PackedSequences",
+    "SequenceStore",
+    "pack_sequences",
+    "schedule_chunks",
+    "schedule_longest_first",
+    "schedule_workers",
+    "split_chunks",
+]
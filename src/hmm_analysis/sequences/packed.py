@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class PackedSequences:
+    """Many observation sequences stored in one contiguous buffer.
+
+    Sequence ``i`` is ``data[offsets[i]:offsets[i + 1]]``. The two arrays are
+    passed to the JIT kernels as they are, so a corpus of millions of short
+    sequences costs no per-sequence Python objects.
+
+    Attributes:
+        data: Flat observation buffer of all sequences one after the other
+        offsets: int64 array of length n_sequences + 1, starting at 0 and
+            ending at len(data)
+    """
+
+    data: NDArray
+    offsets: NDArray
+
+    def __post_init__(self):
+        data = np.ascontiguousarray(self.data)
+        offsets = np.ascontiguousarray(self.offsets, dtype=np.int64)
+        if data.ndim != 1 or offsets.ndim != 1 or len(offsets) == 0:
+            raise ValueError("data and offsets must be non-empty 1-D arrays")
+        if offsets[0] != 0 or offsets[-1] != len(data):
+            raise ValueError("offsets must start at 0 and end at len(data)")
+        if np.any(np.diff(offsets) < 0):
+            raise ValueError("offsets must be non-decreasing")
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "offsets", offsets)
+
+    @classmethod
+    def from_sequences(cls, sequences) -> PackedSequences:
+        """Pack a list of 1-D arrays (one copy) or a 2-D array (no copy)."""
+        if isinstance(sequences, np.ndarray) and sequences.ndim == 2:
+            n_sequences, length = sequences.shape
+            offsets = np.arange(n_sequences + 1, dtype=np.int64) * length
+            return cls(np.ascontiguousarray(sequences).reshape(-1), offsets)
+
+        sequences = [np.asarray(sequence) for sequence in sequences]
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(sequence) for sequence in sequences])
+        if not sequences:
+            return cls(np.empty(0, dtype=np.int64), offsets)
+        return cls(np.concatenate(sequences), offsets)
+
+    @property
+    def lengths(self) -> NDArray:
+        return np.diff(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> NDArray:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("sequence index out of range")
+        return self.data[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def pack_sequences(sequences) -> PackedSequences:
+    """Return ``sequences`` as PackedSequences, packing lists and 2-D arrays."""
+    if isinstance(sequences, PackedSequences):
+        return sequences
+    return PackedSequences.from_sequences(sequences)
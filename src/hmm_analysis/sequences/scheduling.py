@@ -0,0 +1,55 @@
+import numpy as np
+from numba import get_num_threads, jit
+from numpy.typing import NDArray
+
+
+@jit(nopython=True, cache=True)
+def schedule_longest_first(offsets: NDArray, n_workers: int):
+    """Greedy longest-processing-time assignment of sequences to workers.
+
+    Sequences (given by their packed ``offsets``) are handed out longest first,
+    each to the currently least loaded worker. Returns the sequence indices
+    grouped by worker together with the offsets of every worker's group, i.e.
+    worker w processes schedule[worker_offsets[w]:worker_offsets[w + 1]].
+    """
+    n_sequences = len(offsets) - 1
+    lengths = offsets[1:] - offsets[:-1]
+    order = np.argsort(-lengths, kind="mergesort")
+
+    loads = np.zeros(n_workers, dtype=np.int64)
+    owner = np.empty(n_sequences, dtype=np.int64)
+    worker_offsets = np.zeros(n_workers + 1, dtype=np.int64)
+    for i in order:
+        w = np.argmin(loads)
+        owner[i] = w
+        loads[w] += lengths[i]
+        worker_offsets[w + 1] += 1
+    worker_offsets = np.cumsum(worker_offsets)
+
+    schedule = np.empty(n_sequences, dtype=np.int64)
+    fill = worker_offsets[:-1].copy()
+    for i in order:
+        schedule[fill[owner[i]]] = i
+        fill[owner[i]] += 1
+    return schedule, worker_offsets
+
+
+def schedule_workers(offsets: NDArray):
+    """``schedule_longest_first`` over the threads numba will run with."""
+    n_workers = max(min(get_num_threads(), len(offsets) - 1), 1)
+    return schedule_longest_first(offsets, n_workers)
+
+
+def split_chunks(length: int, n_chunks: int) -> NDArray:
+    """Offsets of ``n_chunks`` near-equal chunks of the transitions of a sequence.
+
+    Chunk c covers the time steps chunk_offsets[c]:chunk_offsets[c + 1], the first
+    observation (t = 0) is not part of any chunk.
+    """
+    n_chunks = max(min(n_chunks, length - 1), 1)
+    return np.linspace(1, max(length, 1), n_chunks + 1).astype(np.int64)
+
+
+def schedule_chunks(length: int) -> NDArray:
+    """``split_chunks`` over the threads numba will run with."""
+    return split_chunks(length, get_num_threads())
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import itertools
+import json
+import mmap
+import os
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+from .packed import PackedSequences
+
+OBSERVATIONS_FILE = "observations.bin"
+OFFSETS_FILE = "offsets.npy"
+HEADER_FILE = "store.json"
+STORE_VERSION = 1
+
+# default number of observations read into memory at once
+DEFAULT_CHUNK_SIZE = 2**24
+
+
+class SequenceStore:
+    """Packed observation sequences on disk, read in bounded chunks.
+
+    A store is a directory holding the observations of all sequences one after
+    the other as raw integers (``observations.bin``), their int64 offsets
+    (``offsets.npy``, sequence ``i`` is ``observations[offsets[i]:offsets[i + 1]]``)
+    and a small JSON header with the integer type. The observations are memory
+    mapped, only the offsets are loaded.
+
+    Passed to ``baum_welch`` a store is trained on out of core: every iteration
+    streams the corpus in file order, ``chunk_size`` observations at a time,
+    through the E-step. The memory of an iteration is the chunk buffer plus the
+    messages of the longest sequence, whatever the size of the corpus.
+
+    Args:
+        path: Directory written by ``SequenceStore.write``
+        chunk_size: Maximal number of observations per chunk, a longer sequence
+            is read as a chunk of its own
+
+    Example:
+        store = SequenceStore.write("corpus", sequences, dtype=np.uint16)
+        result = baum_welch(store, transition, emission, initial, niters=50)
+    """
+
+    def __init__(self, path: str | os.PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+
+        header = json.loads((self.path / HEADER_FILE).read_text())
+        if header.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"Unsupported sequence store version {header.get('version')}"
+            )
+        self.dtype = np.dtype(header["dtype"])
+        self.offsets = np.load(self.path / OFFSETS_FILE)
+        self.data = self._map_observations()
+        if len(self.data) != self.offsets[-1]:
+            raise ValueError("the observations file does not match the offsets")
+
+    def _map_observations(self) -> NDArray:
+        path = self.path / OBSERVATIONS_FILE
+        if path.stat().st_size == 0:
+            return np.empty(0, dtype=self.dtype)
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            # chunks are read front to back, let the kernel read ahead
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return np.frombuffer(mapped, dtype=self.dtype)
+
+    @classmethod
+    def write(
+        cls,
+        path: str | os.PathLike,
+        sequences,
+        dtype=np.int64,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> SequenceStore:
+        """Write ``sequences`` to a new store at ``path``.
+
+        The sequences are appended one at a time, so any iterable works,
+        including a generator reading another source. A narrow ``dtype`` such as
+        np.uint8 or np.uint16 cuts the size of the file and the reads of every
+        iteration.
+
+        Returns:
+            The store, opened with ``chunk_size``
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind not in "iu":
+            raise ValueError(f"Unsupported dtype {dtype}, expected an integer type")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        lengths = []
+        with open(path / OBSERVATIONS_FILE, "wb") as f:
+            for sequence in sequences:
+                sequence = np.asarray(sequence)
+                if sequence.ndim != 1:
+                    raise ValueError("every sequence must be a 1-D array")
+                if len(sequence) and (
+                    sequence.min() < 0 or sequence.max() > np.iinfo(dtype).max
+                ):
+                    raise ValueError(f"observations do not fit into {dtype}")
+                f.write(sequence.astype(dtype, copy=False).tobytes())
+                lengths.append(len(sequence))
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        np.save(path / OFFSETS_FILE, offsets)
+        (path / HEADER_FILE).write_text(
+            json.dumps({"version": STORE_VERSION, "dtype": dtype.str})
+        )
+        return cls(path, chunk_size)
+
+    @property
+    def lengths(self) -> NDArray:
+        return np.diff(self.offsets)
+
+    @property
+    def n_observations(self) -> int:
+        return int(self.offsets[-1])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> NDArray:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("sequence index out of range")
+        return self.data[self.offsets[i] : self.offsets[i + 1]]
+
+    def chunk_bounds(self) -> NDArray:
+        """Sequence indices splitting the store into chunks.
+
+        Chunk c holds sequences bounds[c]:bounds[c + 1], consecutive sequences of
+        at most ``chunk_size`` observations in total, or a single longer one.
+        """
+        bounds = [0]
+        while bounds[-1] < len(self):
+            start = bounds[-1]
+            limit = self.offsets[start] + self.chunk_size
+            stop = int(np.searchsorted(self.offsets, limit, side="right")) - 1
+            bounds.append(max(stop, start + 1))
+        return np.array(bounds, dtype=np.int64)
+
+    def chunks(self):
+        """Read the store front to back, one chunk at a time.
+
+        The chunks share one in-memory buffer, a chunk is only valid until the
+        next one is read.
+
+        Yields:
+            The index of the first sequence of the chunk and the chunk as
+            PackedSequences
+        """
+        bounds = self.chunk_bounds()
+        buffer = np.empty(min(self.chunk_size, self.n_observations), dtype=self.dtype)
+        for start, stop in itertools.pairwise(bounds):
+            first, last = self.offsets[start], self.offsets[stop]
+            if last - first > len(buffer):
+                # a single sequence longer than the chunk size
+                data = np.array(self.data[first:last])
+            else:
+                data = buffer[: last - first]
+                data[:] = self.data[first:last]
+            yield (
+                int(start),
+                PackedSequences(data, self.offsets[start : stop + 1] - first),
+            )
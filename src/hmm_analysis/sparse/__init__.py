@@ -0,0 +1,3 @@
+from .transition import SparseTransition
+
+__all__ = ["SparseTransition"]
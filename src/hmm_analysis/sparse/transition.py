@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class SparseTransition:
+    """Transition matrix storing only the allowed transitions, in CSR layout.
+
+    The allowed transitions of state ``i`` are ``indices[indptr[i]:indptr[i + 1]]``
+    with probabilities ``values[indptr[i]:indptr[i + 1]]``. The kernels do work
+    proportional to the number of stored entries instead of N^2, and Baum-Welch
+    re-estimates only the stored entries, so the structure is kept.
+
+    Attributes:
+        indptr: int64 array of length n_states + 1, starting at 0
+        indices: int64 destination state of every stored transition
+        values: Probability (or log-probability) of every stored transition
+    """
+
+    indptr: NDArray
+    indices: NDArray
+    values: NDArray
+
+    def __post_init__(self):
+        indptr = np.ascontiguousarray(self.indptr, dtype=np.int64)
+        indices = np.ascontiguousarray(self.indices, dtype=np.int64)
+        values = np.ascontiguousarray(self.values, dtype=np.float64)
+        if indptr.ndim != 1 or len(indptr) < 2:
+            raise ValueError("indptr must be a 1-D array of length n_states + 1")
+        if indptr[0] != 0 or indptr[-1] != len(indices) or len(values) != len(indices):
+            raise ValueError(
+                "indptr must start at 0 and end at len(indices) == len(values)"
+            )
+        if np.any(np.diff(indptr) < 0):
+            raise ValueError("indptr must be non-decreasing")
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(indptr) - 1):
+            raise ValueError("indices must be valid state indices")
+        object.__setattr__(self, "indptr", indptr)
+        object.__setattr__(self, "indices", indices)
+        object.__setattr__(self, "values", values)
+
+    @classmethod
+    def from_dense(cls, transition: NDArray) -> SparseTransition:
+        """Keep the non-zero entries of a dense transition matrix."""
+        transition = np.asarray(transition)
+        rows, indices = np.nonzero(transition)
+        indptr = np.zeros(transition.shape[0] + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(rows, minlength=transition.shape[0]))
+        return cls(indptr, indices, transition[rows, indices])
+
+    @classmethod
+    def banded(cls, n_states: int, lower: int = 0, upper: int = 1) -> SparseTransition:
+        """Uniform transitions from state i to states i - lower, ..., i + upper.
+
+        ``lower=0, upper=1`` is the left-right topology.
+        """
+        if lower < 0 or upper < 0:
+            raise ValueError("lower and upper must be non-negative")
+        starts = np.maximum(np.arange(n_states) - lower, 0)
+        stops = np.minimum(np.arange(n_states) + upper + 1, n_states)
+        indptr = np.zeros(n_states + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(stops - starts)
+        indices = np.concatenate(
+            [np.arange(start, stop) for start, stop in zip(starts, stops)]
+        )
+        values = np.repeat(1 / (stops - starts), stops - starts)
+        return cls(indptr, indices, values)
+
+    @property
+    def n_states(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored (allowed) transitions."""
+        return len(self.indices)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.n_states, self.n_states
+
+    def with_values(self, values: NDArray) -> SparseTransition:
+        """Same structure with new values, e.g. log-probabilities."""
+        return SparseTransition(self.indptr, self.indices, values)
+
+    def to_dense(self, fill_value: float = 0.0) -> NDArray:
+        """Dense (N, N) matrix, ``fill_value`` for the transitions not stored."""
+        dense = np.full(self.shape, fill_value)
+        rows = np.repeat(np.arange(self.n_states), np.diff(self.indptr))
+        dense[rows, self.indices] = self.values
+        return dense
@@ -1,9 +1,32 @@
 import numpy as np
+from hmm_analysis.sparse import SparseTransition
+
+
+def _apply(func, elem):
+    # sparse transitions keep their structure, only the stored values are cast
+    if isinstance(elem, SparseTransition):
+        return elem.with_values(func(elem.values))
+    return func(elem)
 
 
 def cast_log(*args):
-    return [np.log(elem) for elem in args]
+    return [_apply(np.log, elem) for elem in args]
 
 
 def cast_exp(*args):
-    return [np.exp(elem) for elem in args]
+    return [_apply(np.exp, elem) for elem in args]
+
+
+DTYPES = (np.float32, np.float64)
+
+
+def resolve_dtype(dtype) -> np.dtype:
+    """Validate the floating point type of the kernel buffers."""
+    dtype = np.dtype(dtype)
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype}, expected float32 or float64")
+    return dtype
+
+
+def cast_dtype(dtype, *args):
+    return [elem.astype(dtype, copy=False) for elem in args]
@@ -33,13 +33,13 @@ def logsumexp_2d(m: NDArray):
     # handle empty array case - numba-safe checks
     if m.shape[0] == 0:
         # Return empty array with correct dtype
-        return np.empty(0, dtype=np.float64)
+        return np.empty(0, dtype=m.dtype)
     if m.shape[1] == 0:
         # Return array of -inf for each row when columns are empty
-        return np.full(m.shape[0], -np.inf)
+        return np.full(m.shape[0], -np.inf, dtype=m.dtype)
 
     # find maximum
-    result = np.empty(m.shape[0])
+    result = np.empty(m.shape[0], dtype=m.dtype)
     for i in range(m.shape[0]):
         result[i] = logsumexp_1d(m[i])
     return result
@@ -81,7 +81,7 @@ def logexpdot_vector_matrix(v: NDArray, m: NDArray):
 
 @jit(cache=True, nopython=True, fastmath=True)
 def logexpdot_matrix_matrix(a: NDArray, b: NDArray):
-    res = np.zeros((a.shape[0], b.shape[1]))
+    res = np.zeros((a.shape[0], b.shape[1]), dtype=a.dtype)
     b_t = b.T
     for i in range(a.shape[0]):
         res[i] = logexpdot_matrix_vector(b_t, a[i])
@@ -96,3 +96,52 @@ def logexpdot_matrix_matrix(a: NDArray, b: NDArray):
 #     a = np.array([[(5, 0), (1, 1)], [(0, 3), (0, 0)]])
 #     result = logsumexp_3d(a)
 #     print(result)
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def logexpdot_vector_sparse(
+    v: NDArray, indptr: NDArray, indices: NDArray, values_log: NDArray
+):
+    """
+    logexpdot_vector_matrix for a CSR matrix, out(j) = logsumexp_i(v(i) + m(i, j))
+    over the stored entries only: one pass for the maxima, one for the sums.
+    """
+    n = len(indptr) - 1
+    max_scalar = np.full(n, MINUS_INF, dtype=np.float64)
+    for i in range(n):
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            max_scalar[j] = max(max_scalar[j], v[i] + values_log[k])
+
+    total = np.zeros(n)
+    for i in range(n):
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            total[j] += np.exp(v[i] + values_log[k] - max_scalar[j])
+
+    result = np.empty(n, dtype=values_log.dtype)
+    for j in range(n):
+        result[j] = -np.inf if total[j] == 0 else max_scalar[j] + np.log(total[j])
+    return result
+
+
+@jit(cache=True, nopython=True, fastmath=True)
+def logexpdot_sparse_vector(
+    indptr: NDArray, indices: NDArray, values_log: NDArray, v: NDArray
+):
+    """
+    logexpdot_matrix_vector for a CSR matrix, out(i) = logsumexp_j(m(i, j) + v(j))
+    over the stored entries of row i.
+    """
+    n = len(indptr) - 1
+    result = np.empty(n, dtype=values_log.dtype)
+    for i in range(n):
+        max_scalar = MINUS_INF
+        for k in range(indptr[i], indptr[i + 1]):
+            max_scalar = max(max_scalar, values_log[k] + v[indices[k]])
+
+        total = 0.0
+        for k in range(indptr[i], indptr[i + 1]):
+            total += np.exp(values_log[k] + v[indices[k]] - max_scalar)
+        result[i] = -np.inf if total == 0 else max_scalar + np.log(total)
+    return result
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_model():
+    """The 2-state, 3-symbol (transition, emission, initial) the tests fit and decode."""
+    return (
+        np.array([[0.7, 0.3], [0.4, 0.6]]),
+        np.array([[0.5, 0.4, 0.1], [0.1, 0.3, 0.6]]),
+        np.array([0.6, 0.4]),
+    )
+
+
+@pytest.fixture
+def arrange_sequences():
+    """Uniform random observations of the 3 symbols of ``arrange_model``.
+
+    Returns:
+        A function of the sequence lengths and a seed returning one int64 array
+        per length
+    """
+
+    def sequences(lengths, seed=0):
+        rng = np.random.default_rng(seed)
+        return [rng.integers(0, 3, size=n) for n in lengths]
+
+    return sequences
+
+
+@pytest.fixture
+def arrange_sampler():
+    """Draws observations from a hidden Markov model.
+
+    Returns:
+        A function of (transition, emission, initial), a length and a numpy
+        Generator returning the int64 observations
+    """
+
+    def sample(transition, emission, initial, length, rng):
+        states = np.empty(length, dtype=np.int64)
+        states[0] = rng.choice(len(initial), p=initial)
+        for t in range(1, length):
+            states[t] = rng.choice(len(initial), p=transition[states[t - 1]])
+        u = rng.random(length)
+        return (u[:, None] > np.cumsum(emission[states], axis=1)).sum(axis=1)
+
+    return sample
@@ -0,0 +1,91 @@
+from hmm_analysis import ModelBank, baum_welch, score, score_models
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_bank():
+    rng = np.random.default_rng(25)
+    models = [
+        (
+            rng.dirichlet(np.ones(3), size=3),
+            rng.dirichlet(np.ones(4), size=3),
+            rng.dirichlet(np.ones(3)),
+        )
+        for _ in range(5)
+    ]
+    return models, ModelBank.from_models(models)
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(26)
+    return [rng.integers(0, 4, size=n) for n in (200, 2, 0, 75, 1000)]
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_score_models(arrange_bank, arrange_data, backend, dtype):
+    models, bank = arrange_bank
+    scores = score_models(arrange_data, bank, backend=backend, dtype=dtype)
+    expected = [[score(data, *model) for model in models] for data in arrange_data]
+
+    assert scores.shape == (len(arrange_data), len(models))
+    assert np.all(scores[2] == 0)
+    assert np.allclose(scores, expected, rtol=1e-4 if dtype == np.float32 else 1e-9)
+
+
+def test_score_models_without_symbol_tables(arrange_bank, arrange_data):
+    # fewer observations than symbols step with the transition matrices
+    models, bank = arrange_bank
+    scores = score_models([arrange_data[1]], bank)
+    expected = [score(arrange_data[1], *model, backend="scaled") for model in models]
+    assert np.allclose(scores[0], expected)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+def test_impossible_under_one_model(arrange_bank, backend):
+    models, _ = arrange_bank
+    # the last model never emits symbol 3
+    transition, emission, initial = models[-1]
+    emission = np.column_stack([emission[:, :3], np.zeros(3)])
+    emission /= emission.sum(axis=1, keepdims=True)
+    models = [*models[:-1], (transition, emission, initial)]
+    sequences = [np.array([3, 0, 1, 2]), np.array([0, 1, 3, 2, 0]), np.array([0, 1])]
+
+    scores = score_models(sequences, ModelBank.from_models(models), backend=backend)
+    assert np.all(scores[:2, -1] == -np.inf)
+    assert np.all(np.isfinite(scores[:2, :-1])) and np.all(np.isfinite(scores[2]))
+    expected = [[score(data, *model) for model in models] for data in sequences]
+    assert np.allclose(scores, expected)
+
+
+def test_classify(arrange_bank):
+    models, _ = arrange_bank
+    rng = np.random.default_rng(27)
+    # every model is fitted to its own data, the sequences then pick their model
+    sequences, results = [], []
+    for transition, emission, initial in models[:2]:
+        states = [rng.choice(3, p=initial)]
+        for _ in range(2999):
+            states.append(rng.choice(3, p=transition[states[-1]]))
+        data = np.array([rng.choice(4, p=emission[state]) for state in states])
+        sequences.append(data)
+        results.append(
+            baum_welch(data, transition, emission, initial, 3, tqdm_on=False)
+        )
+
+    bank = ModelBank.from_models(results)
+    assert len(bank) == 2 and bank.n_states == 3 and bank.n_symbols == 4
+    assert np.array_equal(score_models(sequences, bank).argmax(axis=1), [0, 1])
+
+
+def test_invalid_bank(arrange_bank):
+    models, _ = arrange_bank
+    transition, emission, initial = models[0]
+    with pytest.raises(ValueError):
+        ModelBank.from_models([])
+    with pytest.raises(ValueError):
+        ModelBank.from_models([models[0], (transition, emission[:, :3], initial)])
+    with pytest.raises(ValueError):
+        ModelBank(transition, emission, initial)
@@ -0,0 +1,29 @@
+from hmm_analysis import reconstruct, reconstruct_batch, viterbi, viterbi_batch
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((40, 7, 120, 1, 60, 2), seed=0)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+def test_reconstruct_batch(arrange_model, arrange_data, backend):
+    transition, emission, initial = arrange_model
+    result = reconstruct_batch(arrange_data, transition, emission, initial, backend)
+
+    assert len(result) == len(arrange_data)
+    for sequence, states in zip(arrange_data, result):
+        expected = reconstruct(sequence, transition, emission, initial)
+        assert np.all(expected == states)
+
+
+def test_viterbi_batch(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    paths, log_probs = viterbi_batch(arrange_data, transition, emission, initial)
+
+    for sequence, batch_path, batch_log_prob in zip(arrange_data, paths, log_probs):
+        path, log_prob = viterbi(sequence, transition, emission, initial)
+        assert np.all(path == batch_path)
+        assert np.isclose(log_prob, batch_log_prob)
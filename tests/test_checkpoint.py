@@ -0,0 +1,100 @@
+from hmm_analysis import baum_welch, reconstruct
+from hmm_analysis.baum_welch.estimations import (
+    allocate_statistics,
+    accumulate_statistics_log,
+    accumulate_statistics_log_checkpointed,
+)
+from hmm_analysis.forward_backward import resolve_checkpoint_interval
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(3)
+    transition = rng.dirichlet(np.ones(3) * 3, size=3)
+    emission = rng.dirichlet(np.ones(4), size=3)
+    initial = rng.dirichlet(np.ones(3))
+    data = rng.integers(0, 4, size=257)
+    return data, transition, emission, initial
+
+
+@pytest.mark.parametrize("interval", [1, 2, 16, 17, 257, 1000])
+def test_accumulate_statistics_log_checkpointed(arrange_data, interval):
+    data, transition, emission, initial = arrange_data
+    parameters_log = [np.log(x) for x in (transition, emission, initial)]
+
+    expected = allocate_statistics(3, 4)
+    expected_norm = accumulate_statistics_log(data, *parameters_log, *expected)
+    result = allocate_statistics(3, 4)
+    norm = accumulate_statistics_log_checkpointed(
+        data, *parameters_log, interval, *result
+    )
+
+    assert np.isclose(expected_norm, norm)
+    for expected_acc, result_acc in zip(expected, result):
+        assert np.allclose(expected_acc, result_acc)
+
+
+def test_baum_welch_checkpointed(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    expected = baum_welch(data, transition, emission, initial, 5, tqdm_on=False)
+    result = baum_welch(
+        data,
+        transition,
+        emission,
+        initial,
+        5,
+        tqdm_on=False,
+        checkpoint_interval="sqrt",
+    )
+
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+
+
+@pytest.mark.parametrize("interval", [1, 10, "sqrt"])
+def test_reconstruct_checkpointed(arrange_data, interval):
+    data, transition, emission, initial = arrange_data
+
+    expected = reconstruct(data, transition, emission, initial)
+    result = reconstruct(
+        data, transition, emission, initial, checkpoint_interval=interval
+    )
+
+    assert np.array_equal(expected, result)
+
+
+def test_resolve_checkpoint_interval():
+    assert resolve_checkpoint_interval(100, "sqrt") == 10
+    assert resolve_checkpoint_interval(101, "sqrt") == 11
+    assert resolve_checkpoint_interval(100, None) == 100
+    assert resolve_checkpoint_interval(100, 7) == 7
+
+    with pytest.raises(ValueError):
+        resolve_checkpoint_interval(100, 0)
+    with pytest.raises(ValueError):
+        resolve_checkpoint_interval(100, "log")
+
+
+def test_checkpoint_interval_requires_single_log_sequence(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    with pytest.raises(ValueError):
+        reconstruct(
+            data, transition, emission, initial, backend="scaled", checkpoint_interval=4
+        )
+    with pytest.raises(ValueError):
+        baum_welch(
+            [data, data],
+            transition,
+            emission,
+            initial,
+            1,
+            tqdm_on=False,
+            multi_sequence=True,
+            checkpoint_interval=4,
+        )
@@ -0,0 +1,108 @@
+from hmm_analysis import ConvergenceMonitor, baum_welch, pack_sequences
+from hmm_analysis.forward_backward import get_forward_backward_likelihood_log
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((40, 7, 120, 15), seed=5)
+
+
+def test_monitor_tolerances():
+    monitor = ConvergenceMonitor(tol=0.5, patience=2)
+    assert not monitor.update(-10.0)
+    assert not monitor.update(-9.0)
+    assert not monitor.update(-8.8)
+    assert not monitor.update(-7.0)
+    assert not monitor.update(-6.9)
+    assert monitor.update(-6.8)
+    assert monitor.stop_reason == "tol"
+    assert monitor.n_iter == 6
+    assert np.allclose(monitor.history, [-10.0, -9.0, -8.8, -7.0, -6.9, -6.8])
+
+    monitor = ConvergenceMonitor(rtol=1e-3)
+    assert not monitor.update(-1000.0)
+    assert monitor.update(-999.5)
+    assert monitor.stop_reason == "rtol"
+
+    monitor = ConvergenceMonitor()
+    for i in range(40):
+        assert not monitor.update(-1.0)
+    monitor.exhausted()
+    assert monitor.stop_reason == "niters" and len(monitor.history) == 40
+
+
+def test_monitor_invalid_arguments():
+    with pytest.raises(ValueError):
+        ConvergenceMonitor(tol=-1.0)
+    with pytest.raises(ValueError):
+        ConvergenceMonitor(patience=0)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+@pytest.mark.parametrize("parallel", [False, True])
+def test_sequence_likelihoods(arrange_model, arrange_data, backend, parallel):
+    transition, emission, initial = arrange_model
+    result = baum_welch(
+        arrange_data,
+        transition,
+        emission,
+        initial,
+        1,
+        tqdm_on=False,
+        multi_sequence=True,
+        backend=backend,
+        parallel=parallel,
+    )
+
+    expected = [
+        get_forward_backward_likelihood_log(
+            sequence, np.log(initial), np.log(transition), np.log(emission)
+        )[2]
+        for sequence in arrange_data
+    ]
+    assert np.allclose(result.sequence_likelihoods_log, expected)
+    assert np.isclose(result.likelihood_log, np.sum(expected))
+
+
+def test_baum_welch_early_stopping(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    packed = pack_sequences(arrange_data)
+    full = baum_welch(packed, transition, emission, initial, 60, tqdm_on=False)
+    assert full.n_iter == 60 and not full.converged
+    assert full.stop_reason == "niters"
+    assert np.all(np.diff(full.likelihood_history) > -1e-8)
+
+    result = baum_welch(
+        packed, transition, emission, initial, 60, tqdm_on=False, tol=1e-2
+    )
+    assert result.converged and result.stop_reason == "tol"
+    assert result.n_iter < 60
+    assert np.allclose(
+        result.likelihood_history, full.likelihood_history[: result.n_iter]
+    )
+    assert abs(result.likelihood_history[-1] - result.likelihood_history[-2]) <= 1e-2
+
+
+def test_early_stopping_closes_progress_bar(arrange_model, arrange_data, monkeypatch):
+    transition, emission, initial = arrange_model
+    import tqdm
+
+    bars = []
+
+    class RecordingTqdm(tqdm.tqdm):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, disable=True, **kwargs)
+            self.closed = False
+            bars.append(self)
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    monkeypatch.setattr(tqdm, "tqdm", RecordingTqdm)
+    packed = pack_sequences(arrange_data)
+    result = baum_welch(packed, transition, emission, initial, 60, tol=1e-2)
+    assert result.converged and result.n_iter < 60
+    assert len(bars) == 1 and bars[0].closed
@@ -0,0 +1,119 @@
+from hmm_analysis import SparseTransition, baum_welch, reconstruct
+from hmm_analysis.baum_welch.estimations import (
+    accumulate_statistics_log,
+    allocate_statistics,
+)
+from hmm_analysis.forward_backward import calc_backward_log, calc_forward_log
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((400,), seed=6)[0]
+
+
+def test_float32_buffers(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    parameters_log = [
+        np.log(x).astype(np.float32) for x in (transition, emission, initial)
+    ]
+
+    forward_log = calc_forward_log(arrange_data, *parameters_log)
+    backward_log = calc_backward_log(arrange_data, *parameters_log[:2])
+    assert forward_log.dtype == np.float32 and backward_log.dtype == np.float32
+
+    expected_forward_log = calc_forward_log(
+        arrange_data, *(np.log(x) for x in (transition, emission, initial))
+    )
+    assert np.allclose(forward_log, expected_forward_log, rtol=1e-5)
+
+
+def test_float32_accumulation(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    parameters_log = [np.log(x) for x in (transition, emission, initial)]
+    expected = allocate_statistics(2, 3)
+    expected_norm = accumulate_statistics_log(arrange_data, *parameters_log, *expected)
+
+    # the expected counts stay float64 while the messages are float32
+    result = allocate_statistics(2, 3)
+    norm = accumulate_statistics_log(
+        arrange_data, *(x.astype(np.float32) for x in parameters_log), *result
+    )
+    assert np.isclose(expected_norm, norm, rtol=1e-5)
+    for expected_acc, result_acc in zip(expected, result):
+        assert result_acc.dtype == np.float64
+        assert np.allclose(expected_acc, result_acc, rtol=1e-3)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [dict(), dict(backend="scaled"), dict(parallel=True), dict(checkpoint_interval=20)],
+)
+def test_baum_welch_float32(arrange_model, arrange_data, kwargs):
+    transition, emission, initial = arrange_model
+    expected = baum_welch(
+        arrange_data, transition, emission, initial, 5, tqdm_on=False, **kwargs
+    )
+    result = baum_welch(
+        arrange_data,
+        transition,
+        emission,
+        initial,
+        5,
+        tqdm_on=False,
+        dtype=np.float32,
+        **kwargs,
+    )
+
+    assert result.transition.dtype == np.float32
+    assert np.isclose(expected.likelihood_log, result.likelihood_log, rtol=1e-5)
+    assert np.allclose(expected.transition, result.transition, atol=1e-4)
+    assert np.allclose(expected.emission, result.emission, atol=1e-4)
+
+
+@pytest.mark.parametrize("kwargs", [dict(), dict(checkpoint_interval="sqrt")])
+def test_float32_long_sequence(arrange_model, arrange_sequences, kwargs):
+    transition, emission, initial = arrange_model
+    # unnormalised log messages of this length are beyond float32 resolution
+    data = arrange_sequences((50_000,), seed=7)[0]
+    expected = baum_welch(
+        data, transition, emission, initial, 3, backend="scaled", tqdm_on=False
+    )
+    result = baum_welch(
+        data,
+        transition,
+        emission,
+        initial,
+        3,
+        tqdm_on=False,
+        dtype=np.float32,
+        **kwargs,
+    )
+
+    assert np.isclose(expected.likelihood_log, result.likelihood_log, rtol=1e-5)
+    assert np.allclose(expected.transition, result.transition, atol=1e-4)
+    assert np.allclose(expected.emission, result.emission, atol=1e-4)
+
+
+def test_reconstruct_float32(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    expected = reconstruct(arrange_data, transition, emission, initial)
+    result = reconstruct(arrange_data, transition, emission, initial, dtype=np.float32)
+    assert np.array_equal(expected, result)
+
+
+def test_unsupported_dtype(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    with pytest.raises(ValueError):
+        reconstruct(arrange_data, transition, emission, initial, dtype=np.float16)
+    with pytest.raises(ValueError):
+        baum_welch(
+            arrange_data,
+            SparseTransition.from_dense(transition),
+            emission,
+            initial,
+            1,
+            tqdm_on=False,
+            dtype=np.float32,
+        )
@@ -0,0 +1,81 @@
+from hmm_analysis import baum_welch, baum_welch_iter
+from hmm_analysis.baum_welch.core.instrumentation import PhaseTimer
+import numpy as np
+from numba import jit
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((150, 20, 90), seed=9)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+@pytest.mark.parametrize("multi_sequence", [False, True])
+def test_instrumented_matches_fused(
+    arrange_model, arrange_data, backend, multi_sequence
+):
+    transition, emission, initial = arrange_model
+    data = arrange_data if multi_sequence else arrange_data[0]
+    kwargs = dict(backend=backend, multi_sequence=multi_sequence, tqdm_on=False)
+    expected = baum_welch(data, transition, emission, initial, 4, **kwargs)
+    result = baum_welch(
+        data, transition, emission, initial, 4, instrument=True, **kwargs
+    )
+
+    assert expected.instrumentation is None
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+
+    # the final result holds the records of every iteration
+    records = result.instrumentation.to_records()
+    assert {record["iteration"] for record in records} == set(range(4))
+    forward = [record for record in records if record["phase"] == "forward"]
+    assert len(forward) == 4
+    assert all(record["calls"] == (3 if multi_sequence else 1) for record in forward)
+    assert all(record["wall_time"] >= record["compile_time"] >= 0 for record in records)
+    assert forward[0]["bytes_allocated"] >= (150 if not multi_sequence else 260) * 2 * 8
+    assert set(result.instrumentation.totals()) >= {"forward", "backward", "update"}
+
+
+def test_iter_instrumentation(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    iterator = baum_welch_iter(
+        arrange_data[0], transition, emission, initial, instrument=True
+    )
+    for iteration, result in zip(range(3), iterator):
+        assert {record.iteration for record in result.instrumentation.records} == {
+            iteration
+        }
+
+
+def test_compile_time():
+    @jit(nopython=True)
+    def kernel(x):
+        return x + 1
+
+    timer = PhaseTimer(0)
+    timer.measure("phase", kernel, np.zeros(3))
+    timer.measure("phase", kernel, np.zeros(3))
+    (record,) = timer.instrumentation().records
+
+    # only the first call compiles
+    assert record.calls == 2
+    assert 0 < record.compile_time < record.wall_time
+    assert record.bytes_allocated == 2 * 3 * 8
+
+
+def test_unsupported_instrument(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    with pytest.raises(ValueError):
+        baum_welch(
+            arrange_data[0],
+            transition,
+            emission,
+            initial,
+            1,
+            instrument=True,
+            accelerate=True,
+            tqdm_on=False,
+        )
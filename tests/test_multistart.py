@@ -0,0 +1,88 @@
+from hmm_analysis import baum_welch, baum_welch_multistart
+from hmm_analysis.baum_welch import random_guesses
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(4)
+    return [rng.integers(0, 3, size=n) for n in (200, 35, 400)]
+
+
+def test_random_guesses():
+    guesses = random_guesses(3, 5, 4, seed=0)
+    assert len(guesses) == 4
+    for transition, emission, initial in guesses:
+        assert transition.shape == (3, 3) and emission.shape == (3, 5)
+        assert np.allclose(transition.sum(axis=1), 1)
+        assert np.allclose(emission.sum(axis=1), 1)
+        assert np.isclose(initial.sum(), 1)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+def test_multistart_matches_independent_fits(arrange_data, backend):
+    guesses = random_guesses(2, 3, 5, seed=1)
+    kwargs = dict(tqdm_on=False, multi_sequence=True, backend=backend)
+    result = baum_welch_multistart(arrange_data, guesses=guesses, niters=10, **kwargs)
+
+    for k, guess in enumerate(guesses):
+        expected = baum_welch(arrange_data, *guess, 10, **kwargs)
+        assert np.isclose(expected.likelihood_log, result.results[k].likelihood_log)
+        assert np.allclose(expected.transition, result.results[k].transition)
+        assert np.allclose(expected.emission, result.results[k].emission)
+        assert np.allclose(
+            expected.sequence_likelihoods_log,
+            result.results[k].sequence_likelihoods_log,
+        )
+
+    assert result.best_index == np.argmax(result.likelihoods_log)
+    assert result.best is result.results[result.best_index]
+
+
+def test_multistart_pruning(arrange_data):
+    result = baum_welch_multistart(
+        arrange_data[2],
+        n_states=3,
+        n_starts=8,
+        niters=30,
+        seed=2,
+        prune_after=4,
+        prune_keep=0.25,
+        tqdm_on=False,
+    )
+
+    assert result.pruned.sum() == 6
+    assert np.all(result.n_iter[result.pruned] == 4)
+    assert np.all(result.n_iter[~result.pruned] == 30)
+    assert not result.pruned[result.best_index]
+    assert result.results[np.flatnonzero(result.pruned)[0]].stop_reason == "pruned"
+
+
+def test_multistart_pruning_keeps_converged_starts(arrange_data):
+    # uniform parameters are a fixed point, that start converges at once and
+    # trails the others when they are pruned
+    uniform = (np.full((3, 3), 1 / 3), np.full((3, 3), 1 / 3), np.full(3, 1 / 3))
+    guesses = [*random_guesses(3, 3, 3, seed=3), uniform]
+    result = baum_welch_multistart(
+        arrange_data[2],
+        guesses=guesses,
+        niters=30,
+        tol=1e-8,
+        prune_after=5,
+        prune_keep=0.25,
+        tqdm_on=False,
+    )
+
+    assert result.best_index != 3
+    assert not result.pruned[3]
+    assert result.results[3].converged
+    assert result.results[3].stop_reason != "pruned"
+    assert result.pruned.sum() == 2
+
+
+def test_multistart_invalid_arguments(arrange_data):
+    with pytest.raises(ValueError):
+        baum_welch_multistart(arrange_data[0], tqdm_on=False)
+    with pytest.raises(ValueError):
+        baum_welch_multistart(arrange_data[0], 2, prune_keep=0.0, tqdm_on=False)
@@ -0,0 +1,91 @@
+from hmm_analysis import baum_welch, OnlineBaumWelch
+from hmm_analysis.baum_welch import power_step_size
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_generating_model():
+    """The model the streams are sampled from."""
+    transition = np.array([[0.95, 0.05], [0.1, 0.9]])
+    emission = np.array([[0.8, 0.15, 0.05], [0.05, 0.25, 0.7]])
+    initial = np.array([0.5, 0.5])
+    return transition, emission, initial
+
+
+def test_single_chunk_matches_baum_welch(
+    arrange_model, arrange_generating_model, arrange_sampler
+):
+    data = arrange_sampler(*arrange_generating_model, 300, np.random.default_rng(0))
+    transition_guess, emission_guess, initial_guess = arrange_model
+
+    expected = baum_welch(
+        data, transition_guess, emission_guess, initial_guess, niters=1, tqdm_on=False
+    )
+    # eta = 1 keeps nothing of the guess, one chunk is one Baum-Welch iteration
+    result = OnlineBaumWelch(
+        transition_guess, emission_guess, initial_guess, step_size=lambda k: 1.0
+    ).update(data)
+
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+
+
+def test_stream_converges(arrange_generating_model, arrange_sampler):
+    transition, emission, initial = arrange_generating_model
+    rng = np.random.default_rng(1)
+    data = arrange_sampler(transition, emission, initial, 40_000, rng)
+
+    estimator = OnlineBaumWelch(
+        np.array([[0.8, 0.2], [0.3, 0.7]]),
+        np.array([[0.5, 0.3, 0.2], [0.2, 0.3, 0.5]]),
+        np.array([0.5, 0.5]),
+    )
+    for chunk in np.array_split(data, 200):
+        estimator.update(chunk)
+
+    assert estimator.n_chunks == 200
+    assert estimator.n_observations == len(data)
+    assert np.allclose(estimator.transition, transition, atol=0.05)
+    assert np.allclose(estimator.emission, emission, atol=0.05)
+    assert np.allclose(estimator.transition.sum(axis=1), 1)
+
+
+def test_symbol_unseen_in_first_chunk():
+    estimator = OnlineBaumWelch(
+        np.array([[0.7, 0.3], [0.4, 0.6]]),
+        np.full((2, 4), 0.25),
+        np.array([0.6, 0.4]),
+    )
+    estimator.update(np.array([0, 1, 2, 0, 1, 2, 0, 1]))
+    assert np.all(estimator.emission[:, 3] > 0)
+
+    result = estimator.update(np.array([3, 3, 0, 1, 3]))
+    assert np.all(np.isfinite(result.transition))
+    assert np.all(np.isfinite(result.emission))
+    assert np.isfinite(result.likelihood_log)
+    assert np.allclose(result.emission.sum(axis=1), 1)
+
+
+def test_single_observation_chunk(arrange_model):
+    transition, emission, initial = arrange_model
+    estimator = OnlineBaumWelch(transition, emission, initial, step_size=lambda k: 1.0)
+
+    # one observation has no transitions, the guess keeps its rows
+    result = estimator.update(np.array([2]))
+    assert np.allclose(result.transition, transition)
+
+    estimator = OnlineBaumWelch(transition, emission, initial, step_size=lambda k: 1.0)
+    before = estimator.update(np.array([0, 1, 2, 2, 1, 0])).transition
+    result = estimator.update(np.array([1]))
+    assert np.all(np.isfinite(result.transition))
+    assert np.allclose(result.transition, before)
+
+
+def test_power_step_size():
+    step_size = power_step_size(kappa=1.0, offset=0.0)
+    assert step_size(4) == 0.25
+
+    with pytest.raises(ValueError):
+        power_step_size(kappa=0.5)
@@ -0,0 +1,59 @@
+from hmm_analysis import PackedSequences, baum_welch, pack_sequences, reconstruct
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((40, 7, 120, 15, 60, 2), seed=0)
+
+
+def test_pack_sequences(arrange_data):
+    packed = pack_sequences(arrange_data)
+
+    assert len(packed) == len(arrange_data)
+    assert list(packed.lengths) == [len(sequence) for sequence in arrange_data]
+    for expected, result in zip(arrange_data, packed):
+        assert np.all(expected == result)
+
+
+def test_pack_sequences_2d_without_copy():
+    data = np.arange(12).reshape(3, 4)
+    packed = pack_sequences(data)
+
+    assert np.shares_memory(packed.data, data)
+    assert np.all(packed[1] == data[1])
+
+
+def test_packed_sequences_validation():
+    with pytest.raises(ValueError):
+        PackedSequences(np.arange(5), np.array([0, 2, 4]))
+    with pytest.raises(ValueError):
+        PackedSequences(np.arange(5), np.array([0, 3, 2, 5]))
+
+
+def test_baum_welch_packed(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    kwargs = dict(tqdm_on=False, multi_sequence=True)
+
+    expected = baum_welch(arrange_data, transition, emission, initial, 5, **kwargs)
+    result = baum_welch(
+        pack_sequences(arrange_data), transition, emission, initial, 5, tqdm_on=False
+    )
+
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+def test_reconstruct_packed(arrange_model, arrange_data, backend):
+    transition, emission, initial = arrange_model
+    packed = pack_sequences(arrange_data)
+    result = reconstruct(packed, transition, emission, initial, backend=backend)
+
+    assert np.all(result.offsets == packed.offsets)
+    for sequence, states in zip(arrange_data, result):
+        expected = reconstruct(sequence, transition, emission, initial)
+        assert np.all(expected == states)
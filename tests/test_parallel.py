@@ -0,0 +1,94 @@
+from hmm_analysis import baum_welch, pack_sequences, reconstruct
+from hmm_analysis.sequences import schedule_longest_first
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((40, 7, 120, 15, 60, 2), seed=0)
+
+
+def test_schedule_longest_first(arrange_data):
+    schedule, offsets = schedule_longest_first(pack_sequences(arrange_data).offsets, 2)
+
+    # every sequence is scheduled exactly once, longest first within a worker
+    assert sorted(schedule) == list(range(len(arrange_data)))
+    assert offsets[0] == 0 and offsets[-1] == len(arrange_data)
+    for w in range(2):
+        lengths = [len(arrange_data[i]) for i in schedule[offsets[w] : offsets[w + 1]]]
+        assert lengths == sorted(lengths, reverse=True)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+def test_parallel_multi_sequence(arrange_model, arrange_data, backend):
+    transition, emission, initial = arrange_model
+    kwargs = dict(tqdm_on=False, multi_sequence=True, backend=backend)
+
+    expected = baum_welch(arrange_data, transition, emission, initial, 5, **kwargs)
+    result = baum_welch(
+        arrange_data, transition, emission, initial, 5, parallel=True, **kwargs
+    )
+
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+
+
+@pytest.mark.parametrize("n_chunks", [1, 2, 7])
+def test_step_parallel_in_time(arrange_model, arrange_sequences, n_chunks):
+    from hmm_analysis.baum_welch.core.parallel import step_parallel_in_time
+    from hmm_analysis.baum_welch.core.step import step
+    from hmm_analysis.sequences import split_chunks
+
+    transition, emission, initial = arrange_model
+    data = arrange_sequences((300,), seed=1)[0]
+    parameters_log = [np.log(x) for x in (transition, emission, initial)]
+
+    expected = step(data, *parameters_log)
+    result = step_parallel_in_time(data, *parameters_log, split_chunks(300, n_chunks))
+
+    for expected_value, result_value in zip(expected, result):
+        assert np.allclose(expected_value, result_value)
+
+
+def test_parallel_single_sequence(arrange_model, arrange_sequences):
+    transition, emission, initial = arrange_model
+    data = arrange_sequences((500,), seed=2)[0]
+    kwargs = dict(tqdm_on=False)
+
+    expected = baum_welch(data, transition, emission, initial, 5, **kwargs)
+    result = baum_welch(data, transition, emission, initial, 5, parallel=True, **kwargs)
+
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+
+
+@pytest.mark.parametrize("n_chunks", [1, 3, 8])
+def test_reconstruct_parallel_in_time(arrange_model, arrange_sequences, n_chunks):
+    from hmm_analysis.reconstruction.reconstruct import reconstruct_parallel_in_time
+    from hmm_analysis.sequences import split_chunks
+
+    transition, emission, initial = arrange_model
+    data = arrange_sequences((200,), seed=3)[0]
+
+    expected = reconstruct(data, transition, emission, initial)
+    result = reconstruct_parallel_in_time(
+        data, transition, emission, initial, split_chunks(200, n_chunks)
+    )
+
+    assert np.array_equal(expected, result)
+    assert np.array_equal(
+        expected, reconstruct(data, transition, emission, initial, parallel=True)
+    )
+
+
+def test_reconstruct_parallel_packed_raises(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    with pytest.raises(ValueError):
+        reconstruct(
+            pack_sequences(arrange_data), transition, emission, initial, parallel=True
+        )
@@ -0,0 +1,54 @@
+from hmm_analysis import baum_welch_iter
+from hmm_analysis.baum_welch import BaumWelchResult
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((200,), seed=22)[0]
+
+
+def test_lazy_regular_space(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    result = next(baum_welch_iter(arrange_data, transition, emission, initial))
+
+    # only the log-space parameters exist until the regular space is accessed
+    assert result._transition is None and result._emission is None
+    assert np.allclose(result.transition, np.exp(result.transition_log))
+    assert np.allclose(result.emission.sum(axis=1), 1)
+    # computed at most once
+    assert result.transition is result.transition
+    assert result._initial is None
+
+
+def test_from_regular_space(arrange_model):
+    transition, emission, initial = arrange_model
+    result = BaumWelchResult(transition, emission, initial, -1.0)
+    assert result.transition is transition
+    assert np.allclose(result.emission_log, np.log(emission))
+    assert "likelihood_log=-1.0" in repr(result)
+
+    result.n_iter = 3
+    with pytest.raises(AttributeError):
+        result.unknown = 1
+    with pytest.raises(ValueError):
+        BaumWelchResult(transition, emission, initial, -1.0, transition_log=transition)
+
+
+def test_assign_parameters(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    result = next(baum_welch_iter(arrange_data, transition, emission, initial))
+
+    result.transition = transition
+    assert result.transition is transition
+    assert np.allclose(result.transition_log, np.log(transition))
+
+    emission_log = np.log(emission)
+    result.emission_log = emission_log
+    assert result.emission_log is emission_log
+    assert np.allclose(result.emission, emission)
+
+    result.initial = initial
+    assert np.allclose(result.initial_log, np.log(initial))
+    assert "transition=array(" in repr(result)
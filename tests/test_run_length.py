@@ -0,0 +1,102 @@
+from hmm_analysis import baum_welch, reconstruct
+from hmm_analysis.baum_welch.estimations import (
+    allocate_statistics,
+    accumulate_statistics_runs_scaled,
+    accumulate_statistics_scaled,
+)
+from hmm_analysis.forward_backward import compress_runs, matrix_power_scaled
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(13)
+    transition = rng.dirichlet(np.ones(3) * 3, size=3)
+    emission = rng.dirichlet(np.ones(4), size=3)
+    initial = rng.dirichlet(np.ones(3))
+
+    # short runs mixed with idle periods of a few thousand repeated symbols
+    lengths = rng.integers(1, 4, size=200)
+    long_runs = rng.random(200) < 0.1
+    lengths[long_runs] = rng.integers(500, 5000, size=long_runs.sum())
+    data = np.repeat(rng.integers(0, 4, size=200), lengths)
+    return data, transition, emission, initial
+
+
+def test_compress_runs():
+    symbols, lengths = compress_runs(np.array([2, 2, 0, 1, 1, 1, 2]))
+
+    assert np.array_equal(symbols, [2, 0, 1, 2])
+    assert np.array_equal(lengths, [2, 1, 3, 1])
+
+
+def test_matrix_power_scaled():
+    m = np.array([[0.9, 0.05], [0.2, 0.7]])
+    power, log_scale = matrix_power_scaled(m, 37)
+
+    assert np.allclose(power * np.exp(log_scale), np.linalg.matrix_power(m, 37))
+
+
+def test_accumulate_statistics_runs_scaled(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    expected = allocate_statistics(3, 4)
+    expected_norm = accumulate_statistics_scaled(
+        data, transition, emission, initial, *expected
+    )
+    result = allocate_statistics(3, 4)
+    norm = accumulate_statistics_runs_scaled(
+        *compress_runs(data), transition, emission, initial, *result
+    )
+
+    assert np.isclose(expected_norm, norm)
+    for expected_acc, result_acc in zip(expected, result):
+        assert np.allclose(expected_acc, result_acc)
+
+
+def test_baum_welch_run_length(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    expected = baum_welch(
+        data, transition, emission, initial, 3, tqdm_on=False, backend="scaled"
+    )
+    result = baum_welch(
+        data, transition, emission, initial, 3, tqdm_on=False, run_length=True
+    )
+
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+
+
+def test_reconstruct_run_length(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    assert np.array_equal(
+        reconstruct(data, transition, emission, initial),
+        reconstruct(data, transition, emission, initial, run_length=True),
+    )
+    # a long first run
+    data = np.concatenate([np.full(3000, data[0]), data])
+    assert np.array_equal(
+        reconstruct(data, transition, emission, initial),
+        reconstruct(data, transition, emission, initial, run_length=True),
+    )
+
+
+def test_run_length_requires_single_sequence(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    with pytest.raises(ValueError):
+        baum_welch(
+            [data, data],
+            transition,
+            emission,
+            initial,
+            1,
+            tqdm_on=False,
+            multi_sequence=True,
+            run_length=True,
+        )
@@ -0,0 +1,97 @@
+from hmm_analysis import baum_welch, reconstruct
+from hmm_analysis.forward_backward import (
+    calc_forward_scaled,
+    get_forward_backward_likelihood_log,
+    get_forward_backward_likelihood_scaled,
+)
+from .assert_with_error import assert_result
+from .loader import generate_filtered_data
+import numpy as np
+import pytest
+
+
+KEYS = ("sequence", "transition", "emission", "initial", "forward", "backward")
+
+
+@pytest.fixture(params=generate_filtered_data(set(KEYS)))
+def arrange_data(request):
+    return [np.array(request.param[k]) for k in KEYS]
+
+
+def test_forward_scaled(arrange_data):
+    data, transition, emission, initial, expected_result, _ = arrange_data
+
+    # undo the scaling with the cumulative product of the constants
+    forward, scales = calc_forward_scaled(data, transition, emission, initial)
+    result = forward * np.cumprod(scales)[:, None]
+
+    # assert
+    assert_result(expected_result, result)
+
+
+def test_likelihood_scaled(arrange_data):
+    data, transition, emission, initial, _, _ = arrange_data
+
+    with np.errstate(divide="ignore"):
+        _, _, expected_norm = get_forward_backward_likelihood_log(
+            data, np.log(initial), np.log(transition), np.log(emission)
+        )
+    _, _, _, norm = get_forward_backward_likelihood_scaled(
+        data, initial, transition, emission
+    )
+
+    assert np.isclose(expected_norm, norm)
+
+
+def test_baum_welch_scaled(arrange_data):
+    data, transition, emission, initial, _, _ = arrange_data
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = baum_welch(data, transition, emission, initial, 5, tqdm_on=False)
+        result = baum_welch(
+            data, transition, emission, initial, 5, tqdm_on=False, backend="scaled"
+        )
+
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(expected.transition, result.transition, equal_nan=True)
+    assert np.allclose(expected.emission, result.emission, equal_nan=True)
+    assert np.allclose(expected.initial, result.initial, equal_nan=True)
+
+
+def test_baum_welch_scaled_multi_sequence(arrange_model, arrange_sequences):
+    transition, emission, initial = arrange_model
+    data = np.stack(arrange_sequences((50,) * 4))
+
+    expected = baum_welch(
+        data, transition, emission, initial, 5, tqdm_on=False, multi_sequence=True
+    )
+    result = baum_welch(
+        data,
+        transition,
+        emission,
+        initial,
+        5,
+        tqdm_on=False,
+        multi_sequence=True,
+        backend="scaled",
+    )
+
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+
+
+def test_reconstruct_scaled(arrange_data):
+    data, transition, emission, initial, _, _ = arrange_data
+
+    with np.errstate(divide="ignore"):
+        expected = reconstruct(data, transition, emission, initial)
+    result = reconstruct(data, transition, emission, initial, backend="scaled")
+
+    assert np.all(expected == result)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        reconstruct(np.array([0]), np.eye(1), np.eye(1), np.ones(1), backend="dense")
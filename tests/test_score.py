@@ -0,0 +1,88 @@
+from hmm_analysis import baum_welch, score, score_batch
+from hmm_analysis.forward_backward import get_forward_backward_likelihood_log
+from hmm_analysis.sparse import SparseTransition
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((300, 1, 0, 45, 2000), seed=24)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+def test_score_matches_forward_backward(arrange_model, arrange_data, backend):
+    transition, emission, initial = arrange_model
+    for data in (arrange_data[0], arrange_data[1], arrange_data[4]):
+        _, _, expected = get_forward_backward_likelihood_log(
+            data, np.log(initial), np.log(transition), np.log(emission)
+        )
+        assert np.isclose(
+            score(data, transition, emission, initial, backend=backend), expected
+        )
+
+
+def test_score_without_symbol_table(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    # fewer observations than symbols step with the transition matrix
+    data = arrange_data[1]
+    expected = score(data, transition, emission, initial, backend="scaled")
+    assert np.isclose(score(data, transition, emission, initial), expected)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_score_batch(arrange_model, arrange_data, backend, dtype):
+    transition, emission, initial = arrange_model
+    scores = score_batch(
+        arrange_data, transition, emission, initial, backend=backend, dtype=dtype
+    )
+    expected = [score(data, transition, emission, initial) for data in arrange_data]
+
+    assert scores.dtype == np.float64
+    assert scores[2] == 0
+    assert np.allclose(scores, expected, rtol=1e-4 if dtype == np.float32 else 1e-9)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+def test_impossible_sequences(arrange_model, backend):
+    transition, _, initial = arrange_model
+    # symbol 2 is never emitted, at the start, in the middle and in a sequence
+    # too short for a symbol table
+    emission = np.array([[0.5, 0.5, 0.0], [0.2, 0.8, 0.0]])
+    sequences = [
+        np.array([2, 0, 1, 0]),
+        np.array([0, 1, 2, 0, 1]),
+        np.array([0, 2]),
+        np.array([0, 1, 0, 1]),
+    ]
+
+    scores = score_batch(sequences, transition, emission, initial, backend=backend)
+    assert np.all(scores[:3] == -np.inf)
+    assert np.isfinite(scores[3])
+    for data, expected in zip(sequences, scores):
+        assert score(data, transition, emission, initial, backend=backend) == expected
+
+
+def test_score_batch_matches_fit(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    # the likelihood of a Baum-Welch iteration is the one of its input parameters
+    result = baum_welch(
+        arrange_data,
+        transition,
+        emission,
+        initial,
+        1,
+        multi_sequence=True,
+        tqdm_on=False,
+    )
+    scores = score_batch(
+        arrange_data, SparseTransition.from_dense(transition), emission, initial
+    )
+    assert np.allclose(scores, result.sequence_likelihoods_log)
+
+
+def test_unknown_backend(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    with pytest.raises(ValueError):
+        score(arrange_data[0], transition, emission, initial, backend="unknown")
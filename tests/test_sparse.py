@@ -0,0 +1,117 @@
+from hmm_analysis import baum_welch, reconstruct, viterbi, PackedSequences
+from hmm_analysis.sparse import SparseTransition
+from hmm_analysis.forward_backward import (
+    calc_backward_log,
+    calc_backward_log_sparse,
+    calc_forward_log,
+    calc_forward_log_sparse,
+)
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(7)
+    transition = SparseTransition.banded(6, lower=1, upper=2)
+    emission = rng.dirichlet(np.ones(4), size=6)
+    initial = rng.dirichlet(np.ones(6))
+    data = rng.integers(0, 4, size=300)
+    return data, transition, emission, initial
+
+
+def test_banded():
+    transition = SparseTransition.banded(4, lower=0, upper=1)
+
+    expected = np.array(
+        [
+            [0.5, 0.5, 0.0, 0.0],
+            [0.0, 0.5, 0.5, 0.0],
+            [0.0, 0.0, 0.5, 0.5],
+            [0.0, 0.0, 0.0, 1.0],
+        ]
+    )
+    assert transition.nnz == 7
+    assert np.allclose(transition.to_dense(), expected)
+    assert np.allclose(SparseTransition.from_dense(expected).to_dense(), expected)
+
+
+def test_forward_backward_sparse(arrange_data):
+    data, transition, emission, initial = arrange_data
+    transition_log = np.log(transition.values)
+    dense_log = np.log(transition.to_dense())
+    emission_log, initial_log = np.log(emission), np.log(initial)
+    sparse_args = (transition.indptr, transition.indices, transition_log)
+
+    assert np.allclose(
+        calc_forward_log(data, dense_log, emission_log, initial_log),
+        calc_forward_log_sparse(data, *sparse_args, emission_log, initial_log),
+    )
+    assert np.allclose(
+        calc_backward_log(data, dense_log, emission_log),
+        calc_backward_log_sparse(data, *sparse_args, emission_log),
+    )
+
+
+@pytest.mark.parametrize("multi_sequence", [False, True])
+def test_baum_welch_sparse(arrange_data, multi_sequence):
+    data, transition, emission, initial = arrange_data
+    if multi_sequence:
+        data = [data, data[:120], data[50:]]
+
+    expected = baum_welch(
+        data,
+        transition.to_dense(),
+        emission,
+        initial,
+        4,
+        tqdm_on=False,
+        multi_sequence=multi_sequence,
+    )
+    result = baum_welch(
+        data,
+        transition,
+        emission,
+        initial,
+        4,
+        tqdm_on=False,
+        multi_sequence=multi_sequence,
+    )
+
+    # the structure is kept through re-estimation
+    assert isinstance(result.transition, SparseTransition)
+    assert np.array_equal(result.transition.indices, transition.indices)
+    assert np.allclose(result.transition.to_dense(), expected.transition)
+    assert np.allclose(result.emission, expected.emission)
+    assert np.allclose(result.initial, expected.initial)
+    assert np.isclose(result.likelihood_log, expected.likelihood_log)
+
+
+def test_reconstruct_sparse(arrange_data):
+    data, transition, emission, initial = arrange_data
+    dense = transition.to_dense()
+
+    assert np.array_equal(
+        reconstruct(data, transition, emission, initial),
+        reconstruct(data, dense, emission, initial),
+    )
+    packed = PackedSequences.from_sequences([data, data[:40]])
+    assert np.array_equal(
+        reconstruct(packed, transition, emission, initial).data,
+        reconstruct(packed, dense, emission, initial).data,
+    )
+    assert np.array_equal(
+        viterbi(data, transition, emission, initial)[0],
+        viterbi(data, dense, emission, initial)[0],
+    )
+
+
+def test_sparse_transition_arguments(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    with pytest.raises(ValueError):
+        SparseTransition([0, 2], [0, 1], [0.5, 0.5])
+    with pytest.raises(ValueError):
+        baum_welch(
+            data, transition, emission, initial, 1, tqdm_on=False, backend="scaled"
+        )
@@ -0,0 +1,108 @@
+from hmm_analysis import SparseTransition, baum_welch, baum_welch_iter
+from hmm_analysis.baum_welch.core.squarem import (
+    project_simplex,
+    squarem_extrapolate,
+    squarem_iter,
+)
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(11)
+    transition = np.array([[0.9, 0.1], [0.2, 0.8]])
+    emission = np.array([[0.6, 0.3, 0.1], [0.2, 0.3, 0.5]])
+    states = [0]
+    for _ in range(2999):
+        states.append(rng.choice(2, p=transition[states[-1]]))
+    data = np.array([rng.choice(3, p=emission[s]) for s in states])
+
+    transition_guess = np.array([[0.6, 0.4], [0.3, 0.7]])
+    emission_guess = np.array([[0.4, 0.3, 0.3], [0.3, 0.3, 0.4]])
+    initial_guess = np.array([0.5, 0.5])
+    return data, transition_guess, emission_guess, initial_guess
+
+
+def test_project_simplex():
+    projected = project_simplex(np.array([[0.7, -0.1, 0.4], [0.0, 0.5, 0.5]]))
+    assert np.allclose(projected.sum(axis=1), 1)
+    assert np.all(projected[0] > 0)
+    # structural zeros are kept
+    assert projected[1, 0] == 0
+
+
+def test_squarem_extrapolate_minimal_step():
+    params = [(np.array([0.5, 0.5]),), (np.array([0.6, 0.4]),), (np.array([0.7, 0.3]),)]
+    extrapolated, alpha = squarem_extrapolate(*params, step_max=1.0)
+    assert alpha == -1.0
+    assert np.allclose(extrapolated[0], params[2][0])
+
+
+def test_squarem_iter_keeps_dtype():
+    fixed_point = (
+        np.array([[0.9, 0.1], [0.2, 0.8]]),
+        np.array([[0.6, 0.3, 0.1], [0.2, 0.3, 0.5]]),
+        np.array([0.5, 0.5]),
+    )
+    dtypes = []
+
+    def em_step(*params_log):
+        # halves the distance to the fixed point, the way a float32 step would
+        dtypes.extend(param.dtype for param in params_log)
+        params = [
+            (np.exp(param) + target) / 2
+            for param, target in zip(params_log, fixed_point)
+        ]
+        likelihood = -sum(
+            np.sum((np.exp(param) - target) ** 2)
+            for param, target in zip(params_log, fixed_point)
+        )
+        return (
+            *(np.log(param).astype(np.float32) for param in params),
+            likelihood,
+            None,
+        )
+
+    guess = (
+        np.array([[0.6, 0.4], [0.3, 0.7]]),
+        np.array([[0.4, 0.3, 0.3], [0.3, 0.3, 0.4]]),
+        np.array([0.7, 0.3]),
+    )
+    iterator = squarem_iter(em_step, *(np.log(p).astype(np.float32) for p in guess))
+    for _ in range(3):
+        next(iterator)
+    assert set(dtypes) == {np.dtype(np.float32)}
+
+
+def test_accelerated_likelihood_is_monotone(arrange_data):
+    iterator = baum_welch_iter(*arrange_data, accelerate=True)
+    likelihoods = [next(iterator).likelihood_log for _ in range(20)]
+    assert np.all(np.diff(likelihoods) >= -1e-8)
+
+
+def test_accelerated_fixed_point(arrange_data):
+    kwargs = dict(tqdm_on=False, tol=1e-10)
+    expected = baum_welch(*arrange_data, 5000, **kwargs)
+    result = baum_welch(*arrange_data, 5000, accelerate=True, **kwargs)
+
+    assert expected.converged and result.converged
+    # every cycle costs at most four E-steps
+    assert 4 * result.n_iter < expected.n_iter
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(expected.transition, result.transition, atol=1e-3)
+    assert np.allclose(expected.emission, result.emission, atol=1e-3)
+
+
+def test_accelerated_sparse_raises(arrange_data):
+    data, transition, emission, initial = arrange_data
+    with pytest.raises(ValueError):
+        next(
+            baum_welch_iter(
+                data,
+                SparseTransition.from_dense(transition),
+                emission,
+                initial,
+                accelerate=True,
+            )
+        )
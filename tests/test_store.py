@@ -0,0 +1,88 @@
+from hmm_analysis import SequenceStore, baum_welch
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((120, 15, 0, 300, 60, 45), seed=21)
+
+
+@pytest.fixture
+def arrange_store(tmp_path, arrange_data):
+    return SequenceStore.write(tmp_path / "store", arrange_data, dtype=np.uint8)
+
+
+def test_round_trip(tmp_path, arrange_data, arrange_store):
+    assert len(arrange_store) == len(arrange_data)
+    assert arrange_store.n_observations == sum(map(len, arrange_data))
+    for stored, sequence in zip(arrange_store, arrange_data):
+        assert np.array_equal(stored, sequence)
+
+    # reopened from disk
+    store = SequenceStore(tmp_path / "store")
+    assert store.dtype == np.uint8
+    assert np.array_equal(store[-1], arrange_data[-1])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 200, 10_000])
+def test_chunks(arrange_data, arrange_store, chunk_size):
+    arrange_store.chunk_size = chunk_size
+    sequences = []
+    for first, chunk in arrange_store.chunks():
+        assert first == len(sequences)
+        # a chunk exceeds the chunk size only to hold a single long sequence
+        assert len(chunk.data) <= chunk_size or len(chunk) == 1
+        sequences.extend(np.array(sequence) for sequence in chunk)
+
+    assert len(sequences) == len(arrange_data)
+    for sequence, expected in zip(sequences, arrange_data):
+        assert np.array_equal(sequence, expected)
+
+
+@pytest.mark.parametrize("backend", ["log", "scaled"])
+@pytest.mark.parametrize("chunk_size", [50, 10_000])
+def test_matches_in_memory(
+    arrange_model, arrange_data, arrange_store, backend, chunk_size
+):
+    transition, emission, initial = arrange_model
+    arrange_store.chunk_size = chunk_size
+    expected = baum_welch(
+        arrange_data,
+        transition,
+        emission,
+        initial,
+        5,
+        multi_sequence=True,
+        backend=backend,
+        tqdm_on=False,
+    )
+    result = baum_welch(
+        arrange_store, transition, emission, initial, 5, backend=backend, tqdm_on=False
+    )
+
+    assert np.isclose(expected.likelihood_log, result.likelihood_log)
+    assert np.allclose(
+        expected.sequence_likelihoods_log, result.sequence_likelihoods_log
+    )
+    assert np.allclose(expected.transition, result.transition)
+    assert np.allclose(expected.emission, result.emission)
+    assert np.allclose(expected.initial, result.initial)
+
+
+def test_invalid(arrange_model, tmp_path, arrange_store):
+    transition, emission, initial = arrange_model
+    with pytest.raises(ValueError):
+        SequenceStore.write(tmp_path / "wide", [np.array([0, 300])], dtype=np.uint8)
+    with pytest.raises(ValueError):
+        SequenceStore(arrange_store.path, chunk_size=0)
+    with pytest.raises(ValueError):
+        baum_welch(
+            arrange_store,
+            transition,
+            emission,
+            initial,
+            1,
+            parallel=True,
+            tqdm_on=False,
+        )
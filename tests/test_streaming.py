@@ -0,0 +1,72 @@
+from hmm_analysis import FixedLagSmoother, reconstruct
+from hmm_analysis.baum_welch.estimations.hidden_state_prob import (
+    calc_hidden_state_prob_log,
+)
+from hmm_analysis.forward_backward import get_forward_backward_likelihood_log
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(5)
+    transition = rng.dirichlet(np.ones(3) * 2, size=3)
+    emission = rng.dirichlet(np.ones(4), size=3)
+    initial = rng.dirichlet(np.ones(3))
+    data = rng.integers(0, 4, size=120)
+    return data, transition, emission, initial
+
+
+def posterior(data, transition, emission, initial):
+    transition_log, emission_log, initial_log = map(
+        np.log, [transition, emission, initial]
+    )
+    forward_log, backward_log, norm = get_forward_backward_likelihood_log(
+        data, initial_log, transition_log, emission_log
+    )
+    return np.exp(calc_hidden_state_prob_log(forward_log, backward_log, norm)), norm
+
+
+@pytest.mark.parametrize("lag, block", [(0, 1), (6, None), (6, 7), (10, 1)])
+def test_fixed_lag_smoother(arrange_data, lag, block):
+    data, transition, emission, initial = arrange_data
+    smoother = FixedLagSmoother(transition, emission, initial, lag=lag, block=block)
+
+    for t, observation in enumerate(data):
+        states, probs = smoother.update(observation, return_probabilities=True)
+        assert smoother.n_pending <= lag
+
+        # every emitted step is smoothed with the observations seen so far
+        expected, _ = posterior(data[: t + 1], transition, emission, initial)
+        first = smoother.n_emitted - len(states)
+        assert np.allclose(probs, expected[first : smoother.n_emitted])
+        assert np.array_equal(states, probs.argmax(axis=1))
+
+    states, probs = smoother.flush(return_probabilities=True)
+
+    # the remaining steps are smoothed with the whole sequence
+    assert smoother.n_emitted == len(data)
+    expected, norm = posterior(data, transition, emission, initial)
+    assert np.allclose(probs, expected[len(data) - len(probs) :])
+    assert np.isclose(smoother.likelihood_log, norm)
+
+
+def test_fixed_lag_smoother_chunks(arrange_data):
+    data, transition, emission, initial = arrange_data
+    smoother = FixedLagSmoother(transition, emission, initial, lag=len(data))
+
+    states = [smoother.update(chunk) for chunk in np.array_split(data, 7)]
+    states.append(smoother.flush())
+
+    assert np.array_equal(
+        np.concatenate(states), reconstruct(data, transition, emission, initial)
+    )
+
+
+def test_fixed_lag_smoother_arguments(arrange_data):
+    _, transition, emission, initial = arrange_data
+
+    with pytest.raises(ValueError):
+        FixedLagSmoother(transition, emission, initial, lag=-1)
+    with pytest.raises(ValueError):
+        FixedLagSmoother(transition, emission, initial, lag=4, block=6)
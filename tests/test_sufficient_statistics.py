@@ -0,0 +1,90 @@
+from hmm_analysis.baum_welch.estimations import (
+    allocate_statistics,
+    accumulate_statistics_log,
+    accumulate_statistics_scaled,
+    estimate_hidden_transition_log,
+)
+from hmm_analysis.baum_welch.variable_updates import (
+    update_variables_log,
+    update_variables_log_from_statistics,
+)
+from hmm_analysis.forward_backward import get_forward_backward_likelihood_log
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(1)
+    transition = rng.dirichlet(np.ones(3), size=3)
+    emission = rng.dirichlet(np.ones(4), size=3)
+    initial = rng.dirichlet(np.ones(3))
+    data = rng.integers(0, 4, size=200)
+    return data, transition, emission, initial
+
+
+def test_accumulate_statistics_log(arrange_data):
+    data, transition, emission, initial = arrange_data
+    transition_log, emission_log, initial_log = map(
+        np.log, [transition, emission, initial]
+    )
+
+    # materialised hidden state and transition probabilities
+    forward_log, backward_log, norm = get_forward_backward_likelihood_log(
+        data, initial_log, transition_log, emission_log
+    )
+    hidden_state_prob_log, transition_prob_log = estimate_hidden_transition_log(
+        data, forward_log, backward_log, transition_log, emission_log, norm
+    )
+
+    accumulators = allocate_statistics(3, 4)
+    result_norm = accumulate_statistics_log(
+        data, transition_log, emission_log, initial_log, *accumulators
+    )
+    initial_acc, transition_acc, emission_acc = accumulators
+
+    assert np.isclose(norm, result_norm)
+    assert np.allclose(np.exp(hidden_state_prob_log[0]), initial_acc)
+    assert np.allclose(np.exp(transition_prob_log).sum(axis=0), transition_acc)
+    assert np.allclose(emission_acc.sum(axis=1), np.exp(hidden_state_prob_log).sum(0))
+
+
+def test_accumulate_statistics_scaled(arrange_data):
+    data, transition, emission, initial = arrange_data
+
+    expected = allocate_statistics(3, 4)
+    expected_norm = accumulate_statistics_log(
+        data, *map(np.log, [transition, emission, initial]), *expected
+    )
+    result = allocate_statistics(3, 4)
+    norm = accumulate_statistics_scaled(data, transition, emission, initial, *result)
+
+    assert np.isclose(expected_norm, norm)
+    for expected_acc, result_acc in zip(expected, result):
+        assert np.allclose(expected_acc, result_acc)
+
+
+def test_update_variables_from_statistics(arrange_data):
+    data, transition, emission, initial = arrange_data
+    transition_log, emission_log, initial_log = map(
+        np.log, [transition, emission, initial]
+    )
+
+    forward_log, backward_log, norm = get_forward_backward_likelihood_log(
+        data, initial_log, transition_log, emission_log
+    )
+    hidden_state_prob_log, transition_prob_log = estimate_hidden_transition_log(
+        data, forward_log, backward_log, transition_log, emission_log, norm
+    )
+    expected = update_variables_log(
+        data, hidden_state_prob_log, transition_prob_log, emission_log
+    )
+
+    accumulators = allocate_statistics(3, 4)
+    accumulate_statistics_log(
+        data, transition_log, emission_log, initial_log, *accumulators
+    )
+    result = update_variables_log_from_statistics(*accumulators)
+
+    for expected_log, result_log in zip(expected, result):
+        assert np.allclose(expected_log, result_log)
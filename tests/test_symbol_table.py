@@ -0,0 +1,92 @@
+from hmm_analysis.baum_welch.estimations import (
+    allocate_statistics,
+    accumulate_statistics_log,
+    accumulate_statistics_log_table,
+)
+from hmm_analysis.forward_backward import (
+    SYMBOL_TABLE_MAX_BYTES,
+    calc_backward_log_normalised,
+    calc_backward_log_table_normalised,
+    calc_forward_log_normalised,
+    calc_forward_log_table_normalised,
+    calc_symbol_table_log,
+    prepare_symbol_table_log,
+    use_symbol_table,
+)
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data():
+    rng = np.random.default_rng(11)
+    transition_log = np.log(rng.dirichlet(np.ones(5), size=5))
+    emission_log = np.log(rng.dirichlet(np.ones(3), size=5))
+    initial_log = np.log(rng.dirichlet(np.ones(5)))
+    data = rng.integers(0, 3, size=150)
+    return data, transition_log, emission_log, initial_log
+
+
+def test_symbol_table(arrange_data):
+    _, transition_log, emission_log, _ = arrange_data
+    table = calc_symbol_table_log(transition_log, emission_log)
+
+    assert table.shape == (3, 5, 5)
+    for d in range(3):
+        assert np.allclose(table[d], transition_log + emission_log[:, d])
+
+
+def test_forward_backward_table(arrange_data):
+    data, transition_log, emission_log, initial_log = arrange_data
+    table = calc_symbol_table_log(transition_log, emission_log)
+
+    forward_log, norm = calc_forward_log_normalised(
+        data, transition_log, emission_log, initial_log
+    )
+    forward_log_table, norm_table = calc_forward_log_table_normalised(
+        data, table, emission_log, initial_log
+    )
+    assert np.allclose(forward_log, forward_log_table)
+    assert np.isclose(norm, norm_table)
+    assert np.allclose(
+        calc_backward_log_normalised(data, transition_log, emission_log),
+        calc_backward_log_table_normalised(data, table),
+    )
+
+
+def test_accumulate_statistics_log_table(arrange_data):
+    data, transition_log, emission_log, initial_log = arrange_data
+    table = calc_symbol_table_log(transition_log, emission_log)
+
+    expected = allocate_statistics(5, 3)
+    expected_norm = accumulate_statistics_log(
+        data, transition_log, emission_log, initial_log, *expected
+    )
+    result = allocate_statistics(5, 3)
+    norm = accumulate_statistics_log_table(
+        data, table, emission_log, initial_log, *result
+    )
+
+    assert np.isclose(expected_norm, norm)
+    for expected_acc, result_acc in zip(expected, result):
+        assert np.allclose(expected_acc, result_acc)
+
+
+def test_use_symbol_table():
+    assert use_symbol_table(16, 64)
+    n_states = int(np.sqrt(SYMBOL_TABLE_MAX_BYTES / 8 / 64)) + 1
+    assert not use_symbol_table(n_states, 64)
+    # float32 tables take half the bytes
+    assert use_symbol_table(n_states, 64, np.dtype(np.float32).itemsize)
+
+
+def test_prepare_symbol_table_log(arrange_data):
+    _, transition_log, emission_log, _ = arrange_data
+
+    assert np.allclose(
+        prepare_symbol_table_log(transition_log, emission_log),
+        calc_symbol_table_log(transition_log, emission_log),
+    )
+    # fewer observations than symbols step with the transition matrix
+    assert prepare_symbol_table_log(transition_log, emission_log, 2).shape == (0, 5, 5)
+    assert prepare_symbol_table_log(transition_log, emission_log, 3).shape == (3, 5, 5)
@@ -0,0 +1,60 @@
+from hmm_analysis import pack_sequences, viterbi
+from hmm_analysis.reconstruction.viterbi import backpointer_dtype
+import itertools
+import numpy as np
+import pytest
+
+
+def brute_force(data, transition, emission, initial):
+    n_states = transition.shape[0]
+    best_path, best_prob = None, -1.0
+    for path in itertools.product(range(n_states), repeat=len(data)):
+        prob = initial[path[0]] * emission[path[0], data[0]]
+        for t in range(1, len(data)):
+            prob *= transition[path[t - 1], path[t]] * emission[path[t], data[t]]
+        if prob > best_prob:
+            best_path, best_prob = path, prob
+    return np.array(best_path), np.log(best_prob)
+
+
+def test_viterbi_wikipedia_example(arrange_model):
+    transition, emission, initial = arrange_model
+    path, log_prob = viterbi(np.array([0, 1, 2]), transition, emission, initial)
+
+    # Healthy, Healthy, Fever with probability 0.01512
+    assert np.all(path == [0, 0, 1])
+    assert np.isclose(log_prob, np.log(0.01512))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_viterbi_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    transition = rng.dirichlet(np.ones(3), size=3)
+    emission = rng.dirichlet(np.ones(4), size=3)
+    initial = rng.dirichlet(np.ones(3))
+    data = rng.integers(0, 4, size=7)
+
+    expected_path, expected_log_prob = brute_force(data, transition, emission, initial)
+    path, log_prob = viterbi(data, transition, emission, initial)
+
+    assert np.all(expected_path == path)
+    assert np.isclose(expected_log_prob, log_prob)
+
+
+def test_viterbi_packed(arrange_model, arrange_sequences):
+    transition, emission, initial = arrange_model
+    sequences = arrange_sequences((12, 1, 30, 5))
+
+    paths, log_probs = viterbi(pack_sequences(sequences), transition, emission, initial)
+
+    for sequence, packed_path, packed_log_prob in zip(sequences, paths, log_probs):
+        path, log_prob = viterbi(sequence, transition, emission, initial)
+        assert np.all(path == packed_path)
+        assert np.isclose(log_prob, packed_log_prob)
+
+
+def test_backpointer_dtype():
+    assert backpointer_dtype(2) == np.uint8
+    assert backpointer_dtype(256) == np.uint8
+    assert backpointer_dtype(257) == np.uint16
+    assert backpointer_dtype(70000) == np.uint32
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+import types
+
+import hmm_analysis
+from hmm_analysis import baum_welch, reconstruct, set_cache_dir, viterbi
+from hmm_analysis.compilation import kernel_signatures, precompile
+import numpy as np
+import pytest
+
+
+def run_python(code, **env):
+    subprocess.run([sys.executable, "-c", code], check=True, env=env or None)
+
+
+def test_import_is_lazy():
+    run_python(
+        "import sys, hmm_analysis\n"
+        "assert 'numba' not in sys.modules and 'tqdm' not in sys.modules"
+    )
+
+
+def test_subpackage_does_not_shadow_function():
+    run_python(
+        "import types, hmm_analysis.baum_welch.core\n"
+        "from hmm_analysis import baum_welch\n"
+        "assert not isinstance(baum_welch, types.ModuleType)"
+    )
+    assert not isinstance(hmm_analysis.baum_welch, types.ModuleType)
+    assert isinstance(hmm_analysis.forward_backward, types.ModuleType)
+    with pytest.raises(AttributeError):
+        hmm_analysis.missing
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_precompile_covers_public_calls(arrange_model, arrange_sequences, dtype):
+    transition, emission, initial = arrange_model
+    precompile(dtypes=(dtype,))
+    dispatchers = {dispatcher for dispatcher, _ in kernel_signatures(dtype)}
+    n_signatures = {
+        dispatcher: len(dispatcher.signatures) for dispatcher in dispatchers
+    }
+
+    data = arrange_sequences((100,), seed=8)[0]
+    for backend in ("log", "scaled"):
+        kwargs = dict(backend=backend, dtype=dtype, tqdm_on=False)
+        baum_welch(data, transition, emission, initial, 2, **kwargs)
+        baum_welch(
+            [data, data[:30]],
+            transition,
+            emission,
+            initial,
+            2,
+            multi_sequence=True,
+            **kwargs,
+        )
+        reconstruct(data, transition, emission, initial, backend=backend, dtype=dtype)
+    if dtype == np.float64:
+        viterbi(data, transition, emission, initial)
+
+    # the public functions hit the precompiled signatures, nothing new is compiled
+    for dispatcher in dispatchers:
+        assert len(dispatcher.signatures) == n_signatures[dispatcher]
+
+
+def test_set_cache_dir(tmp_path):
+    # the kernels of this process are already imported
+    with pytest.raises(RuntimeError):
+        set_cache_dir(tmp_path)
+
+    run_python(
+        "import numba, hmm_analysis\n"
+        f"hmm_analysis.set_cache_dir({str(tmp_path)!r})\n"
+        f"assert numba.config.CACHE_DIR == {str(tmp_path)!r}"
+    )
@@ -0,0 +1,62 @@
+from hmm_analysis.baum_welch import Workspace
+from hmm_analysis.baum_welch.core.step import (
+    step,
+    step_into,
+    step_multi_sequences_scaled,
+    step_multi_sequences_scaled_into,
+)
+from hmm_analysis.sequences import pack_sequences
+from hmm_analysis.utils.casting import cast_log
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def arrange_data(arrange_sequences):
+    return arrange_sequences((80, 200, 0, 35), seed=23)
+
+
+def fill_garbage(workspace):
+    # the kernels must not depend on what a previous iteration left behind
+    for buffer in workspace.step_args():
+        buffer[...] = np.nan
+
+
+def test_step_into(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    parameters_log = cast_log(transition, emission, initial)
+    workspace = Workspace(200, 2, 3)
+    assert workspace.table.shape == (3, 2, 2)
+
+    for data in arrange_data[:2]:
+        fill_garbage(workspace)
+        result = step_into(data, *parameters_log, *workspace.step_args())
+        expected = step(data, *parameters_log)
+        for value, expected_value in zip(result, expected):
+            assert np.allclose(value, expected_value)
+
+
+def test_step_multi_sequences_scaled_into(arrange_model, arrange_data):
+    transition, emission, initial = arrange_model
+    packed = pack_sequences(arrange_data)
+    parameters_log = cast_log(transition, emission, initial)
+    workspace = Workspace.for_sequences(packed.offsets, 2, 3, backend="scaled")
+    assert workspace.forward.shape == (200, 2)
+
+    expected = step_multi_sequences_scaled(packed.data, packed.offsets, *parameters_log)
+    for _ in range(2):
+        fill_garbage(workspace)
+        result = step_multi_sequences_scaled_into(
+            packed.data, packed.offsets, *parameters_log, *workspace.step_args()
+        )
+        for value, expected_value in zip(result, expected):
+            assert np.allclose(value, expected_value)
+
+
+def test_workspace_dtype():
+    workspace = Workspace(10, 4, 5, backend="scaled", dtype=np.float32)
+    assert workspace.forward.dtype == np.float32
+    assert workspace.scales.dtype == np.float64
+    assert workspace.nbytes == sum(buffer.nbytes for buffer in workspace.step_args())
+    with pytest.raises(ValueError):
+        Workspace(10, 4, 5, backend="unknown")